@@ -4,3 +4,24 @@ from django.apps import AppConfig
 class FunctionalityConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'functionality'
+
+    def ready(self):
+        # Invalida las categorías en caché de los clasificadores de IA
+        # cada vez que se crea, modifica o elimina una categoría.
+        from django.db.models.signals import post_save, post_delete
+        from .models import Canje, Categoria, Negocio, Promocion
+        from .utils.ai.categorias import invalidar_categorias
+        from .utils.estadisticas.header import invalidar_metricas_header
+
+        post_save.connect(invalidar_categorias, sender=Categoria, dispatch_uid="ai_categorias_post_save")
+        post_delete.connect(invalidar_categorias, sender=Categoria, dispatch_uid="ai_categorias_post_delete")
+
+        # Invalida las métricas del encabezado del panel (utils/estadisticas/header.py).
+        # Sin post_delete de Canje: conectarlo haría que los borrados masivos
+        # carguen cada fila para emitir la señal; el de Promocion los cubre.
+        for modelo in (Promocion, Negocio):
+            post_save.connect(invalidar_metricas_header, sender=modelo,
+                              dispatch_uid=f"estadisticas_header_post_save_{modelo.__name__}")
+            post_delete.connect(invalidar_metricas_header, sender=modelo,
+                                dispatch_uid=f"estadisticas_header_post_delete_{modelo.__name__}")
+        post_save.connect(invalidar_metricas_header, sender=Canje, dispatch_uid="estadisticas_header_post_save_Canje")
@@ -0,0 +1,26 @@
+# =============================================================================
+# Autores: Daniel Álvarez Sil y Yael Sinuhe Grajeda Martínez
+# Descripción:
+#   Comando de administración que genera un nuevo snapshot versionado del
+#   catálogo para clientes sin conexión. Pensado para ejecutarse de forma
+#   periódica (por ejemplo, con cron cada hora):
+#
+#       python manage.py construir_catalogo
+# =============================================================================
+
+from django.core.management.base import BaseCommand
+
+from functionality.utils.catalogo.catalogo import construir_snapshot
+
+
+class Command(BaseCommand):
+    help = "Genera un snapshot comprimido y versionado del catálogo de promociones, negocios y categorías."
+
+    def handle(self, *args, **options):
+        snapshot, creado = construir_snapshot()
+        if creado:
+            self.stdout.write(self.style.SUCCESS(
+                f"Snapshot v{snapshot.id} creado ({snapshot.tamano} bytes, hash {snapshot.hash_contenido[:12]})."
+            ))
+        else:
+            self.stdout.write(f"Sin cambios; la versión vigente sigue siendo v{snapshot.id}.")
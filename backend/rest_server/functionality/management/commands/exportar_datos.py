@@ -0,0 +1,59 @@
+# =============================================================================
+# Autores: Daniel Álvarez Sil y Yael Sinuhe Grajeda Martínez
+# Descripción:
+#   Exporta canjes, promociones o negocios en CSV o JSONL a un archivo (o a
+#   la salida estándar) con las mismas columnas que /exportaciones/<tipo>/.
+#   Las filas se leen con un cursor del lado del servidor y se escriben por
+#   bloques, así que la memoria no crece con el número de filas:
+#
+#       python manage.py exportar_datos canjes --salida canjes.csv
+#       python manage.py exportar_datos canjes --formato jsonl --desde 2025-01-01 --hasta 2025-01-31
+#       python manage.py exportar_datos promociones --id-negocio 12 > promociones.csv
+# =============================================================================
+
+import sys
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from functionality.utils.estadisticas.exportacion import EXPORTACIONES, FORMATOS, generar_exportacion
+
+
+class Command(BaseCommand):
+    help = "Exporta canjes, promociones o negocios en CSV o JSONL por streaming."
+
+    def add_arguments(self, parser):
+        parser.add_argument("tipo", choices=list(EXPORTACIONES))
+        parser.add_argument("--formato", choices=list(FORMATOS), default="csv")
+        parser.add_argument("--salida", default=None,
+                            help="Archivo de salida; por defecto la salida estándar.")
+        parser.add_argument("--desde", type=date.fromisoformat, default=None,
+                            help="Primer día local a exportar (AAAA-MM-DD).")
+        parser.add_argument("--hasta", type=date.fromisoformat, default=None,
+                            help="Último día local a exportar (AAAA-MM-DD).")
+        parser.add_argument("--id-negocio", type=int, default=None)
+
+    def handle(self, *args, **options):
+        if options["desde"] and options["hasta"] and options["desde"] > options["hasta"]:
+            raise CommandError("--desde debe ser anterior o igual a --hasta.")
+
+        bloques = generar_exportacion(
+            options["tipo"], options["formato"],
+            desde=options["desde"],
+            hasta=options["hasta"],
+            id_negocio=options["id_negocio"],
+        )
+        if options["salida"] is None:
+            for bloque in bloques:
+                sys.stdout.buffer.write(bloque)
+            sys.stdout.buffer.flush()
+            return
+
+        total = 0
+        with open(options["salida"], "wb") as archivo:
+            for bloque in bloques:
+                archivo.write(bloque)
+                total += len(bloque)
+        self.stderr.write(self.style.SUCCESS(
+            f"Exportación '{options['tipo']}' escrita en {options['salida']} ({total / (1024 * 1024):.1f} MB)."
+        ))
@@ -0,0 +1,83 @@
+# =============================================================================
+# Autores: Daniel Álvarez Sil y Yael Sinuhe Grajeda Martínez
+# Descripción:
+#   Genera en segundo plano las variantes responsivas (WebP 128/512/1024 px,
+#   sin EXIF) de las imágenes de promociones y logos de negocios que aún no
+#   las tienen. Útil para imágenes subidas antes de existir el pipeline o con
+#   IMAGENES_VARIANTES_EN_SUBIDA desactivado:
+#
+#       python manage.py generar_variantes_imagenes --hilos 4
+# =============================================================================
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from functionality.models import Negocio, Promocion
+from functionality.utils.imagenes.variantes import descargar_original, subir_variantes
+
+
+# Modelo, campo de imagen y campo de variantes de cada tipo
+OBJETIVOS = {
+    "promociones": (Promocion, "imagen", "imagen_variantes"),
+    "negocios": (Negocio, "logo", "logo_variantes"),
+}
+
+
+def _procesar(modelo, campo_variantes, pk: int, key: str) -> tuple[int, str]:
+    """Descarga el original, sube sus variantes y las registra. Devuelve (pk, error)."""
+    try:
+        with descargar_original(key) as original:
+            variantes = subir_variantes(original, key)
+        modelo.objects.filter(pk=pk).update(**{campo_variantes: variantes})
+        return pk, ""
+    except Exception as e:
+        return pk, str(e)
+    finally:
+        connection.close()
+
+
+class Command(BaseCommand):
+    help = "Genera las variantes WebP redimensionadas de imágenes y logos que no las tienen."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tipo", choices=["promociones", "negocios", "todos"], default="todos")
+        parser.add_argument("--hilos", type=int, default=4,
+                            help="Imágenes procesadas en paralelo.")
+        parser.add_argument("--limite", type=int, default=None,
+                            help="Número máximo de imágenes por tipo.")
+        parser.add_argument("--regenerar", action="store_true",
+                            help="Vuelve a generar también las que ya tienen variantes.")
+
+    def handle(self, *args, **options):
+        tipos = list(OBJETIVOS) if options["tipo"] == "todos" else [options["tipo"]]
+
+        with ThreadPoolExecutor(max_workers=max(1, options["hilos"])) as pool:
+            for tipo in tipos:
+                modelo, campo_imagen, campo_variantes = OBJETIVOS[tipo]
+                qs = modelo.objects.exclude(**{f"{campo_imagen}__isnull": True}).exclude(**{campo_imagen: ""})
+                if not options["regenerar"]:
+                    qs = qs.filter(**{campo_variantes: {}})
+                pendientes = qs.order_by("pk").values_list("pk", campo_imagen)
+                if options["limite"]:
+                    pendientes = pendientes[:options["limite"]]
+
+                inicio = time.monotonic()
+                procesadas = errores = 0
+                futuros = [
+                    pool.submit(_procesar, modelo, campo_variantes, pk, key)
+                    for pk, key in pendientes.iterator(chunk_size=500)
+                ]
+                for futuro in futuros:
+                    pk, error = futuro.result()
+                    procesadas += 1
+                    if error:
+                        errores += 1
+                        self.stderr.write(f"{tipo} {pk}: {error}")
+
+                self.stdout.write(self.style.SUCCESS(
+                    f"{tipo}: {procesadas - errores}/{procesadas} imágenes procesadas "
+                    f"en {time.monotonic() - inicio:.1f} s."
+                ))
@@ -0,0 +1,153 @@
+# =============================================================================
+# Autores: Daniel Álvarez Sil y Yael Sinuhe Grajeda Martínez
+# Descripción:
+#   Elimina del almacenamiento las imágenes que ningún registro referencia
+#   (subidas fallidas, promociones eliminadas, logos reemplazados, variantes
+#   obsoletas). Recorre el listado del backend (IMAGENES_BACKEND) por páginas,
+#   lo compara contra el conjunto en memoria de keys referenciadas (originales
+#   y variantes) y borra en lotes de hasta 1000 objetos los huérfanos más
+#   antiguos que el periodo de gracia (que protege subidas en curso o
+#   pendientes de confirmar).
+#
+#   Con keys por contenido, un registro nuevo puede reutilizar un objeto
+#   antiguo sin volver a subirlo. La subida renueva su fecha de modificación
+#   y, además, cada lote se vuelve a comparar contra la base de datos justo
+#   antes de borrarlo, por si la referencia apareció después de leerlas.
+#
+#       python manage.py limpiar_imagenes_huerfanas --simular
+#       python manage.py limpiar_imagenes_huerfanas --gracia-horas 72
+#
+#   Con AWS_S3_ENDPOINT_URL puede ejecutarse contra un S3 local (MinIO, moto)
+#   y con --backend local contra MEDIA_ROOT.
+# =============================================================================
+
+import re
+from datetime import timedelta
+from urllib.parse import urlparse
+
+from django.core.management.base import BaseCommand, CommandError
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from functionality.models import Negocio, Promocion
+from functionality.utils.imagenes.almacenamiento import BACKENDS, ErrorAlmacenamiento, obtener_almacenamiento
+
+
+PREFIJOS = ("fotos_promociones/", "logos_negocios/")
+TAMANO_LOTE = 1000
+
+# '<clave_sin_extension>_w<ancho>.webp' (ver variantes.clave_variante)
+_RE_VARIANTE = re.compile(r"_w(\d+)\.webp$")
+
+
+def _normalizar_key(valor: str) -> str:
+    """Acepta keys o URLs completas (registros antiguos) y devuelve la key."""
+    if valor.startswith(("http://", "https://")):
+        return urlparse(valor).path.lstrip("/")
+    return valor.lstrip("/")
+
+
+def keys_referenciadas() -> set[str]:
+    """Conjunto de keys usadas por promociones y negocios (originales y variantes)."""
+    referenciadas = set()
+    for modelo, campo, campo_variantes in (
+        (Promocion, "imagen", "imagen_variantes"),
+        (Negocio, "logo", "logo_variantes"),
+    ):
+        for key, variantes in modelo.objects.values_list(campo, campo_variantes).iterator(chunk_size=5000):
+            if key:
+                referenciadas.add(_normalizar_key(key))
+            referenciadas.update(_normalizar_key(v) for v in (variantes or {}).values())
+    return referenciadas
+
+
+def keys_en_uso(keys: list[str]) -> set[str]:
+    """Subconjunto de 'keys' referenciado ahora mismo (original o variante)."""
+    en_uso = set()
+    for modelo, campo, campo_variantes in (
+        (Promocion, "imagen", "imagen_variantes"),
+        (Negocio, "logo", "logo_variantes"),
+    ):
+        filtro = Q(**{f"{campo}__in": keys})
+        for key in keys:
+            variante = _RE_VARIANTE.search(key)
+            if variante:
+                filtro |= Q(**{f"{campo_variantes}__contains": {variante.group(1): key}})
+        for key, variantes in modelo.objects.filter(filtro).values_list(campo, campo_variantes):
+            if key:
+                en_uso.add(_normalizar_key(key))
+            en_uso.update(_normalizar_key(v) for v in (variantes or {}).values())
+    return en_uso & set(keys)
+
+
+class Command(BaseCommand):
+    help = "Elimina del almacenamiento las imágenes sin referencias más antiguas que el periodo de gracia."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--gracia-horas", type=int, default=None,
+                            help="Antigüedad mínima para eliminar (por defecto IMAGENES_GRACIA_HUERFANAS_HORAS).")
+        parser.add_argument("--prefijo", action="append", default=None,
+                            help="Prefijo a revisar (repetible). Por defecto: " + ", ".join(PREFIJOS))
+        parser.add_argument("--backend", choices=list(BACKENDS), default=None,
+                            help="Backend de almacenamiento (por defecto IMAGENES_BACKEND).")
+        parser.add_argument("--simular", action="store_true",
+                            help="Solo informa los huérfanos; no elimina nada.")
+
+    def handle(self, *args, **options):
+        try:
+            almacenamiento = obtener_almacenamiento(options["backend"])
+        except ErrorAlmacenamiento as e:
+            raise CommandError(str(e))
+
+        gracia = options["gracia_horas"]
+        if gracia is None:
+            gracia = getattr(settings, "IMAGENES_GRACIA_HUERFANAS_HORAS", 48)
+        limite = timezone.now() - timedelta(hours=gracia)
+
+        # Las referencias se leen antes del listado: un objeto subido (o
+        # reutilizado y renovado) después es más reciente que el periodo de
+        # gracia y no se toca; cada lote se revisa de nuevo antes de borrar
+        referenciadas = keys_referenciadas()
+        self.stdout.write(f"Keys referenciadas: {len(referenciadas)}.")
+
+        revisados = huerfanos = eliminados = bytes_liberados = 0
+        lote = {}
+
+        def vaciar_lote():
+            nonlocal eliminados, huerfanos, bytes_liberados
+            if not lote:
+                return
+            # Referencias creadas mientras se recorría el listado
+            for key in keys_en_uso(list(lote)):
+                huerfanos -= 1
+                bytes_liberados -= lote.pop(key)
+            if lote and not options["simular"]:
+                errores = almacenamiento.eliminar(list(lote))
+                for error in errores:
+                    self.stderr.write(f"No se pudo eliminar {error}")
+                eliminados += len(lote) - len(errores)
+            lote.clear()
+
+        try:
+            for prefijo in options["prefijo"] or PREFIJOS:
+                for objeto in almacenamiento.listar(prefijo):
+                    revisados += 1
+                    if objeto.key in referenciadas or objeto.modificado >= limite:
+                        continue
+                    huerfanos += 1
+                    bytes_liberados += objeto.tamano
+                    if options["simular"]:
+                        self.stdout.write(f"Huérfano: {objeto.key}")
+                    lote[objeto.key] = objeto.tamano
+                    if len(lote) >= TAMANO_LOTE:
+                        vaciar_lote()
+            vaciar_lote()
+        except ErrorAlmacenamiento as e:
+            raise CommandError(f"Error del almacenamiento: {e}")
+
+        accion = "se eliminarían" if options["simular"] else f"eliminados {eliminados}"
+        self.stdout.write(self.style.SUCCESS(
+            f"Objetos revisados: {revisados} | huérfanos: {huerfanos} ({accion}) | "
+            f"{bytes_liberados / (1024 * 1024):.1f} MB."
+        ))
@@ -0,0 +1,76 @@
+# =============================================================================
+# Autores: Daniel Álvarez Sil y Yael Sinuhe Grajeda Martínez
+# Descripción:
+#   Mide el rendimiento de subida de los backends de almacenamiento de
+#   imágenes: sube N archivos aleatorios de un tamaño dado con H hilos (como
+#   el pool de subidas de las vistas), informa archivos/s, MB/s y percentiles
+#   de latencia, y elimina lo subido al terminar.
+#
+#       python manage.py medir_almacenamiento --backend local --archivos 200
+#       python manage.py medir_almacenamiento --backend s3 --tamano-kb 2048 --hilos 8
+# =============================================================================
+
+import io
+import os
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+
+from functionality.utils.imagenes.almacenamiento import BACKENDS, ErrorAlmacenamiento, obtener_almacenamiento
+
+
+def _percentil(valores: list[float], p: float) -> float:
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(len(ordenados) * p))]
+
+
+class Command(BaseCommand):
+    help = "Mide archivos/s y MB/s de subida de un backend de almacenamiento de imágenes."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--backend", choices=list(BACKENDS), action="append", default=None,
+                            help="Backend a medir (repetible). Por defecto IMAGENES_BACKEND.")
+        parser.add_argument("--archivos", type=int, default=50)
+        parser.add_argument("--tamano-kb", type=int, default=512)
+        parser.add_argument("--hilos", type=int, default=4)
+        parser.add_argument("--prefijo", default="benchmark/",
+                            help="Prefijo de las keys de prueba (se eliminan al terminar).")
+
+    def handle(self, *args, **options):
+        contenido = os.urandom(options["tamano_kb"] * 1024)
+        for nombre in options["backend"] or [None]:
+            try:
+                almacenamiento = obtener_almacenamiento(nombre)
+            except ErrorAlmacenamiento as e:
+                raise CommandError(str(e))
+            self._medir(almacenamiento, contenido, options)
+
+    def _medir(self, almacenamiento, contenido, options):
+        prefijo = f"{options['prefijo'].rstrip('/')}/{uuid.uuid4().hex}/"
+        keys = [f"{prefijo}{i}.bin" for i in range(options["archivos"])]
+
+        def subir(key):
+            inicio = time.perf_counter()
+            almacenamiento.subir(io.BytesIO(contenido), key, "application/octet-stream")
+            return time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, options["hilos"])) as pool:
+                latencias = list(pool.map(subir, keys))
+            total = time.perf_counter() - inicio
+        except ErrorAlmacenamiento as e:
+            raise CommandError(f"[{almacenamiento.nombre}] Error al subir: {e}")
+        finally:
+            for error in almacenamiento.eliminar(keys):
+                self.stderr.write(f"No se pudo eliminar {error}")
+
+        mb = len(contenido) * len(keys) / (1024 * 1024)
+        self.stdout.write(self.style.SUCCESS(
+            f"[{almacenamiento.nombre}] {len(keys)} archivos de {len(contenido) // 1024} KB "
+            f"con {options['hilos']} hilos en {total:.2f} s | {len(keys) / total:.1f} archivos/s | "
+            f"{mb / total:.1f} MB/s | p50 {_percentil(latencias, 0.5) * 1000:.1f} ms | "
+            f"p95 {_percentil(latencias, 0.95) * 1000:.1f} ms"
+        ))
@@ -0,0 +1,53 @@
+# =============================================================================
+# Autores: Daniel Álvarez Sil y Yael Sinuhe Grajeda Martínez
+# Descripción:
+#   Worker de la cola de categorización con IA. Reclama tareas pendientes,
+#   ejecuta la inferencia y guarda las categorías de cada promoción.
+#
+#   Para procesar en paralelo basta con ejecutar varias instancias del comando
+#   (por ejemplo, con systemd o supervisor):
+#
+#       python manage.py procesar_categorizaciones --lote 10
+# =============================================================================
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from functionality.utils.ai.tareas import reclamar_tareas, procesar_tarea
+
+
+class Command(BaseCommand):
+    help = "Procesa la cola de tareas de categorización de promociones con IA."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--lote", type=int, default=10,
+                            help="Número máximo de tareas reclamadas por iteración.")
+        parser.add_argument("--intervalo", type=float, default=2.0,
+                            help="Segundos de espera cuando no hay tareas disponibles.")
+        parser.add_argument("--una-vez", action="store_true",
+                            help="Procesa las tareas disponibles y termina.")
+
+    def handle(self, *args, **options):
+        lote = max(1, options["lote"])
+        intervalo = options["intervalo"]
+        una_vez = options["una_vez"]
+
+        self.stdout.write("Worker de categorización iniciado.")
+        try:
+            while True:
+                close_old_connections()
+                tareas = reclamar_tareas(lote)
+
+                for tarea in tareas:
+                    ok = procesar_tarea(tarea)
+                    estado = "completada" if ok else "reprogramada/fallida"
+                    self.stdout.write(f"Tarea {tarea.id} (promoción {tarea.id_promocion_id}): {estado}.")
+
+                if not tareas:
+                    if una_vez:
+                        break
+                    time.sleep(intervalo)
+        except KeyboardInterrupt:
+            self.stdout.write("Worker detenido.")
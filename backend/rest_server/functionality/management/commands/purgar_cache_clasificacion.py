@@ -0,0 +1,37 @@
+# =============================================================================
+# Autores: Daniel Álvarez Sil y Yael Sinuhe Grajeda Martínez
+# Descripción:
+#   Aplica la política de desalojo de la caché de clasificaciones con IA y
+#   muestra sus métricas de uso (tasa de aciertos). Ejecutar periódicamente:
+#
+#       python manage.py purgar_cache_clasificacion
+# =============================================================================
+
+from django.core.management.base import BaseCommand
+
+from functionality.utils.ai.cache import purgar_cache, estadisticas_cache
+from functionality.utils.ai.categorias import obtener_categorias
+
+
+class Command(BaseCommand):
+    help = "Elimina entradas obsoletas de la caché de clasificaciones con IA y muestra su tasa de aciertos."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--max-entradas", type=int, default=None,
+                            help="Número máximo de entradas a conservar (por defecto AI_CACHE_MAX_ENTRADAS).")
+        parser.add_argument("--max-dias", type=int, default=None,
+                            help="Días sin uso tras los cuales se elimina una entrada (por defecto AI_CACHE_MAX_DIAS).")
+
+    def handle(self, *args, **options):
+        eliminadas = purgar_cache(
+            version_vigente=obtener_categorias().version,
+            max_entradas=options["max_entradas"],
+            max_dias=options["max_dias"],
+        )
+
+        stats = estadisticas_cache()["persistente"]
+        self.stdout.write(self.style.SUCCESS(f"Entradas eliminadas: {eliminadas}."))
+        self.stdout.write(
+            f"Entradas vigentes: {stats['entradas']} | aciertos acumulados: {stats['aciertos']} | "
+            f"tasa de aciertos: {stats['tasa_aciertos']:.1%}"
+        )
@@ -0,0 +1,148 @@
+# =============================================================================
+# Autores: Daniel Álvarez Sil y Yael Sinuhe Grajeda Martínez
+# Descripción:
+#   Reclasifica con IA las promociones sin categoría (sin registros en
+#   PromocionCategoria o solo con "Sin categoría"). Las llamadas a la IA se
+#   ejecutan en paralelo con un pool acotado de hilos y las escrituras se
+#   agrupan por lote con bulk_create. El progreso se guarda en un archivo de
+#   checkpoint para poder reanudar tras una interrupción.
+#
+#       python manage.py recategorizar_promociones --hilos 8 --lote 100
+# =============================================================================
+
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Count, F, Q
+
+from functionality.models import Categoria, Promocion, PromocionCategoria
+from functionality.utils.ai.automata import clasificar_promocion
+from functionality.utils.ai.tareas import campos_riesgo
+
+
+# =============================================================================
+# Función: _clasificar
+# Descripción:
+#   Tarea ejecutada en cada hilo del pool. Devuelve (id, categorías, campos de
+#   riesgo, error).
+# =============================================================================
+def _clasificar(promo: dict) -> tuple[int, list[int], dict, str]:
+    """Clasifica una promoción; los errores se devuelven en lugar de lanzarse."""
+    try:
+        resultado = clasificar_promocion(promo["nombre"], promo["descripcion"])
+        return promo["id"], resultado.categoria, campos_riesgo(resultado.riesgo, resultado.motivo_revision), ""
+    except Exception as e:
+        return promo["id"], [], {}, str(e)
+    finally:
+        # Cada hilo abre su propia conexión; se libera al terminar la tarea
+        connection.close()
+
+
+class Command(BaseCommand):
+    help = "Reclasifica con IA, de forma concurrente, las promociones que no tienen categoría."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--hilos", type=int, default=8,
+                            help="Número de solicitudes concurrentes a la IA.")
+        parser.add_argument("--lote", type=int, default=100,
+                            help="Promociones por lote (unidad de escritura y de checkpoint).")
+        parser.add_argument("--limite", type=int, default=None,
+                            help="Número máximo de promociones a procesar en esta ejecución.")
+        parser.add_argument("--checkpoint", default=".recategorizar_checkpoint.json",
+                            help="Archivo donde se guarda el último ID procesado.")
+        parser.add_argument("--reiniciar", action="store_true",
+                            help="Ignora el checkpoint existente y comienza desde el principio.")
+
+    # -------------------------------------------------------------------------
+    # Selección de promociones sin categoría
+    # -------------------------------------------------------------------------
+    def _pendientes(self, desde_id: int):
+        sin_categoria = Categoria.objects.filter(titulo="Sin categoría").values_list("id", flat=True).first()
+
+        qs = Promocion.objects.exclude(estatus_categorizacion="pendiente").filter(id__gt=desde_id)
+        if sin_categoria is None:
+            qs = qs.annotate(num_cat=Count("categorias")).filter(num_cat=0)
+        else:
+            qs = (
+                qs.annotate(
+                    num_cat=Count("categorias"),
+                    num_sin=Count("categorias", filter=Q(categorias__id=sin_categoria)),
+                )
+                .filter(Q(num_cat=0) | Q(num_cat=F("num_sin")))
+            )
+        return qs.order_by("id").values("id", "nombre", "descripcion")
+
+    # -------------------------------------------------------------------------
+    # Persistencia del lote
+    # -------------------------------------------------------------------------
+    def _guardar_lote(self, resultados: dict[int, list[int]], riesgos: dict[int, dict]) -> None:
+        with transaction.atomic():
+            PromocionCategoria.objects.filter(id_promocion_id__in=list(resultados)).delete()
+            PromocionCategoria.objects.bulk_create([
+                PromocionCategoria(id_promocion_id=id_promocion, id_categoria_id=cat_id)
+                for id_promocion, categorias in resultados.items()
+                for cat_id in dict.fromkeys(categorias)
+            ], batch_size=1000)
+            Promocion.objects.filter(id__in=list(resultados)).update(estatus_categorizacion="completada")
+            if riesgos:
+                Promocion.objects.bulk_update(
+                    [Promocion(id=id_promocion, **campos) for id_promocion, campos in riesgos.items()],
+                    ["riesgo", "nivel_riesgo", "motivo_revision", "revision_pendiente"],
+                    batch_size=500,
+                )
+
+    def handle(self, *args, **options):
+        hilos = max(1, options["hilos"])
+        tam_lote = max(1, options["lote"])
+        limite = options["limite"]
+        checkpoint = Path(options["checkpoint"])
+
+        ultimo_id = 0
+        if checkpoint.exists() and not options["reiniciar"]:
+            ultimo_id = json.loads(checkpoint.read_text()).get("ultimo_id", 0)
+            self.stdout.write(f"Reanudando desde la promoción {ultimo_id}.")
+
+        procesadas = exitosas = errores = 0
+        inicio = time.monotonic()
+
+        with ThreadPoolExecutor(max_workers=hilos) as pool:
+            while limite is None or procesadas < limite:
+                tam = tam_lote if limite is None else min(tam_lote, limite - procesadas)
+                lote = list(self._pendientes(ultimo_id)[:tam])
+                if not lote:
+                    break
+
+                resultados, riesgos = {}, {}
+                for id_promocion, categorias, riesgo, error in pool.map(_clasificar, lote):
+                    if categorias:
+                        resultados[id_promocion] = categorias
+                        if riesgo:
+                            riesgos[id_promocion] = riesgo
+                    else:
+                        errores += 1
+                        if error:
+                            self.stderr.write(f"Promoción {id_promocion}: {error}")
+
+                if resultados:
+                    self._guardar_lote(resultados, riesgos)
+
+                procesadas += len(lote)
+                exitosas += len(resultados)
+                ultimo_id = lote[-1]["id"]
+                checkpoint.write_text(json.dumps({"ultimo_id": ultimo_id}))
+
+                transcurrido = time.monotonic() - inicio
+                self.stdout.write(
+                    f"Procesadas {procesadas} (exitosas {exitosas}, errores {errores}) | "
+                    f"{procesadas / transcurrido:.1f} promociones/s | último ID {ultimo_id}"
+                )
+
+        transcurrido = time.monotonic() - inicio
+        self.stdout.write(self.style.SUCCESS(
+            f"Terminado: {exitosas}/{procesadas} promociones reclasificadas en {transcurrido:.1f} s "
+            f"({(procesadas / transcurrido) if transcurrido else 0:.1f} promociones/s)."
+        ))
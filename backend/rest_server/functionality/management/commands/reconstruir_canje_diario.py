@@ -0,0 +1,44 @@
+# =============================================================================
+# Autores: Daniel Álvarez Sil y Yael Sinuhe Grajeda Martínez
+# Descripción:
+#   Recalcula el agregado diario de canjes (CanjeDiario) a partir de la tabla
+#   'canje'. validarQRView lo mantiene al día en cada canje; este comando es
+#   para reparaciones o canjes cargados por otras vías:
+#
+#       python manage.py reconstruir_canje_diario --dias 7
+#       python manage.py reconstruir_canje_diario --desde 2025-01-01 --hasta 2025-01-31
+#       python manage.py reconstruir_canje_diario            # todo el histórico
+# =============================================================================
+
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from functionality.utils.estadisticas.canje_diario import reconstruir_canje_diario
+
+
+class Command(BaseCommand):
+    help = "Recalcula el agregado diario de canjes por negocio y promoción desde la tabla 'canje'."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--desde", type=date.fromisoformat, default=None,
+                            help="Primer día local a recalcular (AAAA-MM-DD).")
+        parser.add_argument("--hasta", type=date.fromisoformat, default=None,
+                            help="Último día local a recalcular (AAAA-MM-DD).")
+        parser.add_argument("--dias", type=int, default=None,
+                            help="Recalcula solo los últimos N días (incluye hoy).")
+
+    def handle(self, *args, **options):
+        desde, hasta = options["desde"], options["hasta"]
+        if options["dias"] is not None:
+            if desde or hasta:
+                raise CommandError("--dias no se combina con --desde/--hasta.")
+            hasta = timezone.localdate()
+            desde = hasta - timedelta(days=max(1, options["dias"]) - 1)
+        if desde and hasta and desde > hasta:
+            raise CommandError("--desde debe ser anterior o igual a --hasta.")
+
+        filas = reconstruir_canje_diario(desde, hasta)
+        rango = f"{desde or 'inicio'} a {hasta or 'hoy'}"
+        self.stdout.write(self.style.SUCCESS(f"Agregado diario recalculado ({rango}): {filas} filas."))
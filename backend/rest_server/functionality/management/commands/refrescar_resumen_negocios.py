@@ -0,0 +1,32 @@
+# =============================================================================
+# Autores: Daniel Álvarez Sil y Yael Sinuhe Grajeda Martínez
+# Descripción:
+#   Refresca la vista materializada del resumen de negocios que consume
+#   /functionality/negocios/resumen/. Programar con cron o un scheduler:
+#
+#       */5 * * * * python manage.py refrescar_resumen_negocios
+# =============================================================================
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from functionality.utils.estadisticas.resumen_negocios import refrescar_resumen_negocios, resumen_actualizado
+
+
+class Command(BaseCommand):
+    help = "Refresca (CONCURRENTLY) la vista materializada resumen_negocio."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--bloqueante", action="store_true",
+                            help="Refresco sin CONCURRENTLY (más rápido, bloquea las lecturas).")
+
+    def handle(self, *args, **options):
+        anterior = resumen_actualizado()
+        if anterior is None:
+            self.stdout.write("La vista estaba vacía.")
+        else:
+            antiguedad = (timezone.now() - anterior).total_seconds()
+            self.stdout.write(f"Datos anteriores calculados hace {antiguedad / 60:.1f} min.")
+
+        duracion = refrescar_resumen_negocios(concurrente=not options["bloqueante"])
+        self.stdout.write(self.style.SUCCESS(f"Resumen de negocios refrescado en {duracion:.2f} s."))
@@ -0,0 +1,56 @@
+# =============================================================================
+# Autores: Daniel Álvarez Sil y Yael Sinuhe Grajeda Martínez
+# Descripción:
+#   Levanta el stub local compatible con la API de OpenAI (utils/ai/stub.py)
+#   para pruebas de carga e integración sin red:
+#
+#       python manage.py servidor_openai_stub --puerto 8765 --latencia-ms 800 \
+#           --variacion-ms 200 --tasa-error 0.02
+#
+#   Después, configurar OPENAI_BASE_URL=http://127.0.0.1:8765/v1 en el
+#   servidor y en los workers de categorización.
+# =============================================================================
+
+from django.core.management.base import BaseCommand, CommandError
+
+from functionality.utils.ai.stub import crear_servidor
+
+
+class Command(BaseCommand):
+    help = "Inicia un servidor local que simula POST /v1/responses de OpenAI."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--puerto", type=int, default=8765)
+        parser.add_argument("--latencia-ms", type=float, default=0,
+                            help="Latencia media simulada por respuesta.")
+        parser.add_argument("--variacion-ms", type=float, default=0,
+                            help="Desviación estándar de la latencia simulada.")
+        parser.add_argument("--tasa-error", type=float, default=0.0,
+                            help="Fracción de peticiones que responden HTTP 500 (0 a 1).")
+        parser.add_argument("--verbose", action="store_true",
+                            help="Registra cada petición en la salida estándar.")
+
+    def handle(self, *args, **options):
+        if not 0 <= options["tasa_error"] <= 1:
+            raise CommandError("--tasa-error debe estar entre 0 y 1.")
+
+        servidor = crear_servidor(
+            host=options["host"],
+            puerto=options["puerto"],
+            latencia_ms=options["latencia_ms"],
+            variacion_ms=options["variacion_ms"],
+            tasa_error=options["tasa_error"],
+            verbose=options["verbose"],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Stub de OpenAI escuchando en http://{options['host']}:{options['puerto']}/v1 "
+            f"(latencia {options['latencia_ms']:.0f}±{options['variacion_ms']:.0f} ms, "
+            f"errores {options['tasa_error']:.0%})."
+        ))
+        try:
+            servidor.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            servidor.server_close()
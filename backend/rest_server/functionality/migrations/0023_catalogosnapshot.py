@@ -0,0 +1,26 @@
+# Generated by Django 5.2.7 on 2025-10-24 18:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('functionality', '0022_alter_promocion_tipo'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CatalogoSnapshot',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('hash_contenido', models.CharField(max_length=64)),
+                ('contenido', models.BinaryField()),
+                ('tamano', models.PositiveIntegerField()),
+                ('fecha_creado', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'catalogo_snapshot',
+            },
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.7 on 2025-10-25 11:42
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('functionality', '0023_catalogosnapshot'),
+    ]
+
+    operations = [
+        # Las promociones existentes ya fueron categorizadas de forma síncrona
+        migrations.AddField(
+            model_name='promocion',
+            name='estatus_categorizacion',
+            field=models.CharField(choices=[('pendiente', 'Pendiente'), ('completada', 'Completada'), ('fallida', 'Fallida')], default='completada', max_length=20),
+            preserve_default=False,
+        ),
+        migrations.AlterField(
+            model_name='promocion',
+            name='estatus_categorizacion',
+            field=models.CharField(choices=[('pendiente', 'Pendiente'), ('completada', 'Completada'), ('fallida', 'Fallida')], default='pendiente', max_length=20),
+        ),
+        migrations.CreateModel(
+            name='TareaCategorizacion',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('estatus', models.CharField(choices=[('pendiente', 'Pendiente'), ('procesando', 'Procesando'), ('completada', 'Completada'), ('fallida', 'Fallida')], default='pendiente', max_length=20)),
+                ('intentos', models.IntegerField(default=0)),
+                ('max_intentos', models.IntegerField(default=5)),
+                ('disponible_en', models.DateTimeField()),
+                ('bloqueado_en', models.DateTimeField(blank=True, null=True)),
+                ('ultimo_error', models.TextField(blank=True, null=True)),
+                ('fecha_creado', models.DateTimeField(auto_now_add=True)),
+                ('fecha_actualizado', models.DateTimeField(auto_now=True)),
+                ('id_promocion', models.ForeignKey(db_column='id_promocion', on_delete=django.db.models.deletion.DO_NOTHING, to='functionality.promocion')),
+            ],
+            options={
+                'db_table': 'tarea_categorizacion',
+                'indexes': [models.Index(fields=['estatus', 'disponible_en'], name='tarea_cat_estatus_disp_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.7 on 2025-10-25 16:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('functionality', '0024_promocion_estatus_categorizacion_tareacategorizacion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClasificacionCache',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('clave', models.CharField(max_length=64, unique=True)),
+                ('version_categorias', models.CharField(max_length=64)),
+                ('categorias', models.JSONField(default=list)),
+                ('riesgo', models.CharField(blank=True, max_length=10, null=True)),
+                ('motivo_revision', models.TextField(blank=True, null=True)),
+                ('aciertos', models.IntegerField(default=0)),
+                ('fecha_creado', models.DateTimeField(auto_now_add=True)),
+                ('ultimo_uso', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'clasificacion_cache',
+                'indexes': [models.Index(fields=['ultimo_uso'], name='clasif_cache_ultimo_uso_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.7 on 2025-10-26 10:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('functionality', '0025_clasificacioncache'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='promocion',
+            name='riesgo',
+            field=models.CharField(blank=True, choices=[('BAJO', 'Bajo'), ('MEDIO', 'Medio'), ('ALTO', 'Alto')], max_length=10, null=True),
+        ),
+        migrations.AddField(
+            model_name='promocion',
+            name='nivel_riesgo',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='promocion',
+            name='motivo_revision',
+            field=models.TextField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='promocion',
+            name='revision_pendiente',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddIndex(
+            model_name='promocion',
+            index=models.Index(condition=models.Q(('revision_pendiente', True)), fields=['-nivel_riesgo', 'id'], name='promocion_cola_revision_idx'),
+        ),
+    ]
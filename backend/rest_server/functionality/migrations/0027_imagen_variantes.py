@@ -0,0 +1,23 @@
+# Generated by Django 5.2.7 on 2025-10-27 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('functionality', '0026_promocion_riesgo_revision'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='negocio',
+            name='logo_variantes',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='promocion',
+            name='imagen_variantes',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.7 on 2025-10-28 11:20
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+# Carga inicial del agregado a partir de los canjes existentes
+LLENAR_CANJE_DIARIO = """
+    INSERT INTO canje_diario (id_negocio, id_promocion, fecha, canjes)
+    SELECT p.id_negocio, c.id_promocion, (c.fecha_creado AT TIME ZONE %s)::date, COUNT(*)
+    FROM canje c
+    JOIN promocion p ON p.id = c.id_promocion
+    WHERE p.id_negocio IS NOT NULL
+    GROUP BY 1, 2, 3
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('functionality', '0027_imagen_variantes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CanjeDiario',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('fecha', models.DateField()),
+                ('canjes', models.PositiveIntegerField(default=0)),
+                ('id_negocio', models.ForeignKey(db_column='id_negocio', on_delete=django.db.models.deletion.DO_NOTHING, to='functionality.negocio')),
+                ('id_promocion', models.ForeignKey(db_column='id_promocion', on_delete=django.db.models.deletion.DO_NOTHING, to='functionality.promocion')),
+            ],
+            options={
+                'db_table': 'canje_diario',
+                'indexes': [models.Index(fields=['fecha'], name='canje_diario_fecha_idx')],
+                'constraints': [models.UniqueConstraint(fields=('id_negocio', 'id_promocion', 'fecha'), name='canje_diario_unico')],
+            },
+        ),
+        migrations.RunSQL(
+            [(LLENAR_CANJE_DIARIO, [settings.TIME_ZONE])],
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1,73 @@
+# Generated by Django 5.2.7 on 2025-10-28 17:45
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+# Vista materializada; el índice único permite REFRESH ... CONCURRENTLY
+CREAR_RESUMEN_NEGOCIO = """
+    CREATE MATERIALIZED VIEW resumen_negocio AS
+    WITH administradores AS (
+        SELECT DISTINCT ON (id_negocio) id_negocio, id, nombre, usuario, correo
+        FROM administrador_negocio
+        WHERE id_negocio IS NOT NULL
+        ORDER BY id_negocio, id
+    ), promociones AS (
+        SELECT id_negocio, COUNT(*) AS total
+        FROM promocion
+        WHERE id_negocio IS NOT NULL
+        GROUP BY id_negocio
+    ), canjes AS (
+        SELECT id_negocio, SUM(canjes) AS total
+        FROM canje_diario
+        GROUP BY id_negocio
+    )
+    SELECT n.id AS id_negocio,
+           a.id AS admin_id,
+           a.nombre AS admin_nombre,
+           a.usuario AS admin_usuario,
+           a.correo AS admin_correo,
+           COALESCE(p.total, 0)::integer AS num_promociones,
+           COALESCE(c.total, 0)::bigint AS total_canjes,
+           CASE WHEN p.total > 0 THEN COALESCE(c.total, 0)::double precision / p.total
+                ELSE 0.0 END AS avg_canje_por_promocion,
+           now() AS actualizado
+    FROM negocio n
+    LEFT JOIN administradores a ON a.id_negocio = n.id
+    LEFT JOIN promociones p ON p.id_negocio = n.id
+    LEFT JOIN canjes c ON c.id_negocio = n.id
+    WITH DATA;
+
+    CREATE UNIQUE INDEX resumen_negocio_id_negocio_idx ON resumen_negocio (id_negocio);
+"""
+
+ELIMINAR_RESUMEN_NEGOCIO = "DROP MATERIALIZED VIEW IF EXISTS resumen_negocio;"
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('functionality', '0028_canjediario'),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREAR_RESUMEN_NEGOCIO, reverse_sql=ELIMINAR_RESUMEN_NEGOCIO),
+        migrations.CreateModel(
+            name='ResumenNegocio',
+            fields=[
+                ('id_negocio', models.OneToOneField(db_column='id_negocio', on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='resumen', serialize=False, to='functionality.negocio')),
+                ('admin_id', models.BigIntegerField(blank=True, null=True)),
+                ('admin_nombre', models.CharField(blank=True, max_length=100, null=True)),
+                ('admin_usuario', models.CharField(blank=True, max_length=64, null=True)),
+                ('admin_correo', models.CharField(blank=True, max_length=255, null=True)),
+                ('num_promociones', models.IntegerField()),
+                ('total_canjes', models.BigIntegerField()),
+                ('avg_canje_por_promocion', models.FloatField()),
+                ('actualizado', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'resumen_negocio',
+                'managed': False,
+            },
+        ),
+    ]
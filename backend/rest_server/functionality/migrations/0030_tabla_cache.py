@@ -0,0 +1,20 @@
+# Tabla del caché de Django (DatabaseCache, ver CACHES en settings.py)
+
+from django.core.management import call_command
+from django.db import migrations
+
+
+def crear_tabla_cache(apps, schema_editor):
+    # Idempotente: createcachetable omite las tablas que ya existen
+    call_command("createcachetable", database=schema_editor.connection.alias, verbosity=0)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('functionality', '0029_resumennegocio'),
+    ]
+
+    operations = [
+        migrations.RunPython(crear_tabla_cache, migrations.RunPython.noop),
+    ]
@@ -174,6 +174,8 @@ class Negocio(models.Model):
     municipio = models.CharField(max_length=120, blank=True, null=True)
     estado = models.CharField(max_length=120, blank=True, null=True)
     logo = models.ImageField(max_length=500, blank=True, null=True)
+    # Variantes WebP redimensionadas del logo: {"<ancho>": "<key>"}
+    logo_variantes = models.JSONField(default=dict, blank=True)
     url_maps = models.TextField(blank=True, null=True)
 
     class Meta:
@@ -203,6 +205,8 @@ class Promocion(models.Model):
     fecha_inicio = models.DateTimeField()
     fecha_fin = models.DateTimeField()
     imagen = models.ImageField(blank=True, null=True, max_length=500)
+    # Variantes WebP redimensionadas de la imagen: {"<ancho>": "<key>"}
+    imagen_variantes = models.JSONField(default=dict, blank=True)
     numero_canjeados = models.IntegerField()
     tipo = models.CharField(
         choices=[
@@ -218,6 +222,25 @@ class Promocion(models.Model):
     precio = models.DecimalField(max_digits=12, decimal_places=5)
     activo = models.BooleanField(default=True)
     fecha_creado = models.DateTimeField(auto_now=True)
+    estatus_categorizacion = models.CharField(
+        choices=[
+            ('pendiente', 'Pendiente'),
+            ('completada', 'Completada'),
+            ('fallida', 'Fallida'),
+        ],
+        max_length=20,
+        default='pendiente'
+    )
+    # Resultado de la evaluación de riesgo de la IA (cola de revisión de moderadores)
+    riesgo = models.CharField(
+        choices=[('BAJO', 'Bajo'), ('MEDIO', 'Medio'), ('ALTO', 'Alto')],
+        max_length=10,
+        blank=True,
+        null=True
+    )
+    nivel_riesgo = models.PositiveSmallIntegerField(default=0)  # 0 sin evaluar, 1 bajo, 2 medio, 3 alto
+    motivo_revision = models.TextField(blank=True, null=True)
+    revision_pendiente = models.BooleanField(default=False)
     categorias = models.ManyToManyField(
         Categoria,
         through='PromocionCategoria',
@@ -226,6 +249,13 @@ class Promocion(models.Model):
 
     class Meta:
         db_table = 'promocion'
+        indexes = [
+            models.Index(
+                fields=['-nivel_riesgo', 'id'],
+                name='promocion_cola_revision_idx',
+                condition=models.Q(revision_pendiente=True),
+            ),
+        ]
 
     def __str__(self):
         """Devuelve el nombre de la promoción."""
@@ -249,6 +279,46 @@ class PromocionCategoria(models.Model):
         return f"{self.id_promocion.nombre} - {self.id_categoria.titulo}"
 
 
+# =============================================================================
+# Modelo: TareaCategorizacion
+# Descripción:
+#   Cola de trabajos (respaldada en base de datos) para la categorización de
+#   promociones con IA. Los workers (`python manage.py procesar_categorizaciones`)
+#   reclaman tareas pendientes, ejecutan la inferencia fuera de la transacción
+#   de creación y reintentan con backoff exponencial en caso de error.
+# =============================================================================
+class TareaCategorizacion(models.Model):
+    id = models.BigAutoField(primary_key=True)
+    id_promocion = models.ForeignKey(Promocion, models.DO_NOTHING, db_column='id_promocion')
+    estatus = models.CharField(
+        choices=[
+            ('pendiente', 'Pendiente'),
+            ('procesando', 'Procesando'),
+            ('completada', 'Completada'),
+            ('fallida', 'Fallida'),
+        ],
+        max_length=20,
+        default='pendiente'
+    )
+    intentos = models.IntegerField(default=0)
+    max_intentos = models.IntegerField(default=5)
+    disponible_en = models.DateTimeField()
+    bloqueado_en = models.DateTimeField(blank=True, null=True)
+    ultimo_error = models.TextField(blank=True, null=True)
+    fecha_creado = models.DateTimeField(auto_now_add=True)
+    fecha_actualizado = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'tarea_categorizacion'
+        indexes = [
+            models.Index(fields=['estatus', 'disponible_en'], name='tarea_cat_estatus_disp_idx'),
+        ]
+
+    def __str__(self):
+        """Devuelve el estado de la tarea."""
+        return f"Tarea {self.id} - Promoción {self.id_promocion_id} ({self.estatus})"
+
+
 # =============================================================================
 # Modelo: SolicitudNegocio
 # Descripción:
@@ -380,3 +450,115 @@ class CodigoQR(models.Model):
     def __str__(self):
         """Devuelve una descripción del código QR."""
         return f"QR de {self.id_usuario.nombre} - {self.id_promocion.nombre}"
+
+
+# =============================================================================
+# Modelo: CatalogoSnapshot
+# Descripción:
+#   Versión inmutable del catálogo público (promociones activas, negocios y
+#   categorías) comprimida con gzip, para clientes que trabajan sin conexión.
+#   El ID funciona como número de versión y el hash identifica el contenido.
+# =============================================================================
+class CatalogoSnapshot(models.Model):
+    id = models.BigAutoField(primary_key=True)
+    hash_contenido = models.CharField(max_length=64)
+    contenido = models.BinaryField()
+    tamano = models.PositiveIntegerField()
+    fecha_creado = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'catalogo_snapshot'
+
+    def __str__(self):
+        """Devuelve la versión y el hash del snapshot."""
+        return f"Catálogo v{self.id} ({self.hash_contenido[:12]})"
+
+
+# =============================================================================
+# Modelo: ClasificacionCache
+# Descripción:
+#   Resultados de clasificación de promociones con IA, indexados por el hash
+#   del texto normalizado (nombre + descripción) y la versión del conjunto de
+#   categorías. Evita repetir llamadas a OpenAI para textos ya clasificados.
+# =============================================================================
+class ClasificacionCache(models.Model):
+    id = models.BigAutoField(primary_key=True)
+    clave = models.CharField(max_length=64, unique=True)
+    version_categorias = models.CharField(max_length=64)
+    categorias = models.JSONField(default=list)
+    riesgo = models.CharField(max_length=10, blank=True, null=True)
+    motivo_revision = models.TextField(blank=True, null=True)
+    aciertos = models.IntegerField(default=0)
+    fecha_creado = models.DateTimeField(auto_now_add=True)
+    ultimo_uso = models.DateTimeField()
+
+    class Meta:
+        db_table = 'clasificacion_cache'
+        indexes = [
+            models.Index(fields=['ultimo_uso'], name='clasif_cache_ultimo_uso_idx'),
+        ]
+
+    def __str__(self):
+        """Devuelve la clave abreviada y las categorías almacenadas."""
+        return f"{self.clave[:12]} -> {self.categorias}"
+
+
+# =============================================================================
+# Modelo: CanjeDiario
+# Descripción:
+#   Agregado de canjes por negocio, promoción y día local (TIME_ZONE). Se
+#   actualiza en la misma transacción que registra cada canje (validarQRView)
+#   y puede reconstruirse desde 'canje' con
+#   `python manage.py reconstruir_canje_diario`. Las vistas de estadísticas lo
+#   consultan en lugar de contar filas de Canje.
+# =============================================================================
+class CanjeDiario(models.Model):
+    id = models.BigAutoField(primary_key=True)
+    id_negocio = models.ForeignKey(Negocio, models.DO_NOTHING, db_column='id_negocio')
+    id_promocion = models.ForeignKey(Promocion, models.DO_NOTHING, db_column='id_promocion')
+    fecha = models.DateField()
+    canjes = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = 'canje_diario'
+        constraints = [
+            models.UniqueConstraint(fields=['id_negocio', 'id_promocion', 'fecha'], name='canje_diario_unico'),
+        ]
+        indexes = [
+            models.Index(fields=['fecha'], name='canje_diario_fecha_idx'),
+        ]
+
+    def __str__(self):
+        """Devuelve la promoción, el día y el número de canjes."""
+        return f"{self.id_promocion_id} {self.fecha}: {self.canjes}"
+
+
+# =============================================================================
+# Modelo: ResumenNegocio
+# Descripción:
+#   Vista materializada de Postgres (migración 0029) con el resumen de cada
+#   negocio para NegociosResumenView: administrador principal, número de
+#   promociones, canjes totales y promedio por promoción. Django no la
+#   administra; se refresca (CONCURRENTLY, sin bloquear lecturas) con
+#   `python manage.py refrescar_resumen_negocios`.
+# =============================================================================
+class ResumenNegocio(models.Model):
+    id_negocio = models.OneToOneField(
+        Negocio, models.DO_NOTHING, db_column='id_negocio', primary_key=True, related_name='resumen'
+    )
+    admin_id = models.BigIntegerField(blank=True, null=True)
+    admin_nombre = models.CharField(max_length=100, blank=True, null=True)
+    admin_usuario = models.CharField(max_length=64, blank=True, null=True)
+    admin_correo = models.CharField(max_length=255, blank=True, null=True)
+    num_promociones = models.IntegerField()
+    total_canjes = models.BigIntegerField()
+    avg_canje_por_promocion = models.FloatField()
+    actualizado = models.DateTimeField()
+
+    class Meta:
+        managed = False
+        db_table = 'resumen_negocio'
+
+    def __str__(self):
+        """Devuelve el negocio y sus totales."""
+        return f"{self.id_negocio_id}: {self.num_promociones} promociones, {self.total_canjes} canjes"
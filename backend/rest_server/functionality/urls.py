@@ -4,7 +4,8 @@ from django.urls import path
 from .views import (AdministradorNegocioCreateView, PromocionListView, 
                     PromocionDeleteView, PromocionUpdateView, PromocionCreateView, 
                     EstadisticasNegocioView, ReviewSolicitudNegocioAPIView, 
-                    detalleNegocioView)
+                    detalleNegocioView, PromocionesRevisionView, ResolverRevisionPromocionView,
+                    MetricasIAView, SerieCanjesView, ExportarDatosView)
 
 # Colaboradores Views
 from .views import (PromocionesPorNegocioUltimoMes, SolicitudNegocioListView, CanjesPorNegocioLastMonthView,
@@ -16,10 +17,15 @@ from .views import (PromocionesPorNegocioUltimoMes, SolicitudNegocioListView, Ca
 from .views import (CodigoQRView, ListNegociosView, ListPromocionesView, SuscripcionANegocioView, 
                     ListPromocionSuscripcionesView, ListCategoriasView, ListUsuarioInfoView, 
                     NegocioAndPromocionesViews, ApartarPromocionView, ListPromocionesApartadasView, 
-                    ListAllNegociosMapView)
+                    ListAllNegociosMapView, InicioUsuarioView, ListPromocionesPorIdsView,
+                    ListNegociosPorIdsView)
+
+# Catalogo Views
+from .views import (CatalogoSnapshotView, CatalogoDeltaView)
 
 # Imagenes Upload Views
-from .views import (PromocionCreateImageUploadView, NegocioCreateImageUploadView)
+from .views import (PromocionCreateImageUploadView, NegocioCreateImageUploadView,
+                    FirmarSubidaView, ConfirmarSubidaView)
 
 # Cajeros Views
 from .views import validarQRView
@@ -48,9 +54,14 @@ urlpatterns = [
     path("total-colaboradores/", TotalColaboradoresView.as_view(), name="total-colaboradores"),
     path("promociones/activas-por-negocio/", PromocionesActivasPorNegocioAPIView.as_view(), name="promociones-activas-por-negocio"),
     path("estadisticas/header/", EstadisticasHeaderView.as_view(), name="estadisticas-header"),
+    path("estadisticas/canjes/serie/", SerieCanjesView.as_view(), name="estadisticas-canjes-serie"),
+    path("exportaciones/<str:tipo>/", ExportarDatosView.as_view(), name="exportaciones"),
     path("negocios/resumen/", NegociosResumenView.as_view(), name="negocios-resumen"),
     path("solicitudes-negocio/review/", ReviewSolicitudNegocioAPIView.as_view(), name="review-solicitud-negocio"),
     path("negocio/detalle/", detalleNegocioView.as_view(), name="detalle-negocio"),
+    path("promociones/revision/", PromocionesRevisionView.as_view(), name="promociones-revision"),
+    path("promociones/revision/resolver/", ResolverRevisionPromocionView.as_view(), name="promociones-revision-resolver"),
+    path("ai/metricas/", MetricasIAView.as_view(), name="ai-metricas"),
 
     # Usuarios
     path("usuario/codigo-qr/", CodigoQRView.as_view(), name="codigo-qr"),
@@ -64,9 +75,18 @@ urlpatterns = [
     path("usuario/apartar-promocion/", ApartarPromocionView.as_view(), name="apartar-promocion"),
     path("usuario/list/promociones-apartadas/", ListPromocionesApartadasView.as_view(), name="list-promociones-apartadas"),
     path("usuario/list/todos-los-negocios-mapa/", ListAllNegociosMapView.as_view(), name="list-all-negocios-mapa"),
+    path("usuario/inicio/", InicioUsuarioView.as_view(), name="inicio-usuario"),
+    path("usuario/list/promociones-por-ids/", ListPromocionesPorIdsView.as_view(), name="list-promociones-por-ids"),
+    path("usuario/list/negocios-por-ids/", ListNegociosPorIdsView.as_view(), name="list-negocios-por-ids"),
+    path("usuario/catalogo/", CatalogoSnapshotView.as_view(), name="catalogo-snapshot"),
+    path("usuario/catalogo/delta/", CatalogoDeltaView.as_view(), name="catalogo-delta"),
     # Imagenes para pruebas
     # path("imagenes/upload/", UploadFileView.as_view(), name="upload-file"),
 
+    # Imagenes (subida directa a S3)
+    path("imagenes/subida/firmar/", FirmarSubidaView.as_view(), name="imagenes-subida-firmar"),
+    path("imagenes/subida/confirmar/", ConfirmarSubidaView.as_view(), name="imagenes-subida-confirmar"),
+
     # Cajeros
     path("cajero/validar-qr/", validarQRView.as_view(), name="validar-qr"),
 ]
@@ -10,26 +10,50 @@
 from rest_framework import permissions, status
 from rest_framework.generics import ListAPIView
 from ...models import (
-    SolicitudNegocio, Promocion, Canje, Negocio,
-    AdministradorNegocio, Administrador, SolicitudNegocioDetalle, Cajero
+    SolicitudNegocio, Promocion, Negocio,
+    AdministradorNegocio, Administrador, SolicitudNegocioDetalle, Cajero, CanjeDiario
 )
 from login.models import User
 from .serializers import (
     SolicitudNegocioSerializer, CajeroSerializer,
-    NegocioFullSerializer, AdministradorNegocioFullSerializer
+    NegocioFullSerializer, AdministradorNegocioFullSerializer,
+    PromocionRevisionSerializer, SerieCanjesParamsSerializer, ExportacionParamsSerializer,
+    ResolverRevisionParamsSerializer
 )
-from datetime import datetime, timedelta, time
-from dateutil.relativedelta import relativedelta
+from datetime import timedelta
 from django.utils import timezone
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from django.db.models import (
-    Count, FloatField, Subquery, OuterRef, F, Value, Case, When
+    Count, FloatField, Subquery, OuterRef, F, Value, Case, When, Sum
 )
 from django.db.models import Q
-from django.db.models.functions import TruncDate
-from django.conf import settings
+from django.http import StreamingHttpResponse
 from zoneinfo import ZoneInfo
+from ..ai.cache import estadisticas_cache
+from ..ai.resiliencia import metricas_openai
+from ..estadisticas.exportacion import FORMATOS, generar_exportacion
+from ..estadisticas.header import invalidar_metricas_header, metricas_header
+from ..estadisticas.series import PresupuestoExcedido, serie_canjes
+from ..imagenes.resolutor import ResolutorUrls
+from ..imagenes.variantes import construir_srcset
+
+
+# =============================================================================
+# Clase: EsAdministrador
+# Descripción:
+#   Permiso de DRF: el usuario autenticado es un administrador del sistema
+#   (existe un Administrador con su correo como nombre de usuario).
+# =============================================================================
+class EsAdministrador(permissions.BasePermission):
+    """Solo administradores del sistema; responde 403 a cualquier otro usuario."""
+    message = "Solo los administradores del sistema pueden usar este recurso."
+
+    def has_permission(self, request, view):
+        return bool(
+            request.user and request.user.is_authenticated
+            and Administrador.objects.filter(correo=request.user.username).exists()
+        )
 
 
 class SolicitudNegocioListView(ListAPIView):
@@ -167,23 +191,8 @@ class PromocionesPorNegocioUltimoMes(APIView):
     permission_classes = [permissions.AllowAny]
 
     def get(self, request, *args, **kwargs):
-        # Límites (mes anterior) en TZ del servidor/Django
-        now = timezone.now().astimezone(timezone.get_current_timezone())
-        first_of_this_month = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        start = first_of_this_month - relativedelta(months=1)
-        end = first_of_this_month + relativedelta(months=1)
-
-        qs = (
-            Promocion.objects
-            .exclude(id_negocio__isnull=True)
-            .filter(fecha_creado__gte=start, fecha_creado__lt=end)
-            .values('id_negocio__nombre')
-            .annotate(num_promociones=Count('id'))
-            .order_by()  # sin orden implícito
-        )
-
-        data = {row['id_negocio__nombre']: row['num_promociones'] for row in qs}
-        return Response(data)
+        # Métricas compartidas con el encabezado (una consulta, en caché)
+        return Response(metricas_header()["promociones_por_negocio_ultimo_mes"])
 
 
 class CanjesPorNegocioLastMonthView(APIView):
@@ -193,30 +202,17 @@ class CanjesPorNegocioLastMonthView(APIView):
     GET /functionality/canjes/por-negocio-ultimo-mes/
 
     Respuesta:
-        { "<negocio_nombre>": <num_canjes>, ... }
+        { "<negocio_nombre>": <num_canjes>, ... }  (de mayor a menor)
+
+    Nota:
+        Como en la implementación original, la ventana efectiva es el mes
+        calendario en curso (hora local).
     """
     permission_classes = [permissions.AllowAny]
 
     def get(self, request, *args, **kwargs):
-        now = timezone.now()
-        # Inicio del mes actual (desplazado a siguiente mes para usar rango [mes_anterior, mes_actual))
-        start_cur_month = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0) + relativedelta(months=1)
-        start_last_month = start_cur_month - relativedelta(months=1)
-
-        qs = (
-            Canje.objects
-            .filter(
-                fecha_creado__gte=start_last_month,
-                fecha_creado__lt=start_cur_month,
-                id_promocion__id_negocio__isnull=False,
-            )
-            .values("id_promocion__id_negocio__nombre")
-            .annotate(num_canjes=Count("id"))
-            .order_by("-num_canjes")
-        )
-
-        data = {row["id_promocion__id_negocio__nombre"]: row["num_canjes"] for row in qs}
-        return Response(data)
+        # Métricas compartidas con el encabezado (agregado diario, en caché)
+        return Response(metricas_header()["canjes_por_negocio_mes_actual"])
 
 
 class PromocionesActivasPorNegocioAPIView(APIView):
@@ -231,14 +227,7 @@ class PromocionesActivasPorNegocioAPIView(APIView):
     permission_classes = [permissions.AllowAny]
 
     def get(self, request):
-        data = (
-            Promocion.objects
-            .filter(activo=True)
-            .values('id_negocio__nombre')
-            .annotate(promociones_activas=Count('id'))
-            .order_by('id_negocio__nombre')
-        )
-        result = {item['id_negocio__nombre']: item['promociones_activas'] for item in data}
+        result = metricas_header()["promociones_activas_por_negocio"]
         return Response(result, status=status.HTTP_200_OK)
 
 
@@ -254,8 +243,7 @@ class TotalColaboradoresView(APIView):
     permission_classes = [permissions.AllowAny]
 
     def get(self, request, *args, **kwargs):
-        total_negocios = Negocio.objects.count()
-        return Response({"total_colaboradores": total_negocios})
+        return Response({"total_colaboradores": metricas_header()["total_colaboradores"]})
 
 
 class EstadisticasHeaderView(APIView):
@@ -272,61 +260,61 @@ class EstadisticasHeaderView(APIView):
     permission_classes = [permissions.AllowAny]
 
     def get(self, request, *args, **kwargs):
-        # 1) Ventana temporal del último mes
-        now = timezone.now().astimezone(timezone.get_current_timezone())
-        first_of_this_month = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        start_last_month = first_of_this_month - relativedelta(months=1)
-        end_next_month = first_of_this_month + relativedelta(months=1)
-
-        # 2) Promociones por negocio
-        promociones_mes = (
-            Promocion.objects
-            .exclude(id_negocio__isnull=True)
-            .filter(fecha_creado__gte=start_last_month, fecha_creado__lt=end_next_month)
-            .values('id_negocio__nombre')
-            .annotate(num_promociones=Count('id'))
-            .order_by()
-        )
-        promociones_mes_data = {r['id_negocio__nombre']: r['num_promociones'] for r in promociones_mes}
-
-        # 3) Canjes por negocio
-        canjes_mes = (
-            Canje.objects
-            .filter(
-                fecha_creado__gte=start_last_month,
-                fecha_creado__lt=end_next_month,
-                id_promocion__id_negocio__isnull=False
-            )
-            .values('id_promocion__id_negocio__nombre')
-            .annotate(num_canjes=Count('id'))
-            .order_by()
-        )
-        canjes_mes_data = {r['id_promocion__id_negocio__nombre']: r['num_canjes'] for r in canjes_mes}
-
-        # 4) Promociones activas por negocio
-        promociones_activas = (
-            Promocion.objects
-            .filter(activo=True)
-            .values('id_negocio__nombre')
-            .annotate(promociones_activas=Count('id'))
-            .order_by('id_negocio__nombre')
-        )
-        promociones_activas_data = {r['id_negocio__nombre']: r['promociones_activas'] for r in promociones_activas}
-
-        # 5) Total de colaboradores
-        total_colaboradores = Negocio.objects.count()
-
-        # 6) Estructura final
+        # Todas las métricas salen de una sola consulta con CTEs, en caché por
+        # ESTADISTICAS_CACHE_SEGUNDOS e invalidada con cada canje o promoción
+        metricas = metricas_header()
         combined_data = {
-            "promociones_por_negocio_ultimo_mes": promociones_mes_data,
-            "canjes_por_negocio_ultimo_mes": canjes_mes_data,
-            "promociones_activas_por_negocio": promociones_activas_data,
-            "total_colaboradores": total_colaboradores,
+            "promociones_por_negocio_ultimo_mes": metricas["promociones_por_negocio_ultimo_mes"],
+            "canjes_por_negocio_ultimo_mes": metricas["canjes_por_negocio_ultimo_mes"],
+            "promociones_activas_por_negocio": metricas["promociones_activas_por_negocio"],
+            "total_colaboradores": metricas["total_colaboradores"],
         }
 
         return Response(combined_data, status=status.HTTP_200_OK)
 
 
+def _resumen_negocios_en_vivo(ids) -> dict:
+    """
+    Calcula el resumen directamente de las tablas para los negocios dados.
+    Se usa solo para negocios creados después del último refresco de la
+    vista materializada (normalmente ninguno o muy pocos).
+    """
+    # Subquery para datos del administrador principal por negocio
+    admin_sq = AdministradorNegocio.objects.filter(
+        id_negocio=OuterRef('pk')
+    ).order_by('id')
+
+    qs = (
+        Negocio.objects
+        .filter(id__in=ids)
+        .annotate(
+            admin_id=Subquery(admin_sq.values('id')[:1]),
+            admin_nombre=Subquery(admin_sq.values('nombre')[:1]),
+            admin_usuario=Subquery(admin_sq.values('usuario')[:1]),
+            admin_correo=Subquery(admin_sq.values('correo')[:1]),
+        )
+        .annotate(
+            num_promociones=Count('promocion__id', distinct=True),
+            total_canje=Count('promocion__canje__id', distinct=True),
+        )
+        .annotate(
+            avg_canje_por_promocion=Case(
+                When(
+                    num_promociones__gt=0,
+                    then=F('total_canje') * 1.0 / F('num_promociones')
+                ),
+                default=Value(0.0),
+                output_field=FloatField()
+            )
+        )
+        .values(
+            'id', 'admin_id', 'admin_nombre', 'admin_usuario', 'admin_correo',
+            'num_promociones', 'avg_canje_por_promocion'
+        )
+    )
+    return {row["id"]: row for row in qs}
+
+
 class NegociosResumenView(APIView):
     """
     Devuelve un resumen de negocios activos con datos del administrador y métricas.
@@ -335,62 +323,49 @@ class NegociosResumenView(APIView):
 
     Respuesta (lista de objetos):
         - id, nombre, estatus, logo (URL absoluta cuando es posible)
+        - logo_srcset: variantes WebP del logo ('<url> 128w, ...') | null
         - administrador_negocio: {id, nombre, usuario, correo} | null
         - num_promociones
         - avg_canje_por_promocion (float)
+
+    Nota:
+        Administrador y métricas vienen de la vista materializada
+        'resumen_negocio' (ver `python manage.py refrescar_resumen_negocios`);
+        nombre, estatus y logo se leen siempre de la tabla 'negocio'.
     """
     permission_classes = [permissions.AllowAny]
 
     def get(self, request, *args, **kwargs):
-        # Subquery para datos del administrador principal por negocio
-        admin_sq = AdministradorNegocio.objects.filter(
-            id_negocio=OuterRef('pk')
-        ).order_by('id')
-
+        # Lectura plana: negocio + resumen precalculado (JOIN por clave primaria)
         qs = (
             Negocio.objects
-            .annotate(
-                admin_id=Subquery(admin_sq.values('id')[:1]),
-                admin_nombre=Subquery(admin_sq.values('nombre')[:1]),
-                admin_usuario=Subquery(admin_sq.values('usuario')[:1]),
-                admin_correo=Subquery(admin_sq.values('correo')[:1]),
-            )
-            .annotate(
-                num_promociones=Count('promocion__id', distinct=True),
-                total_canje=Count('promocion__canje__id', distinct=True),
-            )
-            .annotate(
-                avg_canje_por_promocion=Case(
-                    When(
-                        num_promociones__gt=0,
-                        then=F('total_canje') * 1.0 / F('num_promociones')
-                    ),
-                    default=Value(0.0),
-                    output_field=FloatField()
-                )
-            )
             .filter(estatus='activo')
             .order_by('nombre')
             .values(
-                'id', 'nombre', 'estatus', 'logo',
-                'admin_id', 'admin_nombre', 'admin_usuario', 'admin_correo',
-                'num_promociones', 'avg_canje_por_promocion'
+                'id', 'nombre', 'estatus', 'logo', 'logo_variantes',
+                admin_id=F('resumen__admin_id'),
+                admin_nombre=F('resumen__admin_nombre'),
+                admin_usuario=F('resumen__admin_usuario'),
+                admin_correo=F('resumen__admin_correo'),
+                num_promociones=F('resumen__num_promociones'),
+                avg_canje_por_promocion=F('resumen__avg_canje_por_promocion'),
+                resumen_actualizado=F('resumen__actualizado'),
             )
         )
-
+        filas = list(qs)
+
+        # Negocios aún no incluidos en la vista materializada
+        pendientes = [row["id"] for row in filas if row["resumen_actualizado"] is None]
+        if pendientes:
+            en_vivo = _resumen_negocios_en_vivo(pendientes)
+            for row in filas:
+                if row["id"] in en_vivo:
+                    row.update(en_vivo[row["id"]])
+
+        # Prefijo de URL (storage + host de la petición) calculado una sola vez
+        resolutor = ResolutorUrls(request, Negocio._meta.get_field('logo').storage)
         data = []
-        for row in qs:
-            # Construcción robusta de URL de logo (S3/custom storage o MEDIA_URL)
-            logo_url = None
-            if row["logo"]:
-                field = Negocio._meta.get_field('logo')
-                if hasattr(field.storage, 'url'):
-                    logo_url = field.storage.url(row["logo"])
-                else:
-                    logo_url = f"{settings.MEDIA_URL}{row['logo']}"
-                if request:
-                    logo_url = request.build_absolute_uri(logo_url)
-
+        for row in filas:
             data.append({
                 "id": row["id"],
                 "nombre": row["nombre"],
@@ -401,28 +376,15 @@ class NegociosResumenView(APIView):
                     "usuario": row["admin_usuario"],
                     "correo": row["admin_correo"],
                 },
-                "num_promociones": row["num_promociones"],
+                "num_promociones": row["num_promociones"] or 0,
                 "avg_canje_por_promocion": float(row["avg_canje_por_promocion"] or 0.0),
-                "logo": logo_url,
+                "logo": resolutor.url(row["logo"]),
+                "logo_srcset": construir_srcset(row["logo_variantes"], resolutor),
             })
 
         return Response(data)
 
 
-# -----------------------------------------------------------------------------
-# Importaciones duplicadas (mantener si este bloque se mueve de archivo).
-# Se dejan comentarios para claridad; no se altera la lógica original.
-# -----------------------------------------------------------------------------
-from datetime import datetime, time, timedelta  # noqa: E402,F811 (duplicated intentionally)
-from zoneinfo import ZoneInfo  # noqa: E402,F811
-from django.db.models import Count, Q  # noqa: E402,F811
-from django.db.models.functions import TruncDate  # noqa: E402,F811
-from django.utils import timezone  # noqa: E402,F811
-from rest_framework import permissions, status  # noqa: E402,F811
-from rest_framework.response import Response  # noqa: E402,F811
-from rest_framework.views import APIView  # noqa: E402,F811
-
-
 class detalleNegocioView(APIView):
     """
     Devuelve detalle de un negocio y su actividad reciente (últimos 7 días CDMX).
@@ -470,7 +432,7 @@ class detalleNegocioView(APIView):
 
         # 2) Métricas principales
         num_promociones = Promocion.objects.filter(id_negocio=negocio, activo=True).count()
-        num_canjes = Canje.objects.filter(id_promocion__id_negocio=negocio).count()
+        num_canjes = CanjeDiario.objects.filter(id_negocio=negocio).aggregate(total=Sum("canjes"))["total"] or 0
 
         # 3) Ventana de 7 días en zona horaria CDMX
         MX_TZ = ZoneInfo("America/Mexico_City")
@@ -478,12 +440,6 @@ class detalleNegocioView(APIView):
         today_local = now_local.date()
         start_date_local = today_local - timedelta(days=6)  # 7 días incluyendo hoy
 
-        # Límites de día local convertidos a UTC para filtrar por timestamp
-        start_local_dt = datetime.combine(start_date_local, time.min, tzinfo=MX_TZ)  # 00:00 local
-        end_local_dt = datetime.combine(today_local + timedelta(days=1), time.min, tzinfo=MX_TZ)  # 00:00 día sig.
-        start_utc = start_local_dt.astimezone(ZoneInfo("UTC"))
-        end_utc = end_local_dt.astimezone(ZoneInfo("UTC"))
-
         # 4) Nombres de promociones (claves de la matriz por día)
         promociones = list(
             Promocion.objects
@@ -491,17 +447,16 @@ class detalleNegocioView(APIView):
             .values_list("nombre", flat=True)
         )
 
-        # 5) Canjes dentro de ventana, agrupando por día local CDMX
+        # 5) Canjes dentro de ventana por día local (agregado diario CanjeDiario)
         canjes = (
-            Canje.objects
+            CanjeDiario.objects
             .filter(
-                id_promocion__id_negocio_id=id_negocio,
-                fecha_creado__gte=start_utc,
-                fecha_creado__lt=end_utc,
+                id_negocio_id=id_negocio,
+                fecha__gte=start_date_local,
+                fecha__lte=today_local,
             )
-            .annotate(day=TruncDate("fecha_creado", tzinfo=MX_TZ))
-            .values("day", "id_promocion__nombre")
-            .annotate(total=Count("id"))
+            .values("fecha", "id_promocion__nombre")
+            .annotate(total=Sum("canjes"))
         )
 
         # 6) Inicializa matriz de 7 días con ceros
@@ -512,7 +467,7 @@ class detalleNegocioView(APIView):
 
         # 7) Rellena con valores reales
         for entry in canjes:
-            day_str = entry["day"].strftime("%Y-%m-%d")  # ya está en MX_TZ
+            day_str = entry["fecha"].strftime("%Y-%m-%d")  # día local
             promo_name = entry["id_promocion__nombre"]
             if day_str not in result:
                 result[day_str] = {}
@@ -530,6 +485,109 @@ class detalleNegocioView(APIView):
         return Response(data)
 
 
+class SerieCanjesView(APIView):
+    """
+    Serie de tiempo de canjes con rango, granularidad y agrupación arbitrarios.
+
+    GET /functionality/estadisticas/canjes/serie/
+        ?desde=2025-01-01&hasta=2025-04-01      (hora local de 'zona'; 'hasta' excluido)
+        &granularidad=hora|dia|semana|mes        (por defecto dia)
+        &agrupar=negocio|promocion|categoria|cajero   (opcional; sin él, total)
+        &zona=America/Mexico_City                (por defecto TIME_ZONE)
+        &id_negocio=<id>&id_promocion=<id>       (filtros opcionales)
+        &max_series=10                           (series con más canjes)
+
+    Respuesta:
+        - buckets: inicios de periodo ("YYYY-MM-DDTHH:MM:SS", hora local)
+        - series: [{id, nombre, total, valores: [<int> por bucket]}]; los
+          periodos sin canjes valen 0
+        - series_totales: series existentes antes de aplicar max_series
+        - fuente: "canje_diario" (agregado) o "canje"
+
+    Respuestas de error:
+        400: Parámetros inválidos o rango con demasiados periodos
+             (ESTADISTICAS_SERIE_MAX_PUNTOS).
+    """
+    permission_classes = [permissions.AllowAny]  # Ajustar según políticas
+
+    def get(self, request, *args, **kwargs):
+        params = SerieCanjesParamsSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        datos = params.validated_data
+
+        try:
+            serie = serie_canjes(
+                datos["desde"], datos["hasta"],
+                granularidad=datos["granularidad"],
+                agrupar=datos["agrupar"],
+                zona=datos["zona"],
+                id_negocio=datos.get("id_negocio"),
+                id_promocion=datos.get("id_promocion"),
+                max_series=datos["max_series"],
+            )
+        except PresupuestoExcedido as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({
+            "desde": datos["desde"].isoformat(),
+            "hasta": datos["hasta"].isoformat(),
+            "granularidad": datos["granularidad"],
+            "agrupar": datos["agrupar"],
+            "zona": datos["zona"],
+            "fuente": serie.fuente,
+            "buckets": [b.isoformat() for b in serie.buckets],
+            "series": serie.series,
+            "series_totales": serie.series_totales,
+        })
+
+
+class ExportarDatosView(APIView):
+    """
+    Exportación de datos crudos en CSV o JSONL, enviada por streaming.
+
+    GET /functionality/exportaciones/<tipo>/
+        tipo: canjes | promociones | negocios
+        ?formato=csv|jsonl                     (por defecto csv)
+        &desde=2025-01-01&hasta=2025-03-31     (días locales, ambos incluidos;
+                                                fecha_creado de canjes y
+                                                negocios, fecha_inicio de
+                                                promociones)
+        &id_negocio=<id>                       (filtro opcional)
+
+    Los canjes incluyen promoción, negocio, cajero y datos demográficos del
+    usuario (sin nombre, contacto ni CURP). Las filas se leen con un cursor
+    del lado del servidor y se envían por bloques, por lo que la memoria no
+    crece con el tamaño de la exportación.
+
+    Solo para administradores del sistema (Administrador con el correo del
+    usuario autenticado).
+
+    Respuestas de error:
+        400: Tipo o parámetros inválidos.
+        403: El usuario no es administrador del sistema.
+    """
+    permission_classes = [permissions.IsAuthenticated, EsAdministrador]
+
+    def get(self, request, tipo, *args, **kwargs):
+        params = ExportacionParamsSerializer(data={**request.query_params.dict(), "tipo": tipo})
+        params.is_valid(raise_exception=True)
+        datos = params.validated_data
+
+        content_type, extension = FORMATOS[datos["formato"]]
+        respuesta = StreamingHttpResponse(
+            generar_exportacion(
+                tipo, datos["formato"],
+                desde=datos.get("desde"),
+                hasta=datos.get("hasta"),
+                id_negocio=datos.get("id_negocio"),
+            ),
+            content_type=content_type,
+        )
+        nombre = f"{tipo}_{timezone.localdate().isoformat()}.{extension}"
+        respuesta["Content-Disposition"] = f'attachment; filename="{nombre}"'
+        return respuesta
+
+
 class ListAllCajerosView(APIView):
     """
     Lista todos los cajeros asociados al negocio del administrador autenticado.
@@ -554,3 +612,120 @@ class ListAllCajerosView(APIView):
         cajeros = Cajero.objects.filter(id_negocio_id=id_negocio)
         serializer = CajeroSerializer(cajeros, many=True)
         return Response(serializer.data)
+
+
+class PromocionesRevisionView(APIView):
+    """
+    Cola de revisión de promociones marcadas por la IA (riesgo MEDIO o ALTO),
+    ordenada por riesgo (mayor primero) y antigüedad (más antigua primero).
+
+    GET /functionality/promociones/revision/?limite=<n>&cursor=<nivel>:<id>&riesgo=<ALTO|MEDIO>
+
+    Parámetros de consulta (query params):
+        - limite (int, opcional): Tamaño de página (por defecto 20, máximo 100).
+        - cursor (str, opcional): Valor 'siguiente' de la página anterior.
+        - riesgo (str, opcional): Filtra por un nivel de riesgo.
+
+    La paginación es por cursor (nivel_riesgo, id) y usa el índice parcial
+    'promocion_cola_revision_idx', por lo que el costo de cada página no crece
+    con la profundidad de la cola.
+
+    Respuesta:
+        {"total": <int>, "resultados": [...], "siguiente": "<nivel>:<id>" | null}
+
+    Solo para administradores del sistema (403 para cualquier otro usuario).
+    """
+    permission_classes = [permissions.IsAuthenticated, EsAdministrador]
+
+    def get(self, request, *args, **kwargs):
+        try:
+            limite = min(max(int(request.query_params.get("limite", 20)), 1), 100)
+        except (TypeError, ValueError):
+            return Response({"error": "'limite' debe ser un entero."}, status=status.HTTP_400_BAD_REQUEST)
+
+        qs = Promocion.objects.filter(revision_pendiente=True)
+
+        riesgo = request.query_params.get("riesgo")
+        if riesgo:
+            qs = qs.filter(riesgo=riesgo.upper())
+        total = qs.count()
+
+        cursor = request.query_params.get("cursor")
+        if cursor:
+            try:
+                nivel, ultimo_id = (int(v) for v in cursor.split(":"))
+            except ValueError:
+                return Response({"error": "Cursor inválido."}, status=status.HTTP_400_BAD_REQUEST)
+            qs = qs.filter(Q(nivel_riesgo__lt=nivel) | Q(nivel_riesgo=nivel, id__gt=ultimo_id))
+
+        promociones = list(
+            qs.select_related("id_negocio")
+            .order_by("-nivel_riesgo", "id")[:limite + 1]
+        )
+        siguiente = None
+        if len(promociones) > limite:
+            promociones = promociones[:limite]
+            siguiente = f"{promociones[-1].nivel_riesgo}:{promociones[-1].id}"
+
+        return Response({
+            "total": total,
+            "resultados": PromocionRevisionSerializer(promociones, many=True).data,
+            "siguiente": siguiente,
+        })
+
+
+class ResolverRevisionPromocionView(APIView):
+    """
+    Marca una promoción como revisada y la retira de la cola.
+
+    POST /functionality/promociones/revision/resolver/
+
+    Body JSON:
+    {
+        "id_promocion": <int>,
+        "desactivar": <bool>       # opcional: además desactiva la promoción (activo = False)
+    }
+
+    Solo para administradores del sistema (403 para cualquier otro usuario).
+    """
+    permission_classes = [permissions.IsAuthenticated, EsAdministrador]
+
+    def post(self, request, *args, **kwargs):
+        params = ResolverRevisionParamsSerializer(data=request.data)
+        params.is_valid(raise_exception=True)
+        id_promocion = params.validated_data["id_promocion"]
+
+        campos = {"revision_pendiente": False}
+        if params.validated_data["desactivar"]:
+            campos["activo"] = False
+
+        actualizadas = Promocion.objects.filter(id=id_promocion).update(**campos)
+        if not actualizadas:
+            return Response({"error": "Promoción no encontrada."}, status=status.HTTP_404_NOT_FOUND)
+        if "activo" in campos:
+            # update() no emite post_save: las promociones activas del encabezado se invalidan aquí
+            invalidar_metricas_header()
+        return Response({"message": "Promoción revisada."}, status=status.HTTP_200_OK)
+
+
+class MetricasIAView(APIView):
+    """
+    Métricas de la clasificación con IA del proceso que atiende la petición.
+
+    GET /functionality/ai/metricas/
+
+    Respuesta:
+        {
+            "openai": {"circuito": {...}, "resultados": {...}, "latencia_segundos": {...}},
+            "cache": {"proceso": {...}, "persistente": {...}}
+        }
+
+    Los histogramas son acumulativos (cada bucket incluye los menores), al
+    estilo de Prometheus.
+
+    Solo para administradores del sistema (403 para cualquier otro usuario).
+    """
+    permission_classes = [permissions.IsAuthenticated, EsAdministrador]
+
+    def get(self, request, *args, **kwargs):
+        return Response({"openai": metricas_openai(), "cache": estadisticas_cache()})
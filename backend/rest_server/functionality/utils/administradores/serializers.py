@@ -6,8 +6,14 @@
 #   para su uso en las vistas y API REST.
 # =============================================================================
 
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from django.conf import settings
 from rest_framework import serializers
-from ...models import SolicitudNegocio, Negocio, Cajero, AdministradorNegocio
+from ...models import SolicitudNegocio, Negocio, Cajero, AdministradorNegocio, Promocion
+from ..estadisticas.exportacion import EXPORTACIONES, FORMATOS
+from ..estadisticas.series import AGRUPACIONES, GRANULARIDADES
 
 
 # =============================================================================
@@ -89,3 +95,95 @@ class AdministradorNegocioFullSerializer(serializers.ModelSerializer):
     class Meta:
         model = AdministradorNegocio
         fields = "__all__"
+
+
+# =============================================================================
+# Clase: PromocionRevisionSerializer
+# Descripción:
+#   Serializador de la cola de revisión: datos de la promoción y evaluación
+#   de riesgo hecha por la IA.
+# =============================================================================
+class PromocionRevisionSerializer(serializers.ModelSerializer):
+    """Serializa una promoción pendiente de revisión por un moderador."""
+    negocio_nombre = serializers.CharField(source="id_negocio.nombre", read_only=True)
+
+    class Meta:
+        model = Promocion
+        fields = (
+            "id", "nombre", "descripcion", "imagen", "activo", "id_negocio", "negocio_nombre",
+            "riesgo", "nivel_riesgo", "motivo_revision", "fecha_creado",
+        )
+
+
+# =============================================================================
+# Clase: SerieCanjesParamsSerializer
+# Descripción:
+#   Valida los parámetros de la serie de tiempo de canjes. 'desde' y 'hasta'
+#   aceptan fecha (AAAA-MM-DD) o fecha y hora ISO, en hora local de 'zona'.
+# =============================================================================
+class SerieCanjesParamsSerializer(serializers.Serializer):
+    """Parámetros de /estadisticas/canjes/serie/."""
+    desde = serializers.CharField(required=False, help_text="Inicio (incluido); por defecto hace 30 días.")
+    hasta = serializers.CharField(required=False, help_text="Fin (excluido); por defecto mañana a las 00:00.")
+    granularidad = serializers.ChoiceField(choices=list(GRANULARIDADES), default="dia")
+    agrupar = serializers.ChoiceField(choices=list(AGRUPACIONES), allow_null=True, default=None)
+    zona = serializers.CharField(default=settings.TIME_ZONE)
+    id_negocio = serializers.IntegerField(min_value=1, required=False)
+    id_promocion = serializers.IntegerField(min_value=1, required=False)
+    max_series = serializers.IntegerField(min_value=1, max_value=100, default=10)
+
+    def validate_zona(self, value):
+        try:
+            ZoneInfo(value)
+        except (ZoneInfoNotFoundError, ValueError):
+            raise serializers.ValidationError(f"Zona horaria desconocida: {value!r}.")
+        return value
+
+    def _fecha(self, campo, valor):
+        try:
+            fecha = datetime.fromisoformat(valor)
+        except ValueError:
+            raise serializers.ValidationError({campo: "Use AAAA-MM-DD o AAAA-MM-DDTHH:MM[:SS]."})
+        if fecha.tzinfo is not None:
+            raise serializers.ValidationError({campo: "Sin zona horaria; use el parámetro 'zona'."})
+        return fecha
+
+    def validate(self, attrs):
+        manana = datetime.combine(datetime.now(ZoneInfo(attrs["zona"])).date() + timedelta(days=1), datetime.min.time())
+        attrs["hasta"] = self._fecha("hasta", attrs["hasta"]) if attrs.get("hasta") else manana
+        attrs["desde"] = self._fecha("desde", attrs["desde"]) if attrs.get("desde") else attrs["hasta"] - timedelta(days=30)
+        if attrs["desde"] >= attrs["hasta"]:
+            raise serializers.ValidationError({"desde": "Debe ser anterior a 'hasta'."})
+        return attrs
+
+
+# =============================================================================
+# Clase: ResolverRevisionParamsSerializer
+# Descripción:
+#   Valida el cuerpo de /promociones/revision/resolver/. 'desactivar' se
+#   interpreta como booleano ("false", "0" y "no" son falsos).
+# =============================================================================
+class ResolverRevisionParamsSerializer(serializers.Serializer):
+    """Parámetros de /promociones/revision/resolver/."""
+    id_promocion = serializers.IntegerField(min_value=1)
+    desactivar = serializers.BooleanField(default=False)
+
+
+# =============================================================================
+# Clase: ExportacionParamsSerializer
+# Descripción:
+#   Valida los parámetros de las exportaciones de datos crudos. 'desde' y
+#   'hasta' son días locales (TIME_ZONE), ambos incluidos.
+# =============================================================================
+class ExportacionParamsSerializer(serializers.Serializer):
+    """Parámetros de /exportaciones/<tipo>/."""
+    tipo = serializers.ChoiceField(choices=list(EXPORTACIONES))
+    formato = serializers.ChoiceField(choices=list(FORMATOS), default="csv")
+    desde = serializers.DateField(required=False)
+    hasta = serializers.DateField(required=False)
+    id_negocio = serializers.IntegerField(min_value=1, required=False)
+
+    def validate(self, attrs):
+        if attrs.get("desde") and attrs.get("hasta") and attrs["desde"] > attrs["hasta"]:
+            raise serializers.ValidationError({"desde": "No puede ser posterior a 'hasta'."})
+        return attrs
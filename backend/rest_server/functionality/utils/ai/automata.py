@@ -5,17 +5,54 @@
 #   de promociones, inferencia de categorías, nivel de riesgo y motivo de revisión.
 #
 #   Utiliza la API de OpenAI (GPT-5) con salidas estructuradas (Pydantic),
-#   devolviendo resultados validados con un esquema estricto.
+#   devolviendo resultados validados con un esquema estricto. Según la
+#   política AI_CLASIFICADOR_POLITICA, se combina con el clasificador local
+#   definido en clasificadores.py. Cada llamada tiene un tiempo límite y pasa
+#   por el circuit breaker de resiliencia.py.
 # =============================================================================
 
+import threading
 from typing import Optional
-from openai import OpenAI
-import json
-from functionality.models import Categoria
+from django.conf import settings
+from functionality.utils.ai.cache import (
+    clave_clasificacion, obtener_clasificacion, guardar_clasificacion,
+)
+from functionality.utils.ai.categorias import CategoriasIA, obtener_categorias
+from functionality.utils.ai.clasificadores import (
+    Clasificador, ClasificacionNoDisponible, obtener_clasificador_local,
+)
+from functionality.utils.ai.resiliencia import llamada_protegida
 from pydantic import BaseModel
 
-# Inicializa el cliente OpenAI (usa la variable de entorno OPENAI_API_KEY)
-client = OpenAI()
+# Cliente OpenAI compartido por el proceso; se crea en el primer uso para que
+# comandos, pruebas y workers que no clasifican no paguen la importación de
+# openai/httpx ni la construcción del cliente.
+_client = None
+_client_lock = threading.Lock()
+
+
+# =============================================================================
+# Función: obtener_cliente
+# Descripción:
+#   Devuelve el cliente OpenAI del proceso, creándolo la primera vez.
+# =============================================================================
+def obtener_cliente():
+    """Crea (una sola vez, de forma segura entre hilos) y reutiliza el cliente OpenAI."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                from openai import OpenAI
+                # OPENAI_BASE_URL permite apuntar a un servidor compatible (p. ej.
+                # el stub local: python manage.py servidor_openai_stub)
+                base_url = getattr(settings, "OPENAI_BASE_URL", "") or None
+                _client = OpenAI(
+                    api_key=settings.OPENAI_API_KEY or ("stub" if base_url else None),
+                    base_url=base_url,
+                    timeout=getattr(settings, "AI_TIMEOUT_SEGUNDOS", 30),
+                    max_retries=getattr(settings, "AI_MAX_REINTENTOS", 0),
+                )
+    return _client
 
 
 # =============================================================================
@@ -31,81 +68,166 @@ class NegocioAIResult(BaseModel):
 
 
 # =============================================================================
-# Función: infer_promocion_fields
+# Clase: ClasificadorOpenAI
+# Descripción:
+#   Backend remoto: clasifica la promoción con la API de OpenAI.
+# =============================================================================
+class ClasificadorOpenAI(Clasificador):
+    """Clasificador remoto basado en GPT con salida estructurada."""
+    nombre = "remoto"
+
+    def __init__(self, timeout: Optional[float] = None):
+        # Tiempo límite de la llamada; None usa AI_TIMEOUT_SEGUNDOS
+        self.timeout = timeout or getattr(settings, "AI_TIMEOUT_SEGUNDOS", 30)
+
+    def clasificar(self, nombre, descripcion, categorias: CategoriasIA) -> dict:
+        """Envía el prompt a OpenAI y devuelve el resultado validado."""
+        if not (getattr(settings, "OPENAI_API_KEY", None) or getattr(settings, "OPENAI_BASE_URL", None)):
+            raise ClasificacionNoDisponible("OPENAI_API_KEY no está configurada.")
+
+        # ---------------------------------------------------------------------
+        # Construir el prompt para el modelo GPT. La parte fija (instrucciones y
+        # categorías, ya serializadas en caché) va primero para aprovechar el
+        # caché de prefijos de OpenAI; los datos de la promoción van al final.
+        # ---------------------------------------------------------------------
+        prompt = (
+            "You are a strict classifier. "
+            "Given discount information, return JSON with: "
+            "`categoria` (list of integers representing the IDs of all matching categories), "
+            "`riesgo` (BAJO | MEDIO | ALTO) for potential fraud or compliance review, "
+            "`motivo_revision` (short reason). "
+            "Use only the provided information; do not guess URLs or unrelated data.\n\n"
+            f"{categorias.bloque_prompt}"
+            f"Nombre: {nombre}\n"
+            f"Descripción: {descripcion or ''}\n"
+        )
+
+        # ---------------------------------------------------------------------
+        # Llamada a la API de OpenAI (con tiempo límite y circuit breaker)
+        # ---------------------------------------------------------------------
+        print("Enviando prompt a OpenAI para clasificación de promoción...")
+        resp = llamada_protegida(
+            obtener_cliente().with_options(timeout=self.timeout).responses.parse,
+            model="gpt-5",  # Modelo actual (ajustable según tu suscripción)
+            input=prompt,
+            text_format=NegocioAIResult,  # Estructura de salida Pydantic
+        )
+
+        print("Respuesta recibida exitosamente.")
+        if resp.output_parsed is None:
+            raise ValueError("La respuesta de OpenAI no contiene un resultado estructurado.")
+        return resp.output_parsed.model_dump()
+
+
+# -----------------------------------------------------------------------------
+# Políticas de clasificación: orden en que se consultan los backends
+# -----------------------------------------------------------------------------
+POLITICAS = {
+    "remoto-primero": ("remoto", "local"),
+    "local-primero": ("local", "remoto"),
+    "solo-remoto": ("remoto",),
+    "solo-local": ("local",),
+}
+
+
+def _obtener_backend(nombre: str, version: str, timeout: Optional[float] = None) -> Clasificador:
+    """Instancia (o reutiliza) el backend indicado."""
+    if nombre == "local":
+        return obtener_clasificador_local(version)
+    return ClasificadorOpenAI(timeout)
+
+
+# =============================================================================
+# Función: clasificar_promocion
 # Descripción:
-#   Utiliza la API de OpenAI para inferir la categoría y el nivel de riesgo de
-#   una promoción en función de su nombre y descripción.
+#   Infiere la categoría y el nivel de riesgo de una promoción en función de su
+#   nombre y descripción, consultando la caché y después los backends según la
+#   política configurada. Propaga los errores para que quien la invoque (por
+#   ejemplo, el worker de categorización) pueda reintentar.
 # =============================================================================
-def infer_promocion_fields(nombre: str, descripcion: Optional[str]) -> list[int]:
+def clasificar_promocion(
+    nombre: str, descripcion: Optional[str], timeout: Optional[float] = None
+) -> NegocioAIResult:
     """
-    Realiza una inferencia inteligente para determinar las categorías más
-    adecuadas para una promoción, así como su nivel de riesgo y motivo de revisión.
+    Clasifica una promoción.
 
     Parámetros:
         nombre (str): Nombre de la promoción o descuento.
         descripcion (Optional[str]): Descripción detallada de la promoción.
+        timeout (Optional[float]): Tiempo límite en segundos de la llamada
+            remota (por defecto AI_TIMEOUT_SEGUNDOS).
 
     Retorna:
-        list[int]: Lista de IDs de categorías inferidas.
-                   Si ocurre un error o no hay coincidencia, se devuelve la
-                   categoría "Sin categoría" como fallback.
-
-    Notas:
-        - La función usa un esquema estricto de salida validado con Pydantic.
-        - Si el modelo no responde o hay error de conexión, se devuelve una
-          categoría predeterminada para garantizar continuidad en el flujo.
+        NegocioAIResult: Categorías, riesgo y motivo de revisión inferidos.
+
+    Lanza:
+        ClasificacionNoDisponible: Ningún backend pudo clasificar (sin API key,
+            sin confianza del modelo local, etc.).
+        CircuitoAbierto: La API remota está en corto y no hubo resultado local.
+        Exception: Error de red, timeout, de la API o de parseo del backend remoto.
     """
 
     # -------------------------------------------------------------------------
-    # 1️⃣ Preparar las categorías válidas disponibles en la base de datos
+    # 1️⃣ Categorías válidas (en caché por versión de la tabla 'categoria')
     # -------------------------------------------------------------------------
-    categorias_objects = Categoria.objects.all()
-    categorias_pairs = [(cat.id, cat.titulo) for cat in categorias_objects]
+    categorias = obtener_categorias()
+    version = categorias.version
 
     # -------------------------------------------------------------------------
-    # 2️⃣ Construir el prompt para el modelo GPT
+    # 2️⃣ Consultar la caché de clasificaciones (texto normalizado + versión)
     # -------------------------------------------------------------------------
-    prompt = (
-        "You are a strict classifier. "
-        "Given discount information, return JSON with: "
-        "`categoria` (list of integers representing the IDs of all matching categories), "
-        "`riesgo` (BAJO | MEDIO | ALTO) for potential fraud or compliance review, "
-        "`motivo_revision` (short reason). "
-        "Use only the provided information; do not guess URLs or unrelated data.\n\n"
-        f"Nombre: {nombre}\n"
-        f"Descripción: {descripcion or ''}\n"
-        f"Categorías válidas: {json.dumps(categorias_pairs, ensure_ascii=False)}\n"
-    )
+    clave = clave_clasificacion(nombre, descripcion, version)
+    previo = obtener_clasificacion(clave)
+    if previo is not None:
+        print("Clasificación obtenida de la caché.")
+        return NegocioAIResult(**previo)
 
     # -------------------------------------------------------------------------
-    # 3️⃣ Llamada a la API de OpenAI
+    # 3️⃣ Consultar los backends en el orden de la política configurada
     # -------------------------------------------------------------------------
-    try:
-        print("Enviando prompt a OpenAI para clasificación de promoción...")
-        resp = client.responses.parse(
-            model="gpt-5",  # Modelo actual (ajustable según tu suscripción)
-            input=prompt,
-            text_format=NegocioAIResult,  # Estructura de salida Pydantic
-        )
+    politica = getattr(settings, "AI_CLASIFICADOR_POLITICA", "remoto-primero")
+    error = no_disponible = None
+
+    for nombre_backend in POLITICAS.get(politica, POLITICAS["remoto-primero"]):
+        try:
+            backend = _obtener_backend(nombre_backend, version, timeout)
+            datos = backend.clasificar(nombre, descripcion, categorias)
+        except ClasificacionNoDisponible as e:
+            print(f"[Clasificador {nombre_backend}] {e}")
+            no_disponible = no_disponible or e
+            continue
+        except Exception as e:
+            # Manejo seguro de errores (por ejemplo, desconexión, formato inválido, timeout)
+            print(f"[Clasificador {nombre_backend}] {e}")
+            error = error or e
+            continue
+
+        # Se descartan IDs que no correspondan a categorías existentes
+        resultado = NegocioAIResult(**datos)
+        resultado.categoria = [cat_id for cat_id in resultado.categoria if cat_id in categorias.validos]
+
+        # Solo se almacenan en caché los resultados del modelo remoto
+        if nombre_backend == "remoto" and resultado.categoria:
+            guardar_clasificacion(
+                clave, version, resultado.categoria, resultado.riesgo, resultado.motivo_revision
+            )
+        return resultado
+
+    # Los errores de red/API tienen prioridad: son los únicos que vale la pena reintentar
+    raise error or no_disponible or ClasificacionNoDisponible(f"Política sin backends: {politica}.")
 
-        print("Respuesta recibida exitosamente.")
-        ai_text = resp.output_parsed
-
-        # Se devuelve únicamente la lista de IDs de categoría inferidos
-        return ai_text.categoria
-
-    except Exception as e:
-        # Manejo seguro de errores (por ejemplo, desconexión, formato inválido, timeout)
-        print(f"[OpenAI ERROR] {e}")
-
-    # -------------------------------------------------------------------------
-    # 4️⃣ Fallback (cuando la IA no responde o el parseo falla)
-    # -------------------------------------------------------------------------
-    try:
-        fallback_categoria = Categoria.objects.get(titulo="Sin categoría").id
-        print("Usando fallback: categoría 'Sin categoría'.")
-        return [fallback_categoria]
-    except Categoria.DoesNotExist:
-        print("Advertencia: No existe la categoría 'Sin categoría'. Creando fallback temporal.")
-        return []
 
+# =============================================================================
+# Función: categoria_fallback
+# Descripción:
+#   Devuelve la categoría predeterminada cuando la IA no puede clasificar.
+# =============================================================================
+def categoria_fallback() -> list[int]:
+    """Devuelve [id] de la categoría "Sin categoría", o [] si no existe."""
+    for cat_id, titulo in obtener_categorias().pairs:
+        if titulo == "Sin categoría":
+            print("Usando fallback: categoría 'Sin categoría'.")
+            return [cat_id]
+
+    print("Advertencia: No existe la categoría 'Sin categoría'. Creando fallback temporal.")
+    return []
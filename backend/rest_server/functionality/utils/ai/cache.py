@@ -0,0 +1,194 @@
+# =============================================================================
+# Autores: Daniel Álvarez Sil y Yael Sinuhe Grajeda Martínez
+# Descripción:
+#   Caché persistente (en base de datos) de resultados de clasificación de
+#   promociones con IA. La clave es el hash SHA-256 del texto normalizado
+#   (nombre + descripción) junto con la versión del conjunto de categorías,
+#   de modo que un cambio en las categorías invalida automáticamente las
+#   entradas anteriores.
+#
+#   Incluye métricas de tasa de aciertos y una política de desalojo (LRU por
+#   'ultimo_uso' y antigüedad máxima), aplicada con el comando
+#   `python manage.py purgar_cache_clasificacion`.
+# =============================================================================
+
+import json
+import hashlib
+import threading
+import unicodedata
+from datetime import timedelta
+from typing import Optional
+
+from django.conf import settings
+from django.db import IntegrityError
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from functionality.models import ClasificacionCache
+
+
+# Contadores del proceso actual (aciertos / fallos de la caché)
+_lock = threading.Lock()
+_contadores = {"aciertos": 0, "fallos": 0}
+
+
+# =============================================================================
+# Función: normalizar_texto
+# Descripción:
+#   Normaliza el texto para que variaciones triviales (mayúsculas, espacios,
+#   formas Unicode) produzcan la misma clave.
+# =============================================================================
+def normalizar_texto(texto: Optional[str]) -> str:
+    """Devuelve el texto en NFKC, en minúsculas y con espacios colapsados."""
+    texto = unicodedata.normalize("NFKC", texto or "").casefold()
+    return " ".join(texto.split())
+
+
+# =============================================================================
+# Función: version_categorias
+# Descripción:
+#   Calcula la versión del conjunto de categorías a partir de su contenido.
+# =============================================================================
+def version_categorias(categorias_pairs: list[tuple[int, str]]) -> str:
+    """Devuelve un hash corto de los pares (id, título) ordenados."""
+    crudo = json.dumps(sorted(categorias_pairs), ensure_ascii=False)
+    return hashlib.sha256(crudo.encode("utf-8")).hexdigest()[:16]
+
+
+# =============================================================================
+# Función: clave_clasificacion
+# Descripción:
+#   Genera la clave de caché para una promoción y una versión de categorías.
+# =============================================================================
+def clave_clasificacion(nombre: str, descripcion: Optional[str], version: str) -> str:
+    """Devuelve el SHA-256 del texto normalizado más la versión de categorías."""
+    texto = f"{normalizar_texto(nombre)}\n{normalizar_texto(descripcion)}\n{version}"
+    return hashlib.sha256(texto.encode("utf-8")).hexdigest()
+
+
+# =============================================================================
+# Función: obtener_clasificacion
+# Descripción:
+#   Busca un resultado previo en la caché y registra el acierto o fallo.
+# =============================================================================
+def obtener_clasificacion(clave: str) -> Optional[dict]:
+    """
+    Retorna:
+        dict | None: {'categoria', 'riesgo', 'motivo_revision'} o None si no existe.
+    """
+    entrada = (
+        ClasificacionCache.objects
+        .filter(clave=clave)
+        .values("id", "categorias", "riesgo", "motivo_revision")
+        .first()
+    )
+
+    with _lock:
+        _contadores["aciertos" if entrada else "fallos"] += 1
+
+    if not entrada:
+        return None
+
+    ClasificacionCache.objects.filter(id=entrada["id"]).update(
+        aciertos=F("aciertos") + 1,
+        ultimo_uso=timezone.now(),
+    )
+    return {
+        "categoria": entrada["categorias"],
+        "riesgo": entrada["riesgo"] or "",
+        "motivo_revision": entrada["motivo_revision"] or "",
+    }
+
+
+# =============================================================================
+# Función: guardar_clasificacion
+# Descripción:
+#   Almacena el resultado de una clasificación exitosa.
+# =============================================================================
+def guardar_clasificacion(clave: str, version: str, categorias: list[int],
+                          riesgo: str, motivo_revision: str) -> None:
+    """Inserta la entrada; si otro proceso la creó primero, se conserva esa."""
+    try:
+        ClasificacionCache.objects.create(
+            clave=clave,
+            version_categorias=version,
+            categorias=list(categorias),
+            riesgo=riesgo,
+            motivo_revision=motivo_revision,
+            ultimo_uso=timezone.now(),
+        )
+    except IntegrityError:
+        pass
+
+
+# =============================================================================
+# Función: purgar_cache
+# Descripción:
+#   Desaloja entradas de versiones de categorías obsoletas, entradas sin uso
+#   reciente y, si se excede el máximo, las menos usadas recientemente.
+# =============================================================================
+def purgar_cache(version_vigente: Optional[str] = None,
+                 max_entradas: Optional[int] = None,
+                 max_dias: Optional[int] = None) -> int:
+    """
+    Aplica la política de desalojo.
+
+    Retorna:
+        int: Número de entradas eliminadas.
+    """
+    if max_entradas is None:
+        max_entradas = getattr(settings, "AI_CACHE_MAX_ENTRADAS", 10000)
+    if max_dias is None:
+        max_dias = getattr(settings, "AI_CACHE_MAX_DIAS", 90)
+
+    eliminadas = 0
+    if version_vigente:
+        eliminadas += ClasificacionCache.objects.exclude(version_categorias=version_vigente).delete()[0]
+
+    limite = timezone.now() - timedelta(days=max_dias)
+    eliminadas += ClasificacionCache.objects.filter(ultimo_uso__lt=limite).delete()[0]
+
+    excedentes = list(
+        ClasificacionCache.objects
+        .order_by("-ultimo_uso")
+        .values_list("id", flat=True)[max_entradas:]
+    )
+    if excedentes:
+        eliminadas += ClasificacionCache.objects.filter(id__in=excedentes).delete()[0]
+
+    return eliminadas
+
+
+# =============================================================================
+# Función: estadisticas_cache
+# Descripción:
+#   Devuelve métricas de uso de la caché (proceso actual y acumuladas).
+# =============================================================================
+def estadisticas_cache() -> dict:
+    """
+    Retorna:
+        dict: aciertos/fallos/tasa del proceso actual y, de forma persistente,
+        entradas almacenadas, aciertos acumulados y tasa estimada (cada entrada
+        corresponde a un fallo que la originó).
+    """
+    with _lock:
+        aciertos, fallos = _contadores["aciertos"], _contadores["fallos"]
+
+    entradas = ClasificacionCache.objects.count()
+    aciertos_totales = ClasificacionCache.objects.aggregate(total=Sum("aciertos"))["total"] or 0
+
+    return {
+        "proceso": {
+            "aciertos": aciertos,
+            "fallos": fallos,
+            "tasa_aciertos": aciertos / (aciertos + fallos) if (aciertos + fallos) else 0.0,
+        },
+        "persistente": {
+            "entradas": entradas,
+            "aciertos": aciertos_totales,
+            "tasa_aciertos": (
+                aciertos_totales / (aciertos_totales + entradas)
+                if (aciertos_totales + entradas) else 0.0
+            ),
+        },
+    }
@@ -0,0 +1,104 @@
+# =============================================================================
+# Autores: Daniel Álvarez Sil y Yael Sinuhe Grajeda Martínez
+# Descripción:
+#   Caché en memoria del conjunto de categorías usado por los clasificadores:
+#   pares (id, título), hash de contenido y bloque de categorías del prompt.
+#
+#   La entrada se indexa por una versión de la tabla 'categoria' guardada en
+#   el caché de Django; las señales post_save/post_delete de Categoria la
+#   renuevan (ver FunctionalityConfig.ready). El caché de Django es
+#   compartido (DatabaseCache, ver CACHES en settings.py), así que la
+#   invalidación llega a todos los procesos; además, cada proceso recarga
+#   como máximo cada AI_CATEGORIAS_TTL_SEGUNDOS.
+# =============================================================================
+
+import json
+import time
+import uuid
+import threading
+from typing import NamedTuple, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+from functionality.models import Categoria
+from functionality.utils.ai.cache import version_categorias
+
+
+CLAVE_VERSION_TABLA = "ai:categorias:version"
+
+
+# =============================================================================
+# Clase: CategoriasIA
+# Descripción:
+#   Instantánea inmutable de las categorías preparada para los clasificadores.
+# =============================================================================
+class CategoriasIA(NamedTuple):
+    pairs: list[tuple[int, str]]
+    validos: frozenset
+    version: str          # Hash del contenido (clave de caché y del modelo local)
+    bloque_prompt: str    # Texto de categorías listo para el prompt
+    version_tabla: str
+    cargado_en: float
+
+
+_actual: Optional[CategoriasIA] = None
+_lock = threading.Lock()
+
+
+# =============================================================================
+# Función: _version_tabla
+# Descripción:
+#   Devuelve el token de versión vigente de la tabla de categorías.
+# =============================================================================
+def _version_tabla() -> str:
+    """Obtiene (o inicializa) el token de versión en el caché de Django."""
+    version = cache.get(CLAVE_VERSION_TABLA)
+    if version is None:
+        cache.add(CLAVE_VERSION_TABLA, uuid.uuid4().hex, timeout=None)
+        version = cache.get(CLAVE_VERSION_TABLA, "")
+    return version
+
+
+# =============================================================================
+# Función: invalidar_categorias
+# Descripción:
+#   Receptor de señales: renueva la versión cuando cambia una categoría.
+# =============================================================================
+def invalidar_categorias(**kwargs) -> None:
+    """Marca como obsoletas las categorías en caché de todos los procesos."""
+    cache.set(CLAVE_VERSION_TABLA, uuid.uuid4().hex, timeout=None)
+
+
+# =============================================================================
+# Función: obtener_categorias
+# Descripción:
+#   Devuelve la instantánea de categorías, consultando la base de datos solo si
+#   cambió la versión de la tabla o venció el TTL.
+# =============================================================================
+def obtener_categorias() -> CategoriasIA:
+    """Devuelve las categorías vigentes para clasificación."""
+    global _actual
+    ttl = getattr(settings, "AI_CATEGORIAS_TTL_SEGUNDOS", 300)
+    version_tabla = _version_tabla()
+
+    actual = _actual
+    if actual and actual.version_tabla == version_tabla and time.monotonic() - actual.cargado_en < ttl:
+        return actual
+
+    with _lock:
+        actual = _actual
+        if actual and actual.version_tabla == version_tabla and time.monotonic() - actual.cargado_en < ttl:
+            return actual
+
+        pairs = [tuple(par) for par in Categoria.objects.order_by("id").values_list("id", "titulo")]
+        actual = CategoriasIA(
+            pairs=pairs,
+            validos=frozenset(cat_id for cat_id, _ in pairs),
+            version=version_categorias(pairs),
+            bloque_prompt=f"Categorías válidas: {json.dumps(pairs, ensure_ascii=False)}\n",
+            version_tabla=version_tabla,
+            cargado_en=time.monotonic(),
+        )
+        _actual = actual
+    return actual
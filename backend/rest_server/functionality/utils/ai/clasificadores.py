@@ -0,0 +1,196 @@
+# =============================================================================
+# Autores: Daniel Álvarez Sil y Yael Sinuhe Grajeda Martínez
+# Descripción:
+#   Interfaz común para los clasificadores de promociones y backend local
+#   basado en TF-IDF (NumPy vectorizado), entrenado con las etiquetas ya
+#   existentes en PromocionCategoria.
+#
+#   El clasificador local no requiere red ni API key y responde en
+#   microsegundos; se combina con el clasificador remoto (OpenAI, definido en
+#   automata.py) según la política configurada en AI_CLASIFICADOR_POLITICA:
+#     - "remoto-primero": OpenAI y, si falla, el modelo local.
+#     - "local-primero": modelo local y, si no tiene confianza, OpenAI.
+#     - "solo-local" / "solo-remoto".
+# =============================================================================
+
+import re
+import time
+import threading
+import unicodedata
+from abc import ABC, abstractmethod
+from typing import Optional
+
+import numpy as np
+from django.conf import settings
+
+from functionality.models import Categoria, PromocionCategoria
+from functionality.utils.ai.cache import normalizar_texto
+
+
+# Palabras vacías frecuentes en promociones (no aportan a la clasificación)
+_STOPWORDS = frozenset("""
+    de la el los las en y a con por para del al un una unos unas su sus es o
+    se que lo le mas más sin sobre hasta desde todo toda todos todas tu tus
+    mi mis te nos este esta estos estas ese esa cada solo sólo
+""".split())
+
+_TOKEN_RE = re.compile(r"[a-z0-9]{2,}")
+
+
+# =============================================================================
+# Clase: ClasificacionNoDisponible
+# Descripción:
+#   Error que indica que un clasificador no puede responder (sin API key,
+#   sin datos de entrenamiento o sin confianza suficiente).
+# =============================================================================
+class ClasificacionNoDisponible(Exception):
+    """El clasificador no puede producir un resultado para esta promoción."""
+
+
+# =============================================================================
+# Clase: Clasificador
+# Descripción:
+#   Interfaz de los backends de clasificación.
+# =============================================================================
+class Clasificador(ABC):
+    """Backend de clasificación de promociones."""
+    nombre = "base"
+
+    @abstractmethod
+    def clasificar(self, nombre: str, descripcion: Optional[str], categorias) -> dict:
+        """
+        Clasifica una promoción.
+
+        Parámetros:
+            categorias (CategoriasIA): Categorías vigentes (ver categorias.py).
+
+        Retorna:
+            dict: {'categoria': list[int], 'riesgo': str, 'motivo_revision': str}
+
+        Lanza:
+            ClasificacionNoDisponible u otra excepción si no hay resultado.
+        """
+
+
+# =============================================================================
+# Función: tokenizar
+# Descripción:
+#   Normaliza el texto, elimina acentos y devuelve tokens alfanuméricos.
+# =============================================================================
+def tokenizar(texto: Optional[str]) -> list[str]:
+    """Devuelve la lista de tokens útiles del texto."""
+    texto = unicodedata.normalize("NFKD", normalizar_texto(texto))
+    texto = "".join(c for c in texto if not unicodedata.combining(c))
+    return [t for t in _TOKEN_RE.findall(texto) if t not in _STOPWORDS]
+
+
+# =============================================================================
+# Clase: ClasificadorLocal
+# Descripción:
+#   Clasificador por similitud coseno contra centroides TF-IDF por categoría.
+#   Cada categoría se representa con el promedio de los vectores normalizados
+#   de sus promociones etiquetadas (más su propio título y descripción).
+# =============================================================================
+class ClasificadorLocal(Clasificador):
+    """Modelo TF-IDF de centroides entrenado con PromocionCategoria."""
+    nombre = "local"
+
+    def __init__(self, categorias: list[tuple[int, str, Optional[str]]], version: str):
+        self.version = version
+        self.entrenado_en = time.monotonic()
+        self.umbral = getattr(settings, "AI_LOCAL_UMBRAL", 0.15)
+        self.margen = getattr(settings, "AI_LOCAL_MARGEN", 0.8)
+
+        # Documentos de entrenamiento: (id_categoria, texto)
+        documentos = [(cat_id, f"{titulo} {descripcion or ''}") for cat_id, titulo, descripcion in categorias]
+        sin_categoria = {cat_id for cat_id, titulo, _ in categorias if titulo == "Sin categoría"}
+        validas = {cat_id for cat_id, _, _ in categorias} - sin_categoria
+        documentos = [(cat_id, texto) for cat_id, texto in documentos if cat_id in validas]
+        documentos += [
+            (cat_id, f"{nombre} {descripcion or ''}")
+            for cat_id, nombre, descripcion in (
+                PromocionCategoria.objects
+                .filter(id_categoria_id__in=validas)
+                .values_list("id_categoria_id", "id_promocion__nombre", "id_promocion__descripcion")
+                .iterator(chunk_size=2000)
+            )
+        ]
+
+        self.categorias = np.array(sorted(validas), dtype=np.int64)
+        indice_categoria = {cat_id: i for i, cat_id in enumerate(sorted(validas))}
+
+        # Vocabulario y frecuencia de documentos
+        self.vocabulario = {}
+        docs_tokens = []
+        for cat_id, texto in documentos:
+            ids = [self.vocabulario.setdefault(t, len(self.vocabulario)) for t in tokenizar(texto)]
+            docs_tokens.append((indice_categoria[cat_id], np.asarray(ids, dtype=np.int64)))
+
+        tam_vocab = len(self.vocabulario)
+        df = np.zeros(tam_vocab, dtype=np.float64)
+        for _, ids in docs_tokens:
+            if ids.size:
+                df[np.unique(ids)] += 1
+        self.idf = (np.log((1 + len(docs_tokens)) / (1 + df)) + 1).astype(np.float32)
+
+        # Centroides: suma de vectores TF-IDF normalizados por categoría
+        centroides = np.zeros((len(self.categorias), tam_vocab), dtype=np.float32)
+        for fila, ids in docs_tokens:
+            if not ids.size:
+                continue
+            terminos, conteos = np.unique(ids, return_counts=True)
+            pesos = (1 + np.log(conteos)).astype(np.float32) * self.idf[terminos]
+            centroides[fila, terminos] += pesos / np.linalg.norm(pesos)
+
+        normas = np.linalg.norm(centroides, axis=1, keepdims=True)
+        normas[normas == 0] = 1
+        self.centroides = centroides / normas
+
+    def clasificar(self, nombre, descripcion, categorias=None) -> dict:
+        """Devuelve las categorías con mayor similitud coseno al texto."""
+        ids = [self.vocabulario[t] for t in tokenizar(f"{nombre} {descripcion or ''}") if t in self.vocabulario]
+        if not ids or not self.categorias.size:
+            raise ClasificacionNoDisponible("Sin términos conocidos para el modelo local.")
+
+        terminos, conteos = np.unique(np.asarray(ids, dtype=np.int64), return_counts=True)
+        pesos = (1 + np.log(conteos)).astype(np.float32) * self.idf[terminos]
+        pesos /= np.linalg.norm(pesos)
+
+        puntajes = self.centroides[:, terminos] @ pesos
+        mejor = float(puntajes.max())
+        if mejor < self.umbral:
+            raise ClasificacionNoDisponible(f"Confianza insuficiente del modelo local ({mejor:.2f}).")
+
+        seleccion = np.flatnonzero(puntajes >= max(self.umbral, mejor * self.margen))
+        seleccion = seleccion[np.argsort(-puntajes[seleccion])]
+        return {
+            "categoria": [int(c) for c in self.categorias[seleccion]],
+            "riesgo": "",
+            "motivo_revision": f"Clasificación local por similitud TF-IDF ({mejor:.2f}).",
+        }
+
+
+# -----------------------------------------------------------------------------
+# Modelo local compartido por el proceso (se reentrena si cambian las
+# categorías o si supera AI_LOCAL_REENTRENAR_SEGUNDOS de antigüedad).
+# -----------------------------------------------------------------------------
+_modelo_local: Optional[ClasificadorLocal] = None
+_lock_modelo = threading.Lock()
+
+
+def obtener_clasificador_local(version: str) -> ClasificadorLocal:
+    """Devuelve el modelo local vigente para la versión de categorías indicada."""
+    global _modelo_local
+    vigencia = getattr(settings, "AI_LOCAL_REENTRENAR_SEGUNDOS", 3600)
+
+    modelo = _modelo_local
+    if modelo and modelo.version == version and time.monotonic() - modelo.entrenado_en < vigencia:
+        return modelo
+
+    with _lock_modelo:
+        modelo = _modelo_local
+        if not (modelo and modelo.version == version and time.monotonic() - modelo.entrenado_en < vigencia):
+            categorias = list(Categoria.objects.values_list("id", "titulo", "descripcion"))
+            modelo = ClasificadorLocal(categorias, version)
+            _modelo_local = modelo
+    return modelo
@@ -0,0 +1,195 @@
+# =============================================================================
+# Autores: Daniel Álvarez Sil y Yael Sinuhe Grajeda Martínez
+# Descripción:
+#   Protección de las llamadas salientes a OpenAI:
+#     - Circuit breaker: tras AI_CIRCUITO_FALLOS fallos consecutivos deja de
+#       llamar a la API durante AI_CIRCUITO_ABIERTO_SEGUNDOS y responde de
+#       inmediato con CircuitoAbierto (el flujo usa el clasificador local o la
+#       categoría de respaldo). Pasado ese tiempo deja pasar una sola llamada
+#       de prueba ("semiabierto") y se cierra si tiene éxito.
+#     - Histogramas de latencia y conteo de resultados por tipo (éxito, error,
+#       timeout, circuito abierto), expuestos en /functionality/ai/metricas/.
+#
+#   El estado es por proceso (cada worker de gunicorn tiene su propio
+#   circuito y sus propias métricas).
+# =============================================================================
+
+import time
+import threading
+from bisect import bisect_left
+
+from django.conf import settings
+
+
+# Límites superiores (segundos) de los buckets del histograma de latencia
+BUCKETS_LATENCIA = (0.25, 0.5, 1, 2, 5, 10, 20, 30, 60)
+
+
+# =============================================================================
+# Clase: CircuitoAbierto
+# Descripción:
+#   Error lanzado sin llamar a la API mientras el circuito está abierto. No
+#   hereda de ClasificacionNoDisponible para que el worker de categorización
+#   reintente la tarea más tarde en lugar de darla por fallida.
+# =============================================================================
+class CircuitoAbierto(Exception):
+    """La API remota se considera caída; la llamada no se realizó."""
+
+
+# =============================================================================
+# Clase: CircuitBreaker
+# Descripción:
+#   Circuit breaker de tres estados (cerrado, abierto, semiabierto), seguro
+#   entre hilos.
+# =============================================================================
+class CircuitBreaker:
+    """Corta las llamadas a un servicio tras fallos consecutivos."""
+
+    def __init__(self, nombre: str, umbral: int, abierto_segundos: float):
+        self.nombre = nombre
+        self.umbral = umbral
+        self.abierto_segundos = abierto_segundos
+        self._lock = threading.Lock()
+        self._fallos = 0
+        self._abierto_hasta = 0.0
+        self._prueba_en_curso = False
+        self.aperturas = 0
+
+    @property
+    def estado(self) -> str:
+        with self._lock:
+            if self._fallos < self.umbral:
+                return "cerrado"
+            return "abierto" if time.monotonic() < self._abierto_hasta else "semiabierto"
+
+    def permitir(self) -> None:
+        """Lanza CircuitoAbierto si la llamada no debe realizarse."""
+        with self._lock:
+            if self._fallos < self.umbral:
+                return
+            restante = self._abierto_hasta - time.monotonic()
+            if restante > 0:
+                raise CircuitoAbierto(f"Circuito '{self.nombre}' abierto ({restante:.0f} s restantes).")
+            if self._prueba_en_curso:
+                raise CircuitoAbierto(f"Circuito '{self.nombre}' semiabierto: prueba en curso.")
+            self._prueba_en_curso = True
+
+    def registrar_exito(self) -> None:
+        with self._lock:
+            self._fallos = 0
+            self._prueba_en_curso = False
+
+    def registrar_fallo(self) -> None:
+        with self._lock:
+            self._fallos += 1
+            self._prueba_en_curso = False
+            if self._fallos >= self.umbral:
+                if self._fallos == self.umbral:
+                    self.aperturas += 1
+                    print(f"[Circuito {self.nombre}] Abierto tras {self._fallos} fallos consecutivos.")
+                self._abierto_hasta = time.monotonic() + self.abierto_segundos
+
+
+# =============================================================================
+# Clase: Histograma
+# Descripción:
+#   Histograma de latencias con buckets fijos (acumulativos al exportar).
+# =============================================================================
+class Histograma:
+    """Acumula observaciones de latencia en buckets fijos."""
+
+    def __init__(self, buckets=BUCKETS_LATENCIA):
+        self.buckets = tuple(buckets)
+        self._conteos = [0] * (len(self.buckets) + 1)  # último: +Inf
+        self._suma = 0.0
+        self._lock = threading.Lock()
+
+    def observar(self, valor: float) -> None:
+        with self._lock:
+            self._conteos[bisect_left(self.buckets, valor)] += 1
+            self._suma += valor
+
+    def exportar(self) -> dict:
+        with self._lock:
+            conteos, suma = list(self._conteos), self._suma
+        acumulado, buckets = 0, {}
+        for limite, conteo in zip(self.buckets + ("+Inf",), conteos):
+            acumulado += conteo
+            buckets[str(limite)] = acumulado
+        return {"buckets": buckets, "total": acumulado, "suma_segundos": round(suma, 4)}
+
+
+circuito_openai = CircuitBreaker(
+    "openai",
+    umbral=getattr(settings, "AI_CIRCUITO_FALLOS", 5),
+    abierto_segundos=getattr(settings, "AI_CIRCUITO_ABIERTO_SEGUNDOS", 60),
+)
+
+_latencias = {"exito": Histograma(), "error": Histograma()}
+_resultados = {"exito": 0, "error": 0, "timeout": 0, "circuito_abierto": 0}
+_lock_resultados = threading.Lock()
+
+
+def _contar(resultado: str) -> None:
+    with _lock_resultados:
+        _resultados[resultado] += 1
+
+
+def _es_timeout(error: Exception) -> bool:
+    """Detecta timeouts de openai/httpx sin importar los paquetes en este módulo."""
+    return isinstance(error, TimeoutError) or "Timeout" in type(error).__name__
+
+
+# =============================================================================
+# Función: llamada_protegida
+# Descripción:
+#   Ejecuta 'funcion' a través del circuit breaker registrando su latencia.
+# =============================================================================
+def llamada_protegida(funcion, *args, **kwargs):
+    """
+    Ejecuta una llamada a OpenAI protegida por el circuito.
+
+    Lanza:
+        CircuitoAbierto: El circuito está abierto; no se llamó a la API.
+        Exception: El error original de la llamada (también cuenta como fallo).
+    """
+    try:
+        circuito_openai.permitir()
+    except CircuitoAbierto:
+        _contar("circuito_abierto")
+        raise
+
+    inicio = time.perf_counter()
+    try:
+        resultado = funcion(*args, **kwargs)
+    except Exception as e:
+        _latencias["error"].observar(time.perf_counter() - inicio)
+        _contar("timeout" if _es_timeout(e) else "error")
+        circuito_openai.registrar_fallo()
+        raise
+
+    _latencias["exito"].observar(time.perf_counter() - inicio)
+    _contar("exito")
+    circuito_openai.registrar_exito()
+    return resultado
+
+
+# =============================================================================
+# Función: metricas_openai
+# Descripción:
+#   Instantánea de las métricas del proceso actual.
+# =============================================================================
+def metricas_openai() -> dict:
+    """Devuelve estado del circuito, conteos por resultado e histogramas de latencia."""
+    with _lock_resultados:
+        resultados = dict(_resultados)
+    return {
+        "circuito": {
+            "estado": circuito_openai.estado,
+            "aperturas": circuito_openai.aperturas,
+            "umbral_fallos": circuito_openai.umbral,
+            "abierto_segundos": circuito_openai.abierto_segundos,
+        },
+        "resultados": resultados,
+        "latencia_segundos": {nombre: h.exportar() for nombre, h in _latencias.items()},
+    }
@@ -0,0 +1,177 @@
+# =============================================================================
+# Autores: Daniel Álvarez Sil y Yael Sinuhe Grajeda Martínez
+# Descripción:
+#   Servidor HTTP local compatible con el endpoint POST /v1/responses de
+#   OpenAI, suficiente para `client.responses.parse(..., text_format=...)`
+#   tal como lo usa automata.py. Permite pruebas de carga e integración sin
+#   red ni API key:
+#
+#       python manage.py servidor_openai_stub --puerto 8765 --latencia-ms 800
+#       OPENAI_BASE_URL=http://127.0.0.1:8765/v1 python manage.py runserver
+#
+#   Las respuestas son deterministas: las categorías y el riesgo se derivan
+#   del hash del nombre y la descripción, usando la lista "Categorías
+#   válidas" incluida en el prompt. La latencia (media ± variación) y la tasa
+#   de errores (HTTP 500) son configurables.
+# =============================================================================
+
+import json
+import re
+import time
+import uuid
+import random
+import hashlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+_CATEGORIAS_RE = re.compile(r"Categorías válidas: (\[.*?\])\n", re.S)
+_RIESGOS = ("BAJO",) * 7 + ("MEDIO",) * 2 + ("ALTO",)
+
+
+# =============================================================================
+# Función: _texto_del_input
+# Descripción:
+#   Extrae el texto del campo 'input' (cadena o lista de mensajes).
+# =============================================================================
+def _texto_del_input(entrada) -> str:
+    """Concatena el texto del prompt sin importar el formato de 'input'."""
+    if isinstance(entrada, str):
+        return entrada
+    partes = []
+    for mensaje in entrada or []:
+        contenido = mensaje.get("content", "") if isinstance(mensaje, dict) else ""
+        if isinstance(contenido, str):
+            partes.append(contenido)
+        else:
+            partes.extend(c.get("text", "") for c in contenido if isinstance(c, dict))
+    return "\n".join(partes)
+
+
+# =============================================================================
+# Función: clasificacion_determinista
+# Descripción:
+#   Produce el resultado de clasificación para un prompt de automata.py.
+# =============================================================================
+def clasificacion_determinista(prompt: str) -> dict:
+    """Devuelve {'categoria', 'riesgo', 'motivo_revision'} estable para el mismo prompt."""
+    coincidencia = _CATEGORIAS_RE.search(prompt)
+    pares = json.loads(coincidencia.group(1)) if coincidencia else []
+    ids = [cat_id for cat_id, titulo in pares if titulo != "Sin categoría"] or [cat_id for cat_id, _ in pares]
+
+    # Solo la parte variable del prompt (nombre y descripción) determina la respuesta
+    datos = prompt[coincidencia.end():] if coincidencia else prompt
+    semilla = int.from_bytes(hashlib.sha256(datos.encode("utf-8")).digest()[:8], "big")
+
+    categorias = []
+    if ids:
+        categorias.append(ids[semilla % len(ids)])
+        if len(ids) > 1 and (semilla >> 8) % 4 == 0:
+            segunda = ids[(semilla >> 16) % len(ids)]
+            if segunda not in categorias:
+                categorias.append(segunda)
+
+    riesgo = _RIESGOS[(semilla >> 24) % len(_RIESGOS)]
+    return {
+        "categoria": categorias,
+        "riesgo": riesgo,
+        "motivo_revision": f"Respuesta simulada (stub) con riesgo {riesgo}.",
+    }
+
+
+# =============================================================================
+# Función: respuesta_responses
+# Descripción:
+#   Construye el cuerpo JSON de un objeto 'response' de la API de OpenAI.
+# =============================================================================
+def respuesta_responses(modelo: str, texto: str, prompt: str) -> dict:
+    """Envuelve 'texto' como salida 'output_text' de un mensaje del asistente."""
+    tokens_entrada, tokens_salida = len(prompt) // 4, len(texto) // 4
+    return {
+        "id": f"resp_stub_{uuid.uuid4().hex}",
+        "object": "response",
+        "created_at": int(time.time()),
+        "status": "completed",
+        "model": modelo,
+        "output": [{
+            "type": "message",
+            "id": f"msg_stub_{uuid.uuid4().hex}",
+            "status": "completed",
+            "role": "assistant",
+            "content": [{"type": "output_text", "text": texto, "annotations": []}],
+        }],
+        "parallel_tool_calls": False,
+        "tool_choice": "auto",
+        "tools": [],
+        "usage": {
+            "input_tokens": tokens_entrada,
+            "input_tokens_details": {"cached_tokens": 0},
+            "output_tokens": tokens_salida,
+            "output_tokens_details": {"reasoning_tokens": 0},
+            "total_tokens": tokens_entrada + tokens_salida,
+        },
+    }
+
+
+# =============================================================================
+# Clase: StubOpenAIHandler
+# Descripción:
+#   Atiende POST /v1/responses (o /responses) con latencia y errores simulados.
+# =============================================================================
+class StubOpenAIHandler(BaseHTTPRequestHandler):
+    """Handler HTTP del stub; la configuración vive en el servidor."""
+    protocol_version = "HTTP/1.1"
+
+    def _enviar(self, codigo: int, cuerpo: dict) -> None:
+        datos = json.dumps(cuerpo, ensure_ascii=False).encode("utf-8")
+        self.send_response(codigo)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(datos)))
+        self.end_headers()
+        self.wfile.write(datos)
+
+    def do_POST(self):
+        longitud = int(self.headers.get("Content-Length") or 0)
+        try:
+            peticion = json.loads(self.rfile.read(longitud) or b"{}")
+        except ValueError:
+            self._enviar(400, {"error": {"message": "JSON inválido.", "type": "invalid_request_error"}})
+            return
+
+        if self.path.rstrip("/") not in ("/v1/responses", "/responses"):
+            self._enviar(404, {"error": {"message": f"Ruta no soportada: {self.path}", "type": "not_found"}})
+            return
+
+        servidor = self.server
+        latencia = max(0.0, random.gauss(servidor.latencia_ms, servidor.variacion_ms)) / 1000
+        time.sleep(latencia)
+
+        if random.random() < servidor.tasa_error:
+            self._enviar(500, {"error": {"message": "Error simulado por el stub.", "type": "server_error"}})
+            return
+
+        prompt = _texto_del_input(peticion.get("input"))
+        texto = json.dumps(clasificacion_determinista(prompt), ensure_ascii=False)
+        self._enviar(200, respuesta_responses(peticion.get("model", "stub"), texto, prompt))
+
+    def log_message(self, formato, *args):
+        if self.server.verbose:
+            super().log_message(formato, *args)
+
+
+# =============================================================================
+# Función: crear_servidor
+# Descripción:
+#   Crea el servidor multihilo del stub (cada petición en su propio hilo, de
+#   modo que la latencia simulada no serializa a los clientes concurrentes).
+# =============================================================================
+def crear_servidor(host: str = "127.0.0.1", puerto: int = 8765, latencia_ms: float = 0,
+                   variacion_ms: float = 0, tasa_error: float = 0.0,
+                   verbose: bool = False) -> ThreadingHTTPServer:
+    """Devuelve el servidor listo para serve_forever()."""
+    servidor = ThreadingHTTPServer((host, puerto), StubOpenAIHandler)
+    servidor.daemon_threads = True
+    servidor.latencia_ms = latencia_ms
+    servidor.variacion_ms = variacion_ms
+    servidor.tasa_error = tasa_error
+    servidor.verbose = verbose
+    return servidor
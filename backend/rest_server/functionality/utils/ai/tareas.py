@@ -0,0 +1,215 @@
+# =============================================================================
+# Autores: Daniel Álvarez Sil y Yael Sinuhe Grajeda Martínez
+# Descripción:
+#   Cola de trabajos en base de datos para la categorización de promociones
+#   con IA. La creación de una promoción solo encola una TareaCategorizacion;
+#   los workers (`python manage.py procesar_categorizaciones`) reclaman tareas
+#   con SELECT ... FOR UPDATE SKIP LOCKED, llaman a la IA sin mantener abierta
+#   ninguna transacción y registran el resultado.
+#
+#   Pueden ejecutarse varios workers en paralelo (procesos independientes);
+#   cada tarea es tomada por un solo worker. Los errores se reintentan con
+#   backoff exponencial hasta agotar 'max_intentos'.
+# =============================================================================
+
+import random
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from functionality.models import Promocion, PromocionCategoria, TareaCategorizacion
+from functionality.utils.ai.automata import clasificar_promocion, categoria_fallback
+from functionality.utils.ai.clasificadores import ClasificacionNoDisponible
+from functionality.utils.ai.resiliencia import CircuitoAbierto
+
+
+# =============================================================================
+# Función: encolar_categorizacion
+# Descripción:
+#   Registra una tarea de categorización para la promoción indicada. Debe
+#   llamarse dentro de la misma transacción que crea la promoción.
+# =============================================================================
+def encolar_categorizacion(promocion: Promocion) -> TareaCategorizacion:
+    """Crea una tarea pendiente y marca la promoción como 'pendiente'."""
+    if promocion.estatus_categorizacion != "pendiente":
+        Promocion.objects.filter(pk=promocion.pk).update(estatus_categorizacion="pendiente")
+        promocion.estatus_categorizacion = "pendiente"
+
+    return TareaCategorizacion.objects.create(
+        id_promocion=promocion,
+        max_intentos=getattr(settings, "AI_TAREAS_MAX_INTENTOS", 5),
+        disponible_en=timezone.now(),
+    )
+
+
+# =============================================================================
+# Función: reclamar_tareas
+# Descripción:
+#   Toma hasta 'limite' tareas disponibles y las marca como 'procesando'.
+#   También recupera tareas cuyo worker murió (bloqueo vencido).
+# =============================================================================
+def reclamar_tareas(limite: int) -> list[TareaCategorizacion]:
+    """Reclama tareas de forma segura entre workers concurrentes."""
+    ahora = timezone.now()
+    vencimiento = ahora - timedelta(seconds=getattr(settings, "AI_TAREAS_BLOQUEO_SEGUNDOS", 600))
+
+    with transaction.atomic():
+        tareas = list(
+            TareaCategorizacion.objects
+            .select_for_update(skip_locked=True)
+            .filter(
+                Q(estatus="pendiente", disponible_en__lte=ahora)
+                | Q(estatus="procesando", bloqueado_en__lt=vencimiento)
+            )
+            .order_by("disponible_en")[:limite]
+        )
+        if tareas:
+            TareaCategorizacion.objects.filter(id__in=[t.id for t in tareas]).update(
+                estatus="procesando",
+                bloqueado_en=ahora,
+                intentos=F("intentos") + 1,
+                fecha_actualizado=ahora,
+            )
+            for tarea in tareas:
+                tarea.estatus = "procesando"
+                tarea.bloqueado_en = ahora
+                tarea.intentos += 1
+
+    return tareas
+
+
+# =============================================================================
+# Función: _calcular_backoff
+# Descripción:
+#   Espera exponencial con jitter para el siguiente intento.
+# =============================================================================
+def _calcular_backoff(intentos: int) -> timedelta:
+    """Devuelve base * 2^(intentos-1), acotado al máximo y con ±20 % de jitter."""
+    base = getattr(settings, "AI_TAREAS_BACKOFF_BASE_SEGUNDOS", 30)
+    maximo = getattr(settings, "AI_TAREAS_BACKOFF_MAX_SEGUNDOS", 3600)
+    espera = min(base * (2 ** max(intentos - 1, 0)), maximo)
+    return timedelta(seconds=espera * random.uniform(0.8, 1.2))
+
+
+# =============================================================================
+# Función: _guardar_categorias
+# Descripción:
+#   Reemplaza las categorías de la promoción (idempotente ante reintentos).
+# =============================================================================
+def _guardar_categorias(id_promocion: int, categorias: list[int]) -> None:
+    """Elimina las categorías previas e inserta las nuevas en un solo INSERT."""
+    PromocionCategoria.objects.filter(id_promocion_id=id_promocion).delete()
+    PromocionCategoria.objects.bulk_create([
+        PromocionCategoria(id_promocion_id=id_promocion, id_categoria_id=cat_id)
+        for cat_id in dict.fromkeys(categorias)
+    ])
+
+
+# Nivel numérico de cada riesgo: ordena la cola de revisión de moderadores
+NIVELES_RIESGO = {"BAJO": 1, "MEDIO": 2, "ALTO": 3}
+
+
+# =============================================================================
+# Función: campos_riesgo
+# Descripción:
+#   Traduce el riesgo inferido a los campos de Promocion. Solo los riesgos
+#   MEDIO y ALTO envían la promoción a la cola de revisión.
+# =============================================================================
+def campos_riesgo(riesgo: str, motivo_revision: str) -> dict:
+    """Devuelve los campos a actualizar, o {} si el riesgo no es válido (p. ej. modelo local)."""
+    riesgo = (riesgo or "").strip().upper()
+    nivel = NIVELES_RIESGO.get(riesgo)
+    if nivel is None:
+        return {}
+    return {
+        "riesgo": riesgo,
+        "nivel_riesgo": nivel,
+        "motivo_revision": (motivo_revision or "")[:1000] or None,
+        "revision_pendiente": nivel >= NIVELES_RIESGO["MEDIO"],
+    }
+
+
+# =============================================================================
+# Función: procesar_tarea
+# Descripción:
+#   Ejecuta la inferencia de una tarea reclamada y registra su resultado.
+# =============================================================================
+def procesar_tarea(tarea: TareaCategorizacion) -> bool:
+    """
+    Procesa una tarea de categorización.
+
+    Retorna:
+        bool: True si la promoción quedó categorizada por la IA.
+    """
+    promocion = Promocion.objects.filter(pk=tarea.id_promocion_id).only("id", "nombre", "descripcion").first()
+    if promocion is None:
+        # La promoción fue eliminada mientras la tarea esperaba
+        TareaCategorizacion.objects.filter(pk=tarea.pk).update(
+            estatus="fallida", ultimo_error="Promoción no encontrada.", bloqueado_en=None
+        )
+        return False
+
+    # La llamada a la IA se realiza fuera de cualquier transacción
+    try:
+        resultado = clasificar_promocion(promocion.nombre, promocion.descripcion)
+        categorias = resultado.categoria or categoria_fallback()
+        riesgo = campos_riesgo(resultado.riesgo, resultado.motivo_revision)
+    except ClasificacionNoDisponible as e:
+        # Ningún backend puede clasificar (p. ej. sin API key): reintentar no ayuda
+        print(f"[Categorización] Tarea {tarea.id} sin clasificador disponible: {e}")
+        _registrar_fallo(tarea, str(e), definitivo=True)
+        return False
+    except CircuitoAbierto as e:
+        # La API está en corto: se pospone la tarea sin consumir un intento
+        TareaCategorizacion.objects.filter(pk=tarea.pk).update(
+            estatus="pendiente",
+            intentos=F("intentos") - 1,
+            disponible_en=timezone.now() + timedelta(seconds=getattr(settings, "AI_CIRCUITO_ABIERTO_SEGUNDOS", 60)),
+            bloqueado_en=None,
+            ultimo_error=str(e),
+            fecha_actualizado=timezone.now(),
+        )
+        return False
+    except Exception as e:
+        print(f"[Categorización] Error en tarea {tarea.id} (intento {tarea.intentos}): {e}")
+        _registrar_fallo(tarea, str(e))
+        return False
+
+    with transaction.atomic():
+        _guardar_categorias(promocion.id, categorias)
+        Promocion.objects.filter(pk=promocion.id).update(estatus_categorizacion="completada", **riesgo)
+        TareaCategorizacion.objects.filter(pk=tarea.pk).update(
+            estatus="completada", bloqueado_en=None, ultimo_error=None, fecha_actualizado=timezone.now()
+        )
+    return True
+
+
+# =============================================================================
+# Función: _registrar_fallo
+# Descripción:
+#   Reprograma la tarea con backoff o la marca como fallida definitivamente,
+#   asignando la categoría "Sin categoría" para no dejar la promoción sin datos.
+# =============================================================================
+def _registrar_fallo(tarea: TareaCategorizacion, error: str, definitivo: bool = False) -> None:
+    """Aplica la política de reintentos a una tarea fallida."""
+    ahora = timezone.now()
+
+    if not definitivo and tarea.intentos < tarea.max_intentos:
+        TareaCategorizacion.objects.filter(pk=tarea.pk).update(
+            estatus="pendiente",
+            disponible_en=ahora + _calcular_backoff(tarea.intentos),
+            bloqueado_en=None,
+            ultimo_error=error,
+            fecha_actualizado=ahora,
+        )
+        return
+
+    with transaction.atomic():
+        _guardar_categorias(tarea.id_promocion_id, categoria_fallback())
+        Promocion.objects.filter(pk=tarea.id_promocion_id).update(estatus_categorizacion="fallida")
+        TareaCategorizacion.objects.filter(pk=tarea.pk).update(
+            estatus="fallida", bloqueado_en=None, ultimo_error=error, fecha_actualizado=ahora
+        )
@@ -14,8 +14,10 @@ from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from ...models import CodigoQR, Promocion, AdministradorNegocio, Canje, Cajero
 from login.models import User
+from django.db import transaction
 from django.db.models import Q
 from django.utils import timezone
+from ..estadisticas.canje_diario import registrar_canje
 
 
 # =============================================================================
@@ -26,7 +28,8 @@ from django.utils import timezone
 #   - Verifica autenticación del usuario.
 #   - Comprueba que el QR no haya expirado (más de 5 minutos).
 #   - Revisa que la promoción pertenezca al negocio del cajero.
-#   - Marca el QR como utilizado y registra el canje en la base de datos.
+#   - Marca el QR como utilizado y registra el canje en la base de datos
+#     (junto con el agregado diario CanjeDiario, en una sola transacción).
 # =============================================================================
 class validarQRView(APIView):
     """Vista para validar códigos QR y registrar canjes."""
@@ -116,19 +119,21 @@ class validarQRView(APIView):
         # ==============================================================
         # 5️⃣ Registrar el canje y actualizar estado
         # ==============================================================
-        codigo_qr.utilizado = True
-        codigo_qr.save()
-
-        promocion.numero_canjeados += 1
-        promocion.save()
-
-        # Crear el registro del canje
-        Canje.objects.create(
-            id_promocion=promocion,
-            id_usuario=codigo_qr.id_usuario,
-            id_cajero_id=canjeador.id,
-            fecha_creado=timezone.now()
-        )
+        with transaction.atomic():
+            codigo_qr.utilizado = True
+            codigo_qr.save()
+
+            promocion.numero_canjeados += 1
+            promocion.save()
+
+            # Crear el registro del canje y sumarlo al agregado diario
+            canje = Canje.objects.create(
+                id_promocion=promocion,
+                id_usuario=codigo_qr.id_usuario,
+                id_cajero_id=canjeador.id,
+                fecha_creado=timezone.now()
+            )
+            registrar_canje(promocion, canje.fecha_creado)
 
         print("Código QR validado correctamente")
         return Response({'success': True, 'message': 'Código validado correctamente.'}, status=200)
@@ -0,0 +1,353 @@
+# =============================================================================
+# Autores: Daniel Álvarez Sil y Yael Sinuhe Grajeda Martínez
+# Descripción:
+#   Catálogo versionado para clientes sin conexión. Genera snapshots
+#   comprimidos (JSON + gzip) con las promociones activas, los negocios y las
+#   categorías, identificados por un hash de contenido, y calcula deltas entre
+#   dos versiones para que la app móvil descargue solo los cambios.
+#
+#   Los snapshots se construyen periódicamente con el comando
+#   `python manage.py construir_catalogo`.
+# =============================================================================
+
+import gzip
+import json
+import hashlib
+from functools import lru_cache
+from typing import Optional
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+from django.utils import timezone
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework.permissions import AllowAny
+from rest_framework import status
+
+from ...models import CatalogoSnapshot, Promocion, PromocionCategoria, Negocio, Categoria
+
+
+# Secciones incluidas en el catálogo (cada elemento se identifica por 'id')
+SECCIONES_CATALOGO = ("promociones", "negocios", "categorias")
+
+
+# =============================================================================
+# Función: _serializar_valor
+# Descripción:
+#   Convierte valores no serializables (fechas, decimales, archivos) a texto.
+# =============================================================================
+def _serializar_valor(valor):
+    """Devuelve una representación JSON estable del valor recibido."""
+    if hasattr(valor, "isoformat"):
+        return valor.isoformat()
+    return str(valor)
+
+
+# =============================================================================
+# Función: _generar_contenido
+# Descripción:
+#   Consulta el catálogo vigente y lo devuelve como diccionario de secciones.
+# =============================================================================
+def _generar_contenido() -> dict:
+    """Obtiene promociones activas, negocios activos y categorías."""
+    ahora = timezone.now()
+
+    promociones = list(
+        Promocion.objects
+        .filter(activo=True, fecha_fin__gte=ahora)
+        .order_by("id")
+        .values(
+            "id", "id_negocio", "nombre", "descripcion", "tipo", "porcentaje",
+            "precio", "fecha_inicio", "fecha_fin", "imagen", "imagen_variantes",
+            "limite_por_usuario", "limite_total",
+        )
+    )
+
+    # Categorías de todas las promociones en una sola consulta
+    categorias_por_promo = {}
+    for id_promocion, id_categoria in (
+        PromocionCategoria.objects
+        .filter(id_promocion_id__in=[p["id"] for p in promociones])
+        .order_by("id_categoria_id")
+        .values_list("id_promocion_id", "id_categoria_id")
+    ):
+        categorias_por_promo.setdefault(id_promocion, []).append(id_categoria)
+
+    for p in promociones:
+        p["categorias"] = categorias_por_promo.get(p["id"], [])
+
+    negocios = list(
+        Negocio.objects
+        .filter(estatus="activo")
+        .order_by("id")
+        .values(
+            "id", "nombre", "telefono", "sitio_web", "logo", "logo_variantes", "url_maps",
+            "cp", "numero_ext", "numero_int", "colonia", "municipio", "estado",
+        )
+    )
+
+    categorias = list(
+        Categoria.objects
+        .order_by("id")
+        .values("id", "titulo", "descripcion", "image")
+    )
+
+    return {
+        "promociones": promociones,
+        "negocios": negocios,
+        "categorias": categorias,
+    }
+
+
+# =============================================================================
+# Función: _a_json
+# Descripción:
+#   Serializa el contenido de forma canónica (claves ordenadas, sin espacios)
+#   para que el mismo catálogo produzca siempre el mismo hash.
+# =============================================================================
+def _a_json(contenido: dict) -> bytes:
+    """Serializa el diccionario en JSON canónico (UTF-8)."""
+    return json.dumps(
+        contenido,
+        default=_serializar_valor,
+        ensure_ascii=False,
+        sort_keys=True,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+# =============================================================================
+# Función: construir_snapshot
+# Descripción:
+#   Genera un nuevo snapshot del catálogo. Si el contenido no cambió respecto
+#   a la última versión, no se crea una versión nueva.
+# =============================================================================
+def construir_snapshot() -> tuple[CatalogoSnapshot, bool]:
+    """
+    Construye y guarda un snapshot del catálogo.
+
+    Retorna:
+        tuple[CatalogoSnapshot, bool]: El snapshot vigente y si fue creado.
+    """
+    crudo = _a_json(_generar_contenido())
+    hash_contenido = hashlib.sha256(crudo).hexdigest()
+
+    ultimo = CatalogoSnapshot.objects.order_by("-id").only("id", "hash_contenido").first()
+    if ultimo and ultimo.hash_contenido == hash_contenido:
+        return ultimo, False
+
+    comprimido = gzip.compress(crudo, compresslevel=9, mtime=0)
+    snapshot = CatalogoSnapshot.objects.create(
+        hash_contenido=hash_contenido,
+        contenido=comprimido,
+        tamano=len(comprimido),
+    )
+
+    # Retención: se conservan solo las últimas N versiones
+    retenidos = getattr(settings, "CATALOGO_SNAPSHOTS_RETENIDOS", 30)
+    obsoletos = CatalogoSnapshot.objects.order_by("-id").values_list("id", flat=True)[retenidos:]
+    CatalogoSnapshot.objects.filter(id__in=list(obsoletos)).delete()
+    _delta_comprimido.cache_clear()
+
+    return snapshot, True
+
+
+# =============================================================================
+# Función: _cargar_contenido
+# Descripción:
+#   Descomprime un snapshot y lo indexa por ID en cada sección.
+# =============================================================================
+def _cargar_contenido(version: int) -> Optional[dict]:
+    """Devuelve {seccion: {id: elemento}} para la versión indicada, o None."""
+    snapshot = CatalogoSnapshot.objects.filter(id=version).only("contenido").first()
+    if not snapshot:
+        return None
+    contenido = json.loads(gzip.decompress(bytes(snapshot.contenido)))
+    return {
+        seccion: {item["id"]: item for item in contenido.get(seccion, [])}
+        for seccion in SECCIONES_CATALOGO
+    }
+
+
+# =============================================================================
+# Función: _delta_comprimido
+# Descripción:
+#   Compara dos versiones del catálogo y devuelve los elementos agregados o
+#   modificados y los IDs eliminados por sección. Como los snapshots son
+#   inmutables, el resultado comprimido se memoriza por par de versiones
+#   (las versiones inexistentes lanzan excepción y no se memorizan). La
+#   memoización es por proceso y no se entera de la retención que aplica
+#   construir_catalogo: calcular_delta comprueba antes que ambas versiones
+#   sigan existiendo.
+# =============================================================================
+@lru_cache(maxsize=32)
+def _delta_comprimido(desde: int, hasta: int) -> bytes:
+    """Calcula el delta entre dos versiones y lo devuelve comprimido con gzip."""
+    anterior = _cargar_contenido(desde)
+    actual = _cargar_contenido(hasta)
+    if anterior is None or actual is None:
+        raise CatalogoSnapshot.DoesNotExist
+
+    cambios = {}
+    for seccion in SECCIONES_CATALOGO:
+        previos, vigentes = anterior[seccion], actual[seccion]
+        cambios[seccion] = {
+            "actualizados": [
+                item for id_item, item in vigentes.items()
+                if previos.get(id_item) != item
+            ],
+            "eliminados": [id_item for id_item in previos if id_item not in vigentes],
+        }
+
+    delta = {"desde": desde, "hasta": hasta, "cambios": cambios}
+    return gzip.compress(_a_json(delta), compresslevel=9, mtime=0)
+
+
+# =============================================================================
+# Función: calcular_delta
+# Descripción:
+#   Devuelve el delta comprimido entre dos versiones, o None si alguna de ellas
+#   ya no se conserva.
+# =============================================================================
+def calcular_delta(desde: int, hasta: int) -> Optional[bytes]:
+    """Calcula el delta entre dos versiones del catálogo."""
+    # Un par ya memorizado puede referirse a versiones purgadas por la retención
+    if CatalogoSnapshot.objects.filter(id__in={desde, hasta}).count() != len({desde, hasta}):
+        return None
+    try:
+        return _delta_comprimido(desde, hasta)
+    except CatalogoSnapshot.DoesNotExist:
+        return None
+
+
+# =============================================================================
+# Función: _acepta_gzip
+# Descripción:
+#   Interpreta Accept-Encoding con sus valores q (RFC 9110): 'gzip;q=0'
+#   rechaza gzip explícitamente y '*' cubre las codificaciones no listadas.
+# =============================================================================
+def _acepta_gzip(accept_encoding: str) -> bool:
+    """Indica si el cliente acepta un cuerpo con Content-Encoding: gzip."""
+    calidades = {}
+    for parte in accept_encoding.split(","):
+        codificacion, _, parametros = parte.partition(";")
+        codificacion = codificacion.strip().lower()
+        if not codificacion:
+            continue
+        q = 1.0
+        for parametro in parametros.split(";"):
+            nombre, _, valor = parametro.partition("=")
+            if nombre.strip().lower() == "q":
+                try:
+                    q = float(valor)
+                except ValueError:
+                    q = 0.0
+        calidades[codificacion] = q
+
+    if "gzip" in calidades:
+        return calidades["gzip"] > 0
+    if "x-gzip" in calidades:
+        return calidades["x-gzip"] > 0
+    return calidades.get("*", 0) > 0
+
+
+# =============================================================================
+# Función: _respuesta_gzip
+# Descripción:
+#   Entrega un cuerpo comprimido; si el cliente no acepta gzip se descomprime.
+# =============================================================================
+def _respuesta_gzip(request, comprimido: bytes, headers: dict) -> HttpResponse:
+    """Construye la respuesta HTTP respetando el encabezado Accept-Encoding."""
+    if _acepta_gzip(request.META.get("HTTP_ACCEPT_ENCODING", "")):
+        response = HttpResponse(comprimido, content_type="application/json")
+        response["Content-Encoding"] = "gzip"
+    else:
+        response = HttpResponse(gzip.decompress(comprimido), content_type="application/json")
+    patch_vary_headers(response, ("Accept-Encoding",))
+    for clave, valor in headers.items():
+        response[clave] = valor
+    return response
+
+
+# =============================================================================
+# Clase: CatalogoSnapshotView
+# Descripción:
+#   Devuelve la última versión completa del catálogo.
+# =============================================================================
+class CatalogoSnapshotView(APIView):
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        """
+        GET /functionality/usuario/catalogo/
+
+        Devuelve el snapshot más reciente. Encabezados de respuesta:
+            - ETag: hash del contenido.
+            - X-Catalogo-Version: versión del snapshot.
+
+        Si el cliente envía If-None-Match con el hash vigente se responde 304.
+        """
+        snapshot = CatalogoSnapshot.objects.order_by("-id").first()
+        if not snapshot:
+            return Response({'detail': 'Catálogo no disponible.'}, status=status.HTTP_404_NOT_FOUND)
+
+        etag = f'"{snapshot.hash_contenido}"'
+        headers = {"ETag": etag, "X-Catalogo-Version": str(snapshot.id)}
+
+        if request.META.get("HTTP_IF_NONE_MATCH") == etag:
+            response = HttpResponse(status=status.HTTP_304_NOT_MODIFIED)
+            for clave, valor in headers.items():
+                response[clave] = valor
+            return response
+
+        return _respuesta_gzip(request, bytes(snapshot.contenido), headers)
+
+
+# =============================================================================
+# Clase: CatalogoDeltaView
+# Descripción:
+#   Devuelve únicamente los cambios entre la versión del cliente y otra versión
+#   (por defecto, la más reciente).
+# =============================================================================
+class CatalogoDeltaView(APIView):
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        """
+        GET /functionality/usuario/catalogo/delta/?desde=<version>&hasta=<version>
+
+        Respuestas:
+            - 200: Delta con elementos actualizados y eliminados por sección.
+            - 400: Parámetros inválidos.
+            - 404: No hay snapshots.
+            - 410: La versión solicitada ya no se conserva; el cliente debe
+                   descargar el catálogo completo.
+        """
+        try:
+            desde = int(request.query_params.get("desde"))
+        except (TypeError, ValueError):
+            return Response({'detail': "El parámetro 'desde' es obligatorio."}, status=status.HTTP_400_BAD_REQUEST)
+
+        hasta = request.query_params.get("hasta")
+        if hasta:
+            try:
+                hasta = int(hasta)
+            except ValueError:
+                return Response({'detail': "El parámetro 'hasta' no es válido."}, status=status.HTTP_400_BAD_REQUEST)
+        else:
+            hasta = CatalogoSnapshot.objects.order_by("-id").values_list("id", flat=True).first()
+            if hasta is None:
+                return Response({'detail': 'Catálogo no disponible.'}, status=status.HTTP_404_NOT_FOUND)
+
+        if desde > hasta:
+            return Response({'detail': "'desde' debe ser menor o igual a 'hasta'."}, status=status.HTTP_400_BAD_REQUEST)
+
+        comprimido = calcular_delta(desde, hasta)
+        if comprimido is None:
+            return Response(
+                {'detail': 'Versión no disponible; descargue el catálogo completo.'},
+                status=status.HTTP_410_GONE
+            )
+
+        return _respuesta_gzip(request, comprimido, {"X-Catalogo-Version": str(hasta)})
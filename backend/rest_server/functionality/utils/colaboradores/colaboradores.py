@@ -29,7 +29,7 @@ from .serializers import (
 # Modelos
 from ...models import (
     Promocion, Canje, AdministradorNegocio,
-    Cajero, PromocionCategoria, CodigoQR, Apartado
+    Cajero, PromocionCategoria, CodigoQR, Apartado, TareaCategorizacion, CanjeDiario
 )
 from login.models import User
 
@@ -129,8 +129,9 @@ class PromocionDeleteView(APIView):
     Elimina una promoción y todos sus registros relacionados:
     - PromocionCategoria
     - CodigoQR
-    - Canje
+    - Canje (y su agregado diario CanjeDiario)
     - Apartado
+    - TareaCategorizacion
     """
     permission_classes = [permissions.AllowAny]
 
@@ -145,7 +146,9 @@ class PromocionDeleteView(APIView):
                 PromocionCategoria.objects.filter(id_promocion=promo_id).delete()
                 CodigoQR.objects.filter(id_promocion=promo_id).delete()
                 Canje.objects.filter(id_promocion=promo_id).delete()
+                CanjeDiario.objects.filter(id_promocion=promo_id).delete()
                 Apartado.objects.filter(id_promocion=promo_id).delete()
+                TareaCategorizacion.objects.filter(id_promocion=promo_id).delete()
                 Promocion.objects.select_for_update().get(pk=promo_id).delete()
             return Response({"detail": "Promoción eliminada"}, status=status.HTTP_200_OK)
         except Promocion.DoesNotExist:
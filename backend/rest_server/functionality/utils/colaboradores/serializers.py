@@ -14,13 +14,13 @@ from django.utils import timezone
 from rest_framework import serializers
 from ...models import (
     AdministradorNegocio, Negocio, SolicitudNegocio,
-    Promocion, Cajero, PromocionCategoria
+    Promocion, Cajero
 )
 from login.models import User
 from decimal import Decimal
 from typing import Optional, Tuple
 from django.core.exceptions import MultipleObjectsReturned
-from functionality.utils.ai.automata import infer_promocion_fields
+from functionality.utils.ai.tareas import encolar_categorizacion
 from django.db.models import Q
 
 
@@ -77,40 +77,71 @@ class AltaNegocioYAdminSerializer(serializers.Serializer):
             raise serializers.ValidationError({
                 "administrador": {"usuario": "Ya existe un usuario con ese nombre."}
             })
+        # create() da de alta el usuario con el correo como username
+        if attrs.get("creado_por_admin", True) and User.objects.filter(
+            username=attrs["administrador"]["correo"]
+        ).exists():
+            raise serializers.ValidationError({
+                "administrador": {"correo": "Ya existe un usuario con ese correo."}
+            })
         return attrs
 
-    @transaction.atomic
     def create(self, validated_data):
-        """Crea negocio, administrador y solicitud en una sola transacción."""
-        request = self.context["request"]
+        """
+        Crea negocio, administrador y solicitud en una sola transacción.
+
+        Contexto opcional: 'logo_key', 'logo_variantes' y 'esperar_subida'. La
+        subida del logo se espera después de confirmar la transacción; si
+        falla, la alta completa se elimina y el error se propaga.
+        """
         negocio_data = validated_data["negocio"]
         admin_data = validated_data["administrador"]
+        creado_por_admin = validated_data.get("creado_por_admin", True)
 
-        negocio = Negocio.objects.create(
-            **negocio_data,
-            logo=self.context.get("logo_key"),
-            fecha_creado=timezone.now(),
-        )
-
-        admin = AdministradorNegocio.objects.create(
-            id_negocio=negocio,
-            **admin_data
-        )
+        with transaction.atomic():
+            negocio = Negocio.objects.create(
+                **negocio_data,
+                logo=self.context.get("logo_key"),
+                logo_variantes=self.context.get("logo_variantes") or {},
+                fecha_creado=timezone.now(),
+            )
 
-        SolicitudNegocio.objects.create(
-            id_negocio=negocio,
-            estatus="aprobado" if validated_data.get("creado_por_admin", True) else "pendiente"
-        )
+            admin = AdministradorNegocio.objects.create(
+                id_negocio=negocio,
+                **admin_data
+            )
 
-        if validated_data.get("creado_por_admin", True):
-            User.objects.create_user(
-                username=admin_data["correo"],
-                password=admin_data["contrasena"],
-                tipo="colaborador"
+            SolicitudNegocio.objects.create(
+                id_negocio=negocio,
+                estatus="aprobado" if creado_por_admin else "pendiente"
             )
 
+            if creado_por_admin:
+                User.objects.create_user(
+                    username=admin_data["correo"],
+                    password=admin_data["contrasena"],
+                    tipo="colaborador"
+                )
+
+        esperar_subida = self.context.get("esperar_subida")
+        if esperar_subida:
+            try:
+                esperar_subida()
+            except Exception:
+                self._deshacer_alta(negocio, admin_data["correo"] if creado_por_admin else None)
+                raise
+
         return {"negocio": negocio, "administrador": admin}
 
+    @transaction.atomic
+    def _deshacer_alta(self, negocio: Negocio, username: Optional[str]) -> None:
+        """Elimina lo creado por create() cuando la subida del logo falla."""
+        if username:
+            User.objects.filter(username=username, tipo="colaborador").delete()
+        SolicitudNegocio.objects.filter(id_negocio=negocio).delete()
+        AdministradorNegocio.objects.filter(id_negocio=negocio).delete()
+        Negocio.objects.filter(pk=negocio.pk).delete()
+
     def to_representation(self, instance):
         """Representa la estructura del negocio creado y su administrador."""
         negocio = instance["negocio"]
@@ -177,16 +208,18 @@ class DeleteUpdatePromocionSerializer(serializers.Serializer):
 #   Valida y crea nuevas promociones asociadas a un negocio.
 # =============================================================================
 class PromocionCreateSerializer(serializers.ModelSerializer):
-    """Permite crear promociones y asignar categorías inferidas por IA."""
+    """Permite crear promociones y encolar su categorización por IA."""
     id_negocio = serializers.IntegerField(write_only=True, required=False, allow_null=True)
     id = serializers.IntegerField(read_only=True)
     imagen = serializers.ImageField(read_only=True)
+    estatus_categorizacion = serializers.CharField(read_only=True)
 
     class Meta:
         model = Promocion
         fields = (
             "id", "id_negocio", "nombre", "descripcion", "fecha_inicio", "fecha_fin",
             "imagen", "limite_por_usuario", "limite_total", "porcentaje", "precio", "activo",
+            "estatus_categorizacion",
         )
 
     def validate(self, attrs):
@@ -212,6 +245,11 @@ class PromocionCreateSerializer(serializers.ModelSerializer):
         attrs["_tipo"] = tipo if tipo in ['2x1', 'trae un amigo', 'otra'] else (
             "porcentaje" if porcentaje > 0 else "precio"
         )
+
+        # Al crear, el negocio se resuelve aquí: todo lo que puede rechazar la
+        # petición ocurre antes de que la vista inicie la subida de la imagen
+        if self.instance is None:
+            attrs["id_negocio"] = self._resolve_negocio_y_admin(attrs.get("id_negocio"))
         return attrs
 
     def _resolve_negocio_y_admin(self, id_negocio_pk: Optional[int]) -> Negocio:
@@ -230,7 +268,9 @@ class PromocionCreateSerializer(serializers.ModelSerializer):
         try:
             administradorNegocio = AdministradorNegocio.objects.get(Q(usuario=username) | Q(correo=username))
         except AdministradorNegocio.DoesNotExist:
-            administradorNegocio = Cajero.objects.get(Q(usuario=username) | Q(correo=username))
+            administradorNegocio = Cajero.objects.filter(Q(usuario=username) | Q(correo=username)).first()
+            if administradorNegocio is None:
+                raise serializers.ValidationError({"id_negocio": "Administrador no encontrado para el usuario."})
         except MultipleObjectsReturned:
             administradorNegocio = AdministradorNegocio.objects.filter(usuario=username).first()
 
@@ -238,28 +278,41 @@ class PromocionCreateSerializer(serializers.ModelSerializer):
         return negocio if isinstance(negocio, Negocio) else Negocio.objects.get(pk=negocio)
 
     def create(self, validated_data):
-        """Crea la promoción e infiere categorías usando IA."""
-        id_negocio_pk = validated_data.pop("id_negocio", None)
-        negocio = self._resolve_negocio_y_admin(id_negocio_pk)
+        """
+        Crea la promoción y encola su categorización con IA.
+
+        La inferencia se ejecuta en segundo plano (ver utils/ai/tareas.py), por
+        lo que la promoción se devuelve con estatus_categorizacion='pendiente'.
+
+        Si el contexto incluye 'esperar_subida' (imagen subiéndose en paralelo,
+        ver utils/imagenes/imagenes.py), la subida se espera después de
+        confirmar el INSERT, sin mantener la transacción abierta; si falla, la
+        promoción se elimina y el error se propaga. La categorización se encola
+        hasta que la imagen está arriba, así que no queda trabajo pendiente
+        sobre una promoción eliminada.
+        """
+        negocio = validated_data.pop("id_negocio")
         tipo = validated_data.pop("_tipo")
         validated_data.setdefault("numero_canjeados", 0)
+        esperar_subida = self.context.get("esperar_subida")
 
         with transaction.atomic():
             promocion = Promocion.objects.create(
                 id_negocio=negocio,
                 tipo=tipo,
+                estatus_categorizacion="pendiente",
                 **validated_data,
             )
+            if not esperar_subida:
+                encolar_categorizacion(promocion)
 
-            categorias_ai = infer_promocion_fields(
-                nombre=promocion.nombre,
-                descripcion=promocion.descripcion,
-            )
-            for cat_id in categorias_ai:
-                PromocionCategoria.objects.create(
-                    id_promocion=promocion,
-                    id_categoria_id=cat_id
-                )
+        if esperar_subida:
+            try:
+                esperar_subida()
+            except Exception:
+                Promocion.objects.filter(pk=promocion.pk).delete()
+                raise
+            encolar_categorizacion(promocion)
 
         return promocion
 
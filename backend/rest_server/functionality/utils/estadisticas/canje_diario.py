@@ -0,0 +1,100 @@
+# =============================================================================
+# Autores: Daniel Álvarez Sil y Yael Sinuhe Grajeda Martínez
+# Descripción:
+#   Mantenimiento del agregado CanjeDiario (canjes por negocio, promoción y
+#   día local). Las vistas de estadísticas suman unas cuantas filas por día
+#   en lugar de recorrer y contar la tabla 'canje', por lo que su latencia no
+#   crece con el histórico de canjes.
+#
+#   - registrar_canje(): incremento atómico (INSERT ... ON CONFLICT) dentro
+#     de la transacción que crea el Canje.
+#   - reconstruir_canje_diario(): recalcula un rango de días desde 'canje'
+#     (carga inicial, reparaciones, canjes importados por otras vías).
+# =============================================================================
+
+from datetime import date, datetime, time, timedelta
+from typing import Optional
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from functionality.models import CanjeDiario, Promocion
+from functionality.utils.estadisticas.header import invalidar_metricas_header
+
+
+# =============================================================================
+# Función: fecha_local
+# Descripción:
+#   Día calendario (TIME_ZONE) al que pertenece un instante.
+# =============================================================================
+def fecha_local(instante: datetime) -> date:
+    """Convierte un datetime con zona horaria al día local."""
+    return timezone.localtime(instante).date()
+
+
+# =============================================================================
+# Función: registrar_canje
+# Descripción:
+#   Suma un canje al día correspondiente. Debe llamarse dentro de la misma
+#   transacción que crea el Canje para que el agregado no se desfase.
+# =============================================================================
+def registrar_canje(promocion: Promocion, fecha_creado: datetime) -> None:
+    """Incrementa (o crea) la fila (negocio, promoción, día) del agregado."""
+    if promocion.id_negocio_id is None:
+        return  # Las estadísticas solo consideran promociones con negocio
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            INSERT INTO {CanjeDiario._meta.db_table} (id_negocio, id_promocion, fecha, canjes)
+            VALUES (%s, %s, %s, 1)
+            ON CONFLICT (id_negocio, id_promocion, fecha)
+            DO UPDATE SET canjes = {CanjeDiario._meta.db_table}.canjes + 1
+            """,
+            [promocion.id_negocio_id, promocion.id, fecha_local(fecha_creado)],
+        )
+
+
+# =============================================================================
+# Función: reconstruir_canje_diario
+# Descripción:
+#   Recalcula el agregado desde 'canje' para el rango [desde, hasta] (días
+#   locales, ambos opcionales). Bloquea las escrituras al agregado mientras
+#   tanto: los canjes concurrentes esperan y se suman después, sin perderse
+#   ni contarse dos veces.
+# =============================================================================
+def reconstruir_canje_diario(desde: Optional[date] = None, hasta: Optional[date] = None) -> int:
+    """Devuelve el número de filas (negocio, promoción, día) generadas."""
+    tabla = CanjeDiario._meta.db_table
+    zona = timezone.get_current_timezone()
+    filtro_dias, filtro_canjes, parametros_dias, parametros_canjes = ["TRUE"], ["TRUE"], [], []
+    if desde:
+        filtro_dias.append("fecha >= %s")
+        parametros_dias.append(desde)
+        filtro_canjes.append("c.fecha_creado >= %s")
+        parametros_canjes.append(datetime.combine(desde, time.min, tzinfo=zona))
+    if hasta:
+        filtro_dias.append("fecha <= %s")
+        parametros_dias.append(hasta)
+        filtro_canjes.append("c.fecha_creado < %s")
+        parametros_canjes.append(datetime.combine(hasta + timedelta(days=1), time.min, tzinfo=zona))
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f"LOCK TABLE {tabla} IN SHARE ROW EXCLUSIVE MODE")
+        cursor.execute(f"DELETE FROM {tabla} WHERE {' AND '.join(filtro_dias)}", parametros_dias)
+        cursor.execute(
+            f"""
+            INSERT INTO {tabla} (id_negocio, id_promocion, fecha, canjes)
+            SELECT p.id_negocio, c.id_promocion, (c.fecha_creado AT TIME ZONE %s)::date, COUNT(*)
+            FROM canje c
+            JOIN promocion p ON p.id = c.id_promocion
+            WHERE p.id_negocio IS NOT NULL AND {' AND '.join(filtro_canjes)}
+            GROUP BY 1, 2, 3
+            """,
+            [settings.TIME_ZONE, *parametros_canjes],
+        )
+        filas = cursor.rowcount
+        # SQL directo, sin señales: las métricas del encabezado leen este agregado
+        invalidar_metricas_header()
+        return filas
@@ -0,0 +1,184 @@
+# =============================================================================
+# Autores: Daniel Álvarez Sil y Yael Sinuhe Grajeda Martínez
+# Descripción:
+#   Exportación de datos crudos (canjes, promociones, negocios) en CSV o
+#   JSONL, generada por bloques para enviarse con StreamingHttpResponse o
+#   escribirse a un archivo desde un comando.
+#
+#   Cada exportación es una sola consulta con values_list() (los datos de
+#   promoción, negocio, cajero y usuario llegan por JOIN, sin consultas por
+#   fila) recorrida con .iterator(chunk_size=EXPORTACION_CHUNK): en Postgres
+#   usa un cursor del lado del servidor, así que la memoria no depende del
+#   número de filas exportadas.
+#
+#   De los usuarios solo se exportan datos demográficos (género, nacimiento,
+#   cp, municipio, estado); nunca nombre, contacto, CURP ni contraseña.
+# =============================================================================
+
+import csv
+import io
+from datetime import date, datetime, time, timedelta
+from typing import Iterator, NamedTuple, Optional
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+
+from functionality.models import Canje, Negocio, Promocion
+
+
+class Exportacion(NamedTuple):
+    modelo: type
+    # (nombre de la columna, lookup para values_list)
+    columnas: tuple[tuple[str, str], ...]
+    # Lookups para los filtros opcionales
+    campo_fecha: str
+    campo_negocio: str
+
+
+EXPORTACIONES = {
+    "canjes": Exportacion(
+        modelo=Canje,
+        columnas=(
+            ("id", "id"),
+            ("fecha_creado", "fecha_creado"),
+            ("id_promocion", "id_promocion_id"),
+            ("promocion", "id_promocion__nombre"),
+            ("promocion_tipo", "id_promocion__tipo"),
+            ("id_negocio", "id_promocion__id_negocio_id"),
+            ("negocio", "id_promocion__id_negocio__nombre"),
+            ("id_cajero", "id_cajero_id"),
+            ("cajero", "id_cajero__nombre"),
+            ("id_usuario", "id_usuario_id"),
+            ("usuario_genero", "id_usuario__genero"),
+            ("usuario_nacimiento", "id_usuario__nacimiento"),
+            ("usuario_cp", "id_usuario__cp"),
+            ("usuario_municipio", "id_usuario__municipio"),
+            ("usuario_estado", "id_usuario__estado"),
+        ),
+        campo_fecha="fecha_creado",
+        campo_negocio="id_promocion__id_negocio_id",
+    ),
+    "promociones": Exportacion(
+        modelo=Promocion,
+        columnas=(
+            ("id", "id"),
+            ("id_negocio", "id_negocio_id"),
+            ("negocio", "id_negocio__nombre"),
+            ("nombre", "nombre"),
+            ("tipo", "tipo"),
+            ("porcentaje", "porcentaje"),
+            ("precio", "precio"),
+            ("fecha_inicio", "fecha_inicio"),
+            ("fecha_fin", "fecha_fin"),
+            ("activo", "activo"),
+            ("numero_canjeados", "numero_canjeados"),
+            ("limite_por_usuario", "limite_por_usuario"),
+            ("limite_total", "limite_total"),
+            ("riesgo", "riesgo"),
+            ("estatus_categorizacion", "estatus_categorizacion"),
+            ("fecha_creado", "fecha_creado"),
+        ),
+        # fecha_creado de Promocion es auto_now (última modificación)
+        campo_fecha="fecha_inicio",
+        campo_negocio="id_negocio_id",
+    ),
+    "negocios": Exportacion(
+        modelo=Negocio,
+        columnas=(
+            ("id", "id"),
+            ("nombre", "nombre"),
+            ("correo", "correo"),
+            ("telefono", "telefono"),
+            ("rfc", "rfc"),
+            ("sitio_web", "sitio_web"),
+            ("estatus", "estatus"),
+            ("cp", "cp"),
+            ("colonia", "colonia"),
+            ("municipio", "municipio"),
+            ("estado", "estado"),
+            ("fecha_creado", "fecha_creado"),
+        ),
+        campo_fecha="fecha_creado",
+        campo_negocio="id",
+    ),
+}
+
+FORMATOS = {
+    # formato: (content type, extensión)
+    "csv": ("text/csv; charset=utf-8", "csv"),
+    "jsonl": ("application/x-ndjson; charset=utf-8", "jsonl"),
+}
+
+# Tamaño aproximado de cada bloque enviado al cliente o al archivo
+TAMANO_BLOQUE = 64 * 1024
+
+
+# =============================================================================
+# Función: filas_exportacion
+# Descripción:
+#   Recorre las filas de una exportación con un cursor del lado del servidor.
+#   'desde' y 'hasta' son días locales (TIME_ZONE), ambos incluidos.
+# =============================================================================
+def filas_exportacion(tipo: str, desde: Optional[date] = None, hasta: Optional[date] = None,
+                      id_negocio: Optional[int] = None) -> Iterator[tuple]:
+    """Tuplas en el orden de EXPORTACIONES[tipo].columnas, ordenadas por id."""
+    exportacion = EXPORTACIONES[tipo]
+    zona = timezone.get_current_timezone()
+    filtros = {}
+    if desde:
+        filtros[f"{exportacion.campo_fecha}__gte"] = datetime.combine(desde, time.min, tzinfo=zona)
+    if hasta:
+        filtros[f"{exportacion.campo_fecha}__lt"] = datetime.combine(hasta + timedelta(days=1), time.min, tzinfo=zona)
+    if id_negocio is not None:
+        filtros[exportacion.campo_negocio] = id_negocio
+
+    consulta = (
+        exportacion.modelo.objects
+        .filter(**filtros)
+        .order_by("id")
+        .values_list(*(lookup for _, lookup in exportacion.columnas))
+    )
+    return consulta.iterator(chunk_size=getattr(settings, "EXPORTACION_CHUNK", 2000))
+
+
+def _valor(valor):
+    """Instantes en hora local; el resto sin cambios."""
+    if isinstance(valor, datetime):
+        return timezone.localtime(valor).isoformat()
+    return valor
+
+
+# =============================================================================
+# Función: generar_exportacion
+# Descripción:
+#   Serializa las filas en CSV (con encabezado) o JSONL y las agrupa en
+#   bloques de bytes de ~TAMANO_BLOQUE para no escribir fila por fila.
+# =============================================================================
+def generar_exportacion(tipo: str, formato: str = "csv", **filtros) -> Iterator[bytes]:
+    """Genera el contenido del archivo por bloques (UTF-8)."""
+    nombres = [nombre for nombre, _ in EXPORTACIONES[tipo].columnas]
+    filas = filas_exportacion(tipo, **filtros)
+    buffer = io.StringIO()
+
+    if formato == "csv":
+        escritor = csv.writer(buffer)
+        escritor.writerow(nombres)
+        escribir = lambda fila: escritor.writerow([_valor(v) for v in fila])
+    elif formato == "jsonl":
+        codificador = DjangoJSONEncoder(ensure_ascii=False)
+        escribir = lambda fila: buffer.write(
+            codificador.encode(dict(zip(nombres, map(_valor, fila)))) + "\n"
+        )
+    else:
+        raise ValueError(f"Formato desconocido: {formato!r}.")
+
+    for fila in filas:
+        escribir(fila)
+        if buffer.tell() >= TAMANO_BLOQUE:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
@@ -0,0 +1,141 @@
+# =============================================================================
+# Autores: Daniel Álvarez Sil y Yael Sinuhe Grajeda Martínez
+# Descripción:
+#   Métricas del encabezado del panel de administración, calculadas en una
+#   sola consulta (CTEs sobre promocion, canje_diario y negocio) y guardadas
+#   en el caché de Django durante ESTADISTICAS_CACHE_SEGUNDOS:
+#     - promociones por negocio creadas del mes anterior al actual,
+#     - canjes por negocio en esa misma ventana y en el mes actual,
+#     - promociones activas por negocio,
+#     - total de colaboradores (negocios).
+#
+#   EstadisticasHeaderView y los cuatro endpoints individuales leen de aquí.
+#   Como en utils/ai/categorias.py, la entrada se indexa por una versión que
+#   las señales de Promocion, Negocio y Canje renuevan al confirmar la
+#   transacción (ver FunctionalityConfig.ready).
+# =============================================================================
+
+import uuid
+from datetime import date, datetime, time
+
+from dateutil.relativedelta import relativedelta
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.utils import timezone
+
+
+CLAVE_VERSION = "estadisticas:header:version"
+
+_CONSULTA = """
+    WITH promociones_mes AS (
+        SELECT id_negocio, COUNT(*) AS total
+        FROM promocion
+        WHERE id_negocio IS NOT NULL
+          AND fecha_creado >= %(inicio)s AND fecha_creado < %(fin)s
+        GROUP BY id_negocio
+    ), promociones_activas AS (
+        SELECT id_negocio, COUNT(*) AS total
+        FROM promocion
+        WHERE activo
+        GROUP BY id_negocio
+    ), canjes AS (
+        SELECT id_negocio,
+               SUM(canjes) AS ventana,
+               SUM(canjes) FILTER (WHERE fecha >= %(inicio_mes_actual)s) AS mes_actual
+        FROM canje_diario
+        WHERE fecha >= %(inicio_fecha)s AND fecha < %(fin_fecha)s
+        GROUP BY id_negocio
+    ), negocios AS (
+        SELECT id_negocio FROM promociones_mes
+        UNION SELECT id_negocio FROM promociones_activas
+        UNION SELECT id_negocio FROM canjes
+    )
+    SELECT (SELECT COUNT(*) FROM negocio) AS total_colaboradores,
+           n.id_negocio, neg.nombre, pm.total, pa.total, c.ventana, c.mes_actual
+    FROM (SELECT 1) AS base
+    LEFT JOIN negocios n ON TRUE
+    LEFT JOIN negocio neg ON neg.id = n.id_negocio
+    LEFT JOIN promociones_mes pm ON pm.id_negocio = n.id_negocio
+    LEFT JOIN promociones_activas pa ON pa.id_negocio IS NOT DISTINCT FROM n.id_negocio
+    LEFT JOIN canjes c ON c.id_negocio = n.id_negocio
+"""
+
+
+def _version() -> str:
+    """Obtiene (o inicializa) el token de versión en el caché de Django."""
+    version = cache.get(CLAVE_VERSION)
+    if version is None:
+        cache.add(CLAVE_VERSION, uuid.uuid4().hex, timeout=None)
+        version = cache.get(CLAVE_VERSION, "")
+    return version
+
+
+# =============================================================================
+# Función: invalidar_metricas_header
+# Descripción:
+#   Receptor de señales: renueva la versión al confirmar la transacción (si se
+#   hiciera antes, otra petición podría volver a guardar los datos viejos).
+# =============================================================================
+def invalidar_metricas_header(**kwargs) -> None:
+    """Marca como obsoletas las métricas del encabezado en caché."""
+    transaction.on_commit(lambda: cache.set(CLAVE_VERSION, uuid.uuid4().hex, timeout=None))
+
+
+def _ventana() -> tuple[date, date, date]:
+    """(inicio del mes anterior, inicio del mes actual, inicio del mes siguiente) en hora local."""
+    mes_actual = timezone.localdate().replace(day=1)
+    return mes_actual - relativedelta(months=1), mes_actual, mes_actual + relativedelta(months=1)
+
+
+# =============================================================================
+# Función: calcular_metricas_header
+# Descripción:
+#   Ejecuta la consulta única y arma los diccionarios por nombre de negocio.
+# =============================================================================
+def calcular_metricas_header() -> dict:
+    """Calcula las métricas sin pasar por el caché."""
+    inicio, inicio_mes_actual, fin = _ventana()
+    zona = timezone.get_current_timezone()
+    with connection.cursor() as cursor:
+        cursor.execute(_CONSULTA, {
+            # promocion.fecha_creado es timestamp: límites a medianoche local
+            "inicio": datetime.combine(inicio, time.min, tzinfo=zona),
+            "fin": datetime.combine(fin, time.min, tzinfo=zona),
+            # canje_diario.fecha ya es el día local
+            "inicio_fecha": inicio,
+            "fin_fecha": fin,
+            "inicio_mes_actual": inicio_mes_actual,
+        })
+        filas = cursor.fetchall()
+
+    total_colaboradores = filas[0][0] if filas else 0
+
+    def por_nombre(columna, orden=None):
+        seleccion = [(f[2], f[columna]) for f in filas if f[columna]]
+        if orden:
+            seleccion.sort(key=orden)
+        return {nombre: int(total) for nombre, total in seleccion}
+
+    return {
+        "promociones_por_negocio_ultimo_mes": por_nombre(3),
+        "canjes_por_negocio_ultimo_mes": por_nombre(5),
+        "canjes_por_negocio_mes_actual": por_nombre(6, orden=lambda v: -v[1]),
+        "promociones_activas_por_negocio": por_nombre(4, orden=lambda v: (v[0] is None, v[0] or "")),
+        "total_colaboradores": total_colaboradores,
+    }
+
+
+# =============================================================================
+# Función: metricas_header
+# Descripción:
+#   Devuelve las métricas desde el caché o las calcula y las guarda.
+# =============================================================================
+def metricas_header() -> dict:
+    """Métricas del encabezado (compartidas por los cinco endpoints)."""
+    clave = f"estadisticas:header:{_version()}:{_ventana()[1].isoformat()}"
+    metricas = cache.get(clave)
+    if metricas is None:
+        metricas = calcular_metricas_header()
+        cache.set(clave, metricas, timeout=getattr(settings, "ESTADISTICAS_CACHE_SEGUNDOS", 60))
+    return metricas
@@ -0,0 +1,53 @@
+# =============================================================================
+# Autores: Daniel Álvarez Sil y Yael Sinuhe Grajeda Martínez
+# Descripción:
+#   Refresco de la vista materializada 'resumen_negocio' (modelo
+#   ResumenNegocio), que precalcula por negocio el administrador principal,
+#   el número de promociones y los canjes (desde el agregado canje_diario).
+#   NegociosResumenView la lee con un JOIN por clave primaria en lugar de
+#   subconsultas correlacionadas y conteos sobre promocion × canje.
+#
+#   Con CONCURRENTLY, Postgres recalcula en segundo plano y aplica solo las
+#   diferencias, sin bloquear las lecturas del endpoint. Ejecutar
+#   periódicamente (p. ej. cada 5 minutos):
+#
+#       python manage.py refrescar_resumen_negocios
+# =============================================================================
+
+import time
+from datetime import datetime
+from typing import Optional
+
+from django.db import connection
+from django.db.models import Max
+
+from functionality.models import ResumenNegocio
+
+
+# =============================================================================
+# Función: refrescar_resumen_negocios
+# Descripción:
+#   Recalcula la vista materializada y devuelve la duración en segundos.
+# =============================================================================
+def refrescar_resumen_negocios(concurrente: bool = True) -> float:
+    """
+    Parámetros:
+        concurrente (bool): REFRESH ... CONCURRENTLY (no bloquea lecturas,
+            requiere el índice único). Sin él es más rápido pero bloquea el
+            endpoint durante el refresco.
+    """
+    inicio = time.perf_counter()
+    with connection.cursor() as cursor:
+        modo = "CONCURRENTLY " if concurrente else ""
+        cursor.execute(f"REFRESH MATERIALIZED VIEW {modo}{ResumenNegocio._meta.db_table}")
+    return time.perf_counter() - inicio
+
+
+# =============================================================================
+# Función: resumen_actualizado
+# Descripción:
+#   Momento en que se calculó la vista (lo informa el comando de refresco).
+# =============================================================================
+def resumen_actualizado() -> Optional[datetime]:
+    """Momento del último refresco (None si la vista está vacía)."""
+    return ResumenNegocio.objects.aggregate(ultimo=Max("actualizado"))["ultimo"]
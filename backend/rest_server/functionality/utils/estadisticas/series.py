@@ -0,0 +1,226 @@
+# =============================================================================
+# Autores: Daniel Álvarez Sil y Yael Sinuhe Grajeda Martínez
+# Descripción:
+#   Series de tiempo de canjes con rango, granularidad (hora, día, semana,
+#   mes), agrupación (negocio, promoción, categoría, cajero o total) y zona
+#   horaria arbitrarios. Los buckets se generan en SQL con generate_series y
+#   date_trunc, de modo que los periodos sin canjes aparecen con 0.
+#
+#   Fuente de datos:
+#     - canje_diario (agregado diario) cuando la granularidad es de un día o
+#       más, el rango cae en medianoches, la zona es TIME_ZONE y no se agrupa
+#       por cajero;
+#     - la tabla 'canje' en cualquier otro caso.
+#
+#   Presupuesto de filas: buckets × series no puede exceder
+#   ESTADISTICAS_SERIE_MAX_PUNTOS; si el rango tiene demasiados buckets se
+#   rechaza (pedir una granularidad mayor) y, si hay demasiadas series, se
+#   devuelven solo las de más canjes.
+# =============================================================================
+
+from datetime import datetime, time
+from typing import NamedTuple, Optional
+
+from dateutil.relativedelta import relativedelta
+from django.conf import settings
+from django.db import connection
+
+
+GRANULARIDADES = {
+    # nombre: (unidad de date_trunc, paso)
+    "hora": ("hour", relativedelta(hours=1)),
+    "dia": ("day", relativedelta(days=1)),
+    "semana": ("week", relativedelta(weeks=1)),
+    "mes": ("month", relativedelta(months=1)),
+}
+
+
+# Dimensión de agrupación: (columna en canje_diario, columna en canje, tabla y columna de la etiqueta)
+AGRUPACIONES = {
+    "negocio": ("cd.id_negocio", "p.id_negocio", "negocio", "nombre"),
+    "promocion": ("cd.id_promocion", "c.id_promocion", "promocion", "nombre"),
+    "categoria": ("pc.id_categoria", "pc.id_categoria", "categoria", "titulo"),
+    "cajero": (None, "c.id_cajero", "cajero", "nombre"),
+}
+
+
+class PresupuestoExcedido(ValueError):
+    """El rango pedido genera más buckets que el presupuesto de filas."""
+
+
+class SerieCanjes(NamedTuple):
+    fuente: str
+    buckets: list[datetime]
+    series: list[dict]
+    series_totales: int
+
+
+# =============================================================================
+# Función: truncar
+# Descripción:
+#   Equivalente en Python de date_trunc (semanas ISO, inician en lunes).
+# =============================================================================
+def truncar(instante: datetime, granularidad: str) -> datetime:
+    if granularidad == "hora":
+        return instante.replace(minute=0, second=0, microsecond=0)
+    dia = datetime.combine(instante.date(), time.min)
+    if granularidad == "semana":
+        return dia - relativedelta(days=dia.weekday())
+    if granularidad == "mes":
+        return dia.replace(day=1)
+    return dia
+
+
+def listar_buckets(desde: datetime, hasta: datetime, granularidad: str, maximo: int) -> list[datetime]:
+    """Inicios de los buckets de [desde, hasta); se detiene al pasar 'maximo'."""
+    paso = GRANULARIDADES[granularidad][1]
+    bucket, buckets = truncar(desde, granularidad), []
+    while bucket < hasta and len(buckets) <= maximo:
+        buckets.append(bucket)
+        bucket += paso
+    return buckets
+
+
+def _usa_agregado(desde: datetime, hasta: datetime, granularidad: str, agrupar: Optional[str], zona: str) -> bool:
+    return (
+        granularidad != "hora"
+        and zona == settings.TIME_ZONE
+        and desde.time() == time.min and hasta.time() == time.min
+        and (agrupar is None or AGRUPACIONES[agrupar][0] is not None)
+    )
+
+
+# =============================================================================
+# Función: serie_canjes
+# Descripción:
+#   Ejecuta la consulta de la serie y arma el resultado por grupo.
+# =============================================================================
+def serie_canjes(desde: datetime, hasta: datetime, granularidad: str = "dia",
+                 agrupar: Optional[str] = None, zona: Optional[str] = None,
+                 id_negocio: Optional[int] = None, id_promocion: Optional[int] = None,
+                 max_series: int = 10) -> SerieCanjes:
+    """
+    Parámetros:
+        desde, hasta (datetime): Rango [desde, hasta) en hora local de 'zona'
+            (sin tzinfo).
+        granularidad (str): "hora" | "dia" | "semana" | "mes".
+        agrupar (str | None): "negocio" | "promocion" | "categoria" | "cajero";
+            None devuelve una sola serie con el total.
+        zona (str | None): Zona horaria IANA; por defecto TIME_ZONE.
+        max_series (int): Máximo de series (las de más canjes).
+
+    Lanza:
+        PresupuestoExcedido: El rango tiene más buckets que el presupuesto.
+    """
+    zona = zona or settings.TIME_ZONE
+    presupuesto = getattr(settings, "ESTADISTICAS_SERIE_MAX_PUNTOS", 5000)
+    buckets = listar_buckets(desde, hasta, granularidad, presupuesto)
+    if len(buckets) > presupuesto:
+        raise PresupuestoExcedido(
+            f"El rango genera más de {presupuesto} periodos con granularidad '{granularidad}'; "
+            "use una granularidad mayor o un rango menor."
+        )
+    max_series = max(1, min(max_series, presupuesto // max(1, len(buckets))))
+
+    unidad = GRANULARIDADES[granularidad][0]
+    agregado = _usa_agregado(desde, hasta, granularidad, agrupar, zona)
+    parametros = {
+        "unidad": unidad,
+        "paso": f"1 {unidad}",
+        "desde": desde,
+        "hasta": hasta,
+        "zona": zona,
+        "max_series": max_series,
+    }
+
+    if agregado:
+        bucket = "date_trunc(%(unidad)s, cd.fecha::timestamp)"
+        origen = "canje_diario cd"
+        valor = "SUM(cd.canjes)"
+        filtros = ["cd.fecha >= %(desde)s::date", "cd.fecha < %(hasta)s::date"]
+        col_negocio, col_promocion = "cd.id_negocio", "cd.id_promocion"
+    else:
+        bucket = "date_trunc(%(unidad)s, c.fecha_creado AT TIME ZONE %(zona)s)"
+        origen = "canje c JOIN promocion p ON p.id = c.id_promocion"
+        valor = "COUNT(*)"
+        # Límites locales convertidos a instantes para usar el índice de fecha_creado
+        filtros = [
+            "c.fecha_creado >= (%(desde)s::timestamp AT TIME ZONE %(zona)s)",
+            "c.fecha_creado < (%(hasta)s::timestamp AT TIME ZONE %(zona)s)",
+        ]
+        col_negocio, col_promocion = "p.id_negocio", "c.id_promocion"
+
+    if id_negocio is not None:
+        filtros.append(f"{col_negocio} = %(id_negocio)s")
+        parametros["id_negocio"] = id_negocio
+    if id_promocion is not None:
+        filtros.append(f"{col_promocion} = %(id_promocion)s")
+        parametros["id_promocion"] = id_promocion
+
+    if agrupar:
+        col_agregado, col_canje, tabla_etiqueta, col_etiqueta = AGRUPACIONES[agrupar]
+        grupo = col_agregado if agregado else col_canje
+        if agrupar == "categoria":
+            # Una promoción con varias categorías cuenta en cada una
+            origen += f" JOIN promocion_categoria pc ON pc.id_promocion = {col_promocion}"
+        grupos = """
+            SELECT grupo, SUM(canjes) AS total, COUNT(*) OVER () AS series_totales
+            FROM hechos
+            WHERE grupo IS NOT NULL
+            GROUP BY grupo
+            ORDER BY total DESC, grupo
+            LIMIT %(max_series)s
+        """
+        etiqueta = f"LEFT JOIN {tabla_etiqueta} e ON e.id = g.grupo"
+        col_nombre = f"e.{col_etiqueta}"
+    else:
+        grupo = "0"
+        grupos = "SELECT 0 AS grupo, COALESCE((SELECT SUM(canjes) FROM hechos), 0) AS total, 1 AS series_totales"
+        etiqueta, col_nombre = "", "'total'"
+
+    consulta = f"""
+        WITH hechos AS (
+            SELECT {bucket} AS bucket, {grupo} AS grupo, {valor} AS canjes
+            FROM {origen}
+            WHERE {' AND '.join(filtros)}
+            GROUP BY 1, 2
+        ), grupos AS ({grupos}
+        ), buckets AS (
+            SELECT generate_series(
+                date_trunc(%(unidad)s, %(desde)s::timestamp),
+                %(hasta)s::timestamp - interval '1 microsecond',
+                %(paso)s::interval
+            ) AS bucket
+        )
+        SELECT g.grupo, {col_nombre}, g.total, g.series_totales, b.bucket, COALESCE(h.canjes, 0)
+        FROM grupos g
+        {etiqueta}
+        CROSS JOIN buckets b
+        LEFT JOIN hechos h ON h.grupo = g.grupo AND h.bucket = b.bucket
+        ORDER BY g.total DESC, g.grupo, b.bucket
+    """
+
+    with connection.cursor() as cursor:
+        cursor.execute(consulta, parametros)
+        filas = cursor.fetchall()
+
+    # Las filas vienen ordenadas por serie y bucket (los mismos de 'buckets')
+    series, series_totales = {}, 0
+    for id_grupo, nombre, total, totales, _, canjes in filas:
+        series_totales = totales
+        serie = series.get(id_grupo)
+        if serie is None:
+            serie = series[id_grupo] = {
+                "id": id_grupo if agrupar else None,
+                "nombre": nombre,
+                "total": int(total),
+                "valores": [],
+            }
+        serie["valores"].append(int(canjes))
+
+    return SerieCanjes(
+        fuente="canje_diario" if agregado else "canje",
+        buckets=buckets,
+        series=list(series.values()),
+        series_totales=series_totales,
+    )
@@ -0,0 +1,368 @@
+# =============================================================================
+# Autores: Daniel Álvarez Sil y Yael Sinuhe Grajeda Martínez
+# Descripción:
+#   Interfaz de almacenamiento de archivos multimedia (imágenes de promociones
+#   y logos) con dos implementaciones, elegidas con IMAGENES_BACKEND:
+#     - "s3": bucket de Amazon S3 (o compatible, ver AWS_S3_ENDPOINT_URL).
+#     - "local": directorio MEDIA_ROOT, servido en MEDIA_URL por una ruta
+#       estática (rest_server/urls.py) o por el servidor web frontal.
+#
+#   Todo el flujo de imágenes (subidas, variantes, subida directa y limpieza
+#   de huérfanos) usa esta interfaz, de modo que desarrollo, CI y pruebas de
+#   rendimiento funcionan sin red ni credenciales de AWS.
+# =============================================================================
+
+import os
+import shutil
+from abc import ABC, abstractmethod
+import tempfile
+import threading
+import mimetypes
+from datetime import datetime, timezone as dt_timezone
+from pathlib import Path
+from typing import BinaryIO, Iterator, NamedTuple, Optional
+
+from django.conf import settings
+
+
+# =============================================================================
+# Clase: ErrorAlmacenamiento
+# Descripción:
+#   Error de cualquier backend (red, permisos, disco) al operar un archivo.
+# =============================================================================
+class ErrorAlmacenamiento(Exception):
+    """La operación sobre el almacenamiento falló."""
+
+
+class SubidaDirectaNoSoportada(ErrorAlmacenamiento):
+    """El backend no admite subidas directas del cliente (configuración)."""
+
+
+class ObjetoAlmacenado(NamedTuple):
+    key: str
+    tamano: int
+    content_type: Optional[str]
+    modificado: datetime
+
+
+# =============================================================================
+# Clase: AlmacenamientoMedia
+# Descripción:
+#   Operaciones que el flujo de imágenes necesita de un backend.
+# =============================================================================
+class AlmacenamientoMedia(ABC):
+    """Backend de almacenamiento de archivos multimedia."""
+    nombre = "base"
+
+    @abstractmethod
+    def existe(self, key: str) -> bool:
+        """Indica si el objeto existe."""
+
+    @abstractmethod
+    def info(self, key: str) -> Optional[ObjetoAlmacenado]:
+        """Metadatos del objeto o None si no existe."""
+
+    @abstractmethod
+    def renovar(self, key: str) -> bool:
+        """
+        Actualiza la fecha de modificación de un objeto existente (al
+        reutilizarlo por deduplicación, para que el limpiador de huérfanos lo
+        trate como recién subido). Devuelve False si no existe.
+        """
+
+    @abstractmethod
+    def subir(self, f: BinaryIO, key: str, content_type: str) -> None:
+        """Guarda el archivo leyéndolo en streaming desde el inicio."""
+
+    @abstractmethod
+    def subir_bytes(self, contenido: bytes, key: str, content_type: str,
+                    cache_control: Optional[str] = None) -> None:
+        """Guarda contenido ya en memoria (p. ej. variantes)."""
+
+    @abstractmethod
+    def abrir(self, key: str) -> BinaryIO:
+        """Devuelve un archivo de solo lectura con el contenido (cerrarlo al terminar)."""
+
+    @abstractmethod
+    def listar(self, prefijo: str) -> Iterator[ObjetoAlmacenado]:
+        """Recorre los objetos bajo 'prefijo'."""
+
+    @abstractmethod
+    def eliminar(self, keys: list[str]) -> list[str]:
+        """Elimina las keys y devuelve los mensajes de error (vacío si todo salió bien)."""
+
+    def firmar_subida(self, key: str, content_type: str, tamano_maximo: int, expira: int) -> dict:
+        """Datos de una subida directa del cliente: {'url', 'fields'}."""
+        raise SubidaDirectaNoSoportada(
+            f"El backend '{self.nombre}' no admite subidas directas; use las vistas de subida multipart."
+        )
+
+    def url(self, key: str) -> str:
+        return f"{settings.MEDIA_URL}{key}"
+
+
+# =============================================================================
+# Clase: AlmacenamientoS3
+# Descripción:
+#   Backend sobre el cliente S3 compartido (utils/imagenes/s3.py).
+# =============================================================================
+class AlmacenamientoS3(AlmacenamientoMedia):
+    """Archivos en un bucket de S3."""
+    nombre = "s3"
+
+    def __init__(self):
+        from functionality.utils.imagenes.s3 import configuracion_s3, obtener_cliente_s3
+
+        self.bucket, self.region, self.custom_domain = configuracion_s3()
+        if not self.bucket:
+            raise ErrorAlmacenamiento(
+                "Falta el nombre del bucket (defina AWS_STORAGE_BUCKET_NAME o S3_BUCKET_NAME)."
+            )
+        self.s3 = obtener_cliente_s3()
+
+    def _errores(self):
+        from boto3.exceptions import S3UploadFailedError
+        from botocore.exceptions import BotoCoreError, ClientError
+        return (ClientError, BotoCoreError, S3UploadFailedError)
+
+    def info(self, key):
+        from botocore.exceptions import ClientError
+        try:
+            cabecera = self.s3.head_object(Bucket=self.bucket, Key=key)
+        except ClientError as e:
+            # Sin permiso s3:ListBucket, S3 responde 403 (no 404) a objetos inexistentes
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound", "403", "Forbidden"):
+                return None
+            raise ErrorAlmacenamiento(str(e)) from e
+        return ObjetoAlmacenado(key, cabecera.get("ContentLength", 0), cabecera.get("ContentType"),
+                                cabecera.get("LastModified"))
+
+    def existe(self, key):
+        return self.info(key) is not None
+
+    def renovar(self, key):
+        from botocore.exceptions import ClientError
+        try:
+            cabecera = self.s3.head_object(Bucket=self.bucket, Key=key)
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound", "403", "Forbidden"):
+                return False
+            raise ErrorAlmacenamiento(str(e)) from e
+        # Copia sobre sí mismo: S3 la permite solo reemplazando los metadatos
+        extra = {"CacheControl": cabecera["CacheControl"]} if cabecera.get("CacheControl") else {}
+        try:
+            self.s3.copy_object(
+                Bucket=self.bucket, Key=key,
+                CopySource={"Bucket": self.bucket, "Key": key},
+                MetadataDirective="REPLACE",
+                ContentType=cabecera.get("ContentType") or "application/octet-stream",
+                Metadata=cabecera.get("Metadata", {}),
+                **extra,
+            )
+        except self._errores() as e:
+            raise ErrorAlmacenamiento(str(e)) from e
+        return True
+
+    def subir(self, f, key, content_type):
+        from functionality.utils.imagenes.s3 import configuracion_transferencia
+        try:
+            f.seek(0)
+            # Multipart en paralelo para archivos grandes (memoria acotada)
+            self.s3.upload_fileobj(
+                f, self.bucket, key,
+                ExtraArgs={"ContentType": content_type},
+                Config=configuracion_transferencia(),
+            )
+        except self._errores() as e:
+            raise ErrorAlmacenamiento(str(e)) from e
+
+    def subir_bytes(self, contenido, key, content_type, cache_control=None):
+        extra = {"CacheControl": cache_control} if cache_control else {}
+        try:
+            self.s3.put_object(Body=contenido, Bucket=self.bucket, Key=key, ContentType=content_type, **extra)
+        except self._errores() as e:
+            raise ErrorAlmacenamiento(str(e)) from e
+
+    def abrir(self, key):
+        from functionality.utils.imagenes.s3 import configuracion_transferencia
+        # En memoria hasta 8 MB y en disco a partir de ahí
+        archivo = tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024)
+        try:
+            self.s3.download_fileobj(self.bucket, key, archivo, Config=configuracion_transferencia())
+        except self._errores() as e:
+            archivo.close()
+            raise ErrorAlmacenamiento(str(e)) from e
+        archivo.seek(0)
+        return archivo
+
+    def listar(self, prefijo):
+        paginador = self.s3.get_paginator("list_objects_v2")
+        try:
+            for pagina in paginador.paginate(Bucket=self.bucket, Prefix=prefijo):
+                for objeto in pagina.get("Contents", []):
+                    yield ObjetoAlmacenado(objeto["Key"], objeto.get("Size", 0), None, objeto["LastModified"])
+        except self._errores() as e:
+            raise ErrorAlmacenamiento(str(e)) from e
+
+    def eliminar(self, keys):
+        errores = []
+        for i in range(0, len(keys), 1000):  # Máximo permitido por DeleteObjects
+            try:
+                respuesta = self.s3.delete_objects(
+                    Bucket=self.bucket,
+                    Delete={"Objects": [{"Key": k} for k in keys[i:i + 1000]], "Quiet": True},
+                )
+            except self._errores() as e:
+                raise ErrorAlmacenamiento(str(e)) from e
+            errores += [f"{e.get('Key')}: {e.get('Message')}" for e in respuesta.get("Errors", [])]
+        return errores
+
+    def firmar_subida(self, key, content_type, tamano_maximo, expira):
+        try:
+            firmado = self.s3.generate_presigned_post(
+                Bucket=self.bucket,
+                Key=key,
+                Fields={"Content-Type": content_type},
+                Conditions=[
+                    {"Content-Type": content_type},
+                    ["content-length-range", 1, tamano_maximo],
+                ],
+                ExpiresIn=expira,
+            )
+        except self._errores() as e:
+            raise ErrorAlmacenamiento(str(e)) from e
+        return {"url": firmado["url"], "fields": firmado["fields"]}
+
+    def url(self, key):
+        if self.custom_domain:
+            return f"https://{self.custom_domain}/{key}"
+        if self.region == "us-east-1":
+            return f"https://{self.bucket}.s3.amazonaws.com/{key}"
+        return f"https://{self.bucket}.s3.{self.region}.amazonaws.com/{key}"
+
+
+# =============================================================================
+# Clase: AlmacenamientoLocal
+# Descripción:
+#   Backend en disco bajo MEDIA_ROOT. Las escrituras van a un archivo
+#   temporal en el mismo directorio y se publican con os.replace (atómico),
+#   por lo que nunca se sirve un archivo a medio escribir.
+# =============================================================================
+class AlmacenamientoLocal(AlmacenamientoMedia):
+    """Archivos en el sistema de archivos local."""
+    nombre = "local"
+
+    def __init__(self, raiz=None):
+        self.raiz = Path(raiz or settings.MEDIA_ROOT).resolve()
+
+    def _ruta(self, key: str) -> Path:
+        ruta = (self.raiz / key).resolve()
+        if self.raiz not in ruta.parents:
+            raise ErrorAlmacenamiento(f"Key fuera del directorio de medios: {key!r}.")
+        return ruta
+
+    def _escribir(self, key: str, escribir) -> None:
+        ruta = self._ruta(key)
+        try:
+            ruta.parent.mkdir(parents=True, exist_ok=True)
+            fd, temporal = tempfile.mkstemp(dir=ruta.parent, prefix=".subida-")
+            try:
+                with os.fdopen(fd, "wb") as destino:
+                    escribir(destino)
+                os.chmod(temporal, 0o644)
+                os.replace(temporal, ruta)
+            except BaseException:
+                os.unlink(temporal)
+                raise
+        except OSError as e:
+            raise ErrorAlmacenamiento(str(e)) from e
+
+    def info(self, key):
+        ruta = self._ruta(key)
+        try:
+            stat = ruta.stat()
+        except FileNotFoundError:
+            return None
+        return ObjetoAlmacenado(key, stat.st_size, mimetypes.guess_type(ruta.name)[0],
+                                datetime.fromtimestamp(stat.st_mtime, tz=dt_timezone.utc))
+
+    def existe(self, key):
+        return self._ruta(key).is_file()
+
+    def renovar(self, key):
+        try:
+            os.utime(self._ruta(key))
+        except FileNotFoundError:
+            return False
+        except OSError as e:
+            raise ErrorAlmacenamiento(str(e)) from e
+        return True
+
+    def subir(self, f, key, content_type):
+        f.seek(0)
+        self._escribir(key, lambda destino: shutil.copyfileobj(f, destino, 1024 * 1024))
+
+    def subir_bytes(self, contenido, key, content_type, cache_control=None):
+        self._escribir(key, lambda destino: destino.write(contenido))
+
+    def abrir(self, key):
+        try:
+            return open(self._ruta(key), "rb")
+        except OSError as e:
+            raise ErrorAlmacenamiento(str(e)) from e
+
+    def listar(self, prefijo):
+        base = self._ruta(prefijo) if prefijo else self.raiz
+        if not base.is_dir():
+            return
+        for directorio, _, archivos in os.walk(base):
+            for nombre in archivos:
+                if nombre.startswith(".subida-"):
+                    continue
+                key = Path(directorio, nombre).relative_to(self.raiz).as_posix()
+                objeto = self.info(key)
+                if objeto:
+                    yield objeto
+
+    def eliminar(self, keys):
+        errores = []
+        for key in keys:
+            try:
+                self._ruta(key).unlink(missing_ok=True)
+            except (OSError, ErrorAlmacenamiento) as e:
+                errores.append(f"{key}: {e}")
+        return errores
+
+
+BACKENDS = {
+    "s3": AlmacenamientoS3,
+    "local": AlmacenamientoLocal,
+}
+
+_backends = {}
+_lock = threading.Lock()
+
+
+# =============================================================================
+# Función: obtener_almacenamiento
+# Descripción:
+#   Devuelve la instancia del backend configurado (una por proceso).
+# =============================================================================
+def obtener_almacenamiento(nombre: Optional[str] = None) -> AlmacenamientoMedia:
+    """
+    Parámetros:
+        nombre (Optional[str]): "s3" | "local"; por defecto IMAGENES_BACKEND.
+
+    Lanza:
+        ErrorAlmacenamiento: Backend desconocido o sin configuración.
+    """
+    nombre = nombre or getattr(settings, "IMAGENES_BACKEND", "s3")
+    backend = _backends.get(nombre)
+    if backend is None:
+        if nombre not in BACKENDS:
+            raise ErrorAlmacenamiento(f"Backend de almacenamiento desconocido: {nombre!r}.")
+        with _lock:
+            backend = _backends.get(nombre)
+            if backend is None:
+                backend = _backends[nombre] = BACKENDS[nombre]()
+    return backend
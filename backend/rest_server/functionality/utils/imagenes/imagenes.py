@@ -2,28 +2,41 @@
 # Autores: Daniel Álvarez Sil y Yael Sinuhe Grajeda Martínez
 # Descripción:
 #   Este módulo implementa vistas y utilidades para la carga (upload) de archivos
-#   a Amazon S3, permitiendo asociarlos con modelos de Promoción y Negocio.
-#   También incluye funciones auxiliares para la generación de nombres de archivo
-#   seguros, detección de MIME types y generación de URLs públicas.
+#   al almacenamiento configurado (Amazon S3 o disco local, ver
+#   almacenamiento.py), permitiendo asociarlos con modelos de Promoción y
+#   Negocio. También incluye funciones auxiliares para la generación de nombres
+#   de archivo seguros y detección de MIME types.
 # =============================================================================
 
 import os
 import uuid
+import hashlib
 import datetime
 import mimetypes
 import unicodedata
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
-import boto3
-from botocore.exceptions import ClientError
-
-from django.conf import settings
 from rest_framework.views import APIView
 from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework.response import Response
-from rest_framework.permissions import AllowAny
+from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework import status
 
+from django.conf import settings
+from django.core import signing
+from django.db import connection
+from django.db.models import Q
+
+from functionality.models import Administrador, AdministradorNegocio, Negocio, Promocion
+
+from functionality.utils.imagenes.almacenamiento import (
+    ErrorAlmacenamiento,
+    SubidaDirectaNoSoportada,
+    obtener_almacenamiento,
+)
+from functionality.utils.imagenes.variantes import descargar_original, keys_variantes, subir_variantes
+
 # Serializadores para creación de promociones y negocios
 from functionality.utils.colaboradores.serializers import (
     PromocionCreateSerializer,
@@ -70,72 +83,192 @@ def _guess_ext_and_mime(filename: str, fallback_mime: str) -> tuple[str, str]:
 
 
 # =============================================================================
-# Función: _s3_https_url
+# Función: _generar_key
 # Descripción:
-#   Genera una URL pública HTTPS para acceder a un archivo almacenado en S3.
+#   Genera una clave única y segura para un archivo dentro del prefijo dado.
 # =============================================================================
-def _s3_https_url(bucket: str, region: str, key: str, custom_domain: Optional[str] = None) -> str:
-    """Devuelve la URL HTTPS del objeto almacenado en S3."""
-    if custom_domain:
-        return f"https://{custom_domain}/{key}"
-    if region == "us-east-1":
-        return f"https://{bucket}.s3.amazonaws.com/{key}"
-    return f"https://{bucket}.s3.{region}.amazonaws.com/{key}"
+def _generar_key(filename: str, content_type: Optional[str], prefix: str) -> tuple[str, str]:
+    """Devuelve (key, tipo MIME) para el archivo."""
+    safe_title = _slugify_filename(filename or "upload")
+    ext, mime = _guess_ext_and_mime(filename or "", content_type)
+    ts = int(datetime.datetime.utcnow().timestamp())
+    return f"{prefix}{safe_title}_{ts}_{uuid.uuid4().hex}{ext}", mime
 
 
 # =============================================================================
-# Función: upload_file_to_s3
+# Función: _hash_contenido
 # Descripción:
-#   Carga un archivo al bucket configurado en AWS S3 y devuelve la clave (key)
-#   del objeto creado. En caso de error, devuelve una respuesta con el detalle.
+#   Calcula el SHA-256 del archivo leyéndolo por bloques (memoria constante).
 # =============================================================================
-def upload_file_to_s3(f, prefix) -> str:
-    """
-    Sube un archivo al bucket S3 configurado en settings.
+def _hash_contenido(f) -> str:
+    """Devuelve el hash hexadecimal del contenido y deja el archivo rebobinado."""
+    digest = hashlib.sha256()
+    f.seek(0)
+    for bloque in (f.chunks() if hasattr(f, "chunks") else iter(lambda: f.read(1024 * 1024), b"")):
+        digest.update(bloque)
+    f.seek(0)
+    return digest.hexdigest()
 
-    Parámetros:
-        f (File): Archivo recibido por multipart/form-data.
-        prefix (str): Carpeta o prefijo en el bucket (ej. 'fotos_promociones/').
 
-    Retorna:
-        str: Clave (key) generada del archivo dentro del bucket.
-    """
-    bucket = getattr(settings, "AWS_STORAGE_BUCKET_NAME", None) or os.environ.get("S3_BUCKET_NAME")
-    region = (
-        getattr(settings, "AWS_S3_REGION_NAME", None)
-        or getattr(settings, "AWS_REGION", None)
-        or os.environ.get("AWS_REGION")
-        or "us-east-1"
-    )
-    custom_domain = getattr(settings, "AWS_S3_CUSTOM_DOMAIN", None) or os.environ.get("AWS_S3_CUSTOM_DOMAIN")
+# =============================================================================
+# Función: _key_por_contenido
+# Descripción:
+#   Clave direccionada por contenido: el mismo archivo produce siempre la
+#   misma key, sin importar su nombre ni quién lo sube.
+# =============================================================================
+def _key_por_contenido(f, prefix: str) -> tuple[str, str]:
+    """Devuelve ('<prefijo><sha256><ext>', tipo MIME)."""
+    ext, mime = _guess_ext_and_mime(getattr(f, "name", ""), getattr(f, "content_type", None))
+    return f"{prefix}{_hash_contenido(f)}{ext}", mime
 
-    if not bucket:
-        return Response(
-            {"detail": "Falta el nombre del bucket (defina AWS_STORAGE_BUCKET_NAME o S3_BUCKET_NAME)."},
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        )
 
-    # Generar nombre seguro del archivo
-    safe_title = _slugify_filename(getattr(f, "name", "upload"))
-    ext, mime = _guess_ext_and_mime(getattr(f, "name", ""), getattr(f, "content_type", None))
-    ts = int(datetime.datetime.utcnow().timestamp())
-    key = f"{prefix}{safe_title}_{ts}_{uuid.uuid4().hex}{ext}"
-
-    # Carga directa a S3
-    s3 = boto3.client(
-        "s3",
-        region_name=region,
-        aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+# =============================================================================
+# Función: _preparar_key
+# Descripción:
+#   Key del archivo: direccionada por contenido (IMAGENES_DEDUPLICAR) o un
+#   nombre seguro único. En ambos casos se conoce antes de subir el archivo.
+# =============================================================================
+def _preparar_key(f, prefix: str) -> tuple[str, str]:
+    """Devuelve (key, tipo MIME)."""
+    if getattr(settings, "IMAGENES_DEDUPLICAR", True):
+        return _key_por_contenido(f, prefix)
+    return _generar_key(getattr(f, "name", "upload"), getattr(f, "content_type", None), prefix)
+
+
+# =============================================================================
+# Función: _subir_original
+# Descripción:
+#   Sube el archivo en streaming (en S3, multipart con memoria acotada) salvo
+#   que, con keys por contenido, el objeto ya exista. En ese caso se renueva
+#   su fecha de modificación: el objeto pudo quedar huérfano hace tiempo y,
+#   sin renovarla, limpiar_imagenes_huerfanas podría borrarlo aunque un
+#   registro nuevo vuelva a usarlo.
+# =============================================================================
+def _subir_original(almacenamiento, f, key: str, mime: str) -> None:
+    """Lanza ErrorAlmacenamiento si la carga falla."""
+    if getattr(settings, "IMAGENES_DEDUPLICAR", True) and almacenamiento.renovar(key):
+        print("El archivo ya existe en el almacenamiento; se reutiliza su key.")
+        return
+
+    print(f"Subiendo archivo ({almacenamiento.nombre})...")
+    almacenamiento.subir(f, key, mime)
+    print("Archivo subido correctamente.")
+
+
+# =============================================================================
+# Función: variantes_existentes
+# Descripción:
+#   Busca variantes ya generadas para la misma key en promociones o negocios.
+# =============================================================================
+def variantes_existentes(key: str) -> dict:
+    """Devuelve las variantes registradas para 'key' o {}."""
+    return (
+        Promocion.objects.filter(imagen=key).exclude(imagen_variantes={})
+        .values_list("imagen_variantes", flat=True).first()
+        or Negocio.objects.filter(logo=key).exclude(logo_variantes={})
+        .values_list("logo_variantes", flat=True).first()
+        or {}
     )
+
+
+# -----------------------------------------------------------------------------
+# Subida concurrente a la creación del registro. La key (por contenido) y las
+# keys de las variantes se calculan antes de subir, de modo que el INSERT se
+# hace una sola vez y en paralelo con la transferencia. El serializador
+# confirma el INSERT y espera la subida fuera de la transacción; si ésta falla,
+# elimina el registro. La subida se inicia solo después de is_valid(), cuando
+# ya nada puede rechazar la petición.
+# -----------------------------------------------------------------------------
+_pool_subidas = ThreadPoolExecutor(
+    max_workers=getattr(settings, "IMAGENES_HILOS_SUBIDA", 8),
+    thread_name_prefix="subida-imagenes",
+)
+
+
+# =============================================================================
+# Clase: ErrorSubida
+# Descripción:
+#   Error al subir el archivo original; el registro no debe confirmarse.
+# =============================================================================
+class ErrorSubida(Exception):
+    """La carga del archivo al almacenamiento falló."""
+
+
+# =============================================================================
+# Clase: SubidaEnCurso
+# Descripción:
+#   Subida lanzada en segundo plano con su key y variantes previstas.
+# =============================================================================
+class SubidaEnCurso:
+    """Resultado de iniciar_subida()."""
+
+    def __init__(self, key: str, variantes: dict, futuro):
+        self.key = key
+        self.variantes = variantes
+        self.variantes_ok = True
+        self._futuro = futuro
+
+    def esperar(self) -> None:
+        """Bloquea hasta terminar la subida; lanza ErrorSubida si falló el original."""
+        self.variantes_ok = self._futuro.result()
+
+
+def _tarea_subida(almacenamiento, f, key: str, mime: str, generar_variantes: bool,
+                  variantes_reutilizadas: Optional[list] = None) -> bool:
+    """Sube el original y sus variantes. Devuelve False si fallaron solo las variantes."""
     try:
-        print("Subiendo archivo a S3...")
-        s3.put_object(Body=f, Bucket=bucket, Key=key, ContentType=mime)
-    except ClientError as e:
-        return Response({"detail": "Error al subir a S3", "error": str(e)}, status=status.HTTP_502_BAD_GATEWAY)
+        _subir_original(almacenamiento, f, key, mime)
+    except ErrorAlmacenamiento as e:
+        raise ErrorSubida(str(e)) from e
+
+    if not generar_variantes:
+        try:
+            # Variantes de otro registro: también se protegen del limpiador
+            return all([almacenamiento.renovar(k) for k in variantes_reutilizadas or []])
+        except ErrorAlmacenamiento as e:
+            print(f"[Imágenes] No se pudieron renovar las variantes de {key}: {e}")
+            return False
+    try:
+        f.seek(0)
+        subir_variantes(f, key, almacenamiento)
+        return True
+    except Exception as e:
+        # Quedan pendientes para `python manage.py generar_variantes_imagenes`
+        print(f"[Imágenes] No se pudieron generar variantes de {key}: {e}")
+        return False
 
-    print("Archivo subido correctamente.")
-    return key
+
+# =============================================================================
+# Función: iniciar_subida
+# Descripción:
+#   Calcula la key y lanza la subida (original + variantes) en el pool.
+# =============================================================================
+def iniciar_subida(f, prefix: str) -> SubidaEnCurso:
+    """
+    Inicia la carga de 'f' sin bloquear.
+
+    Lanza:
+        ErrorSubida: El almacenamiento no está configurado.
+    """
+    try:
+        almacenamiento = obtener_almacenamiento()
+    except ErrorAlmacenamiento as e:
+        raise ErrorSubida(str(e)) from e
+
+    key, mime = _preparar_key(f, prefix)
+
+    variantes, generar = {}, False
+    if getattr(settings, "IMAGENES_VARIANTES_EN_SUBIDA", True):
+        # Con keys por contenido, otro registro puede tener ya las variantes
+        variantes = variantes_existentes(key)
+        if not variantes:
+            variantes, generar = keys_variantes(key), True
+
+    futuro = _pool_subidas.submit(
+        _tarea_subida, almacenamiento, f, key, mime, generar,
+        [] if generar else list(variantes.values()),
+    )
+    return SubidaEnCurso(key, variantes, futuro)
 
 
 # =============================================================================
@@ -155,6 +288,11 @@ class UploadPromocionWithFileView(APIView):
     Devuelve:
       - Datos de la promoción creada
       - Clave y URL de la imagen (si aplica)
+
+    Flujo: valida los datos (incluido el negocio), inicia la subida en
+    segundo plano e inserta la promoción (con su imagen) en un solo INSERT
+    mientras el archivo se transfiere; después espera la subida fuera de la
+    transacción y, si falla, elimina la promoción y responde 502.
     """
 
     permission_classes = [AllowAny]
@@ -167,22 +305,25 @@ class UploadPromocionWithFileView(APIView):
 
         serializer = PromocionCreateSerializer(data=campos, context={"request": request})
         serializer.is_valid(raise_exception=True)
-        result = serializer.save()
 
-        print("Promoción creada correctamente:", result)
-
-        # Si no se adjuntó archivo, se devuelve solo el registro creado
+        # Si no se adjuntó archivo, se crea solo el registro
         if not f:
+            result = serializer.save()
+            print("Promoción creada correctamente:", result)
             return Response(serializer.to_representation(result), status=status.HTTP_201_CREATED)
 
-        # Cargar imagen a S3 y actualizar el campo 'imagen'
-        key = upload_file_to_s3(f, 'fotos_promociones/')
-        print("Archivo cargado a S3 con key:", key)
+        try:
+            subida = iniciar_subida(f, 'fotos_promociones/')
+            serializer.context["esperar_subida"] = subida.esperar
+            result = serializer.save(imagen=subida.key, imagen_variantes=subida.variantes)
+        except ErrorSubida as e:
+            return Response({"detail": "Error al subir el archivo", "error": str(e)}, status=status.HTTP_502_BAD_GATEWAY)
 
-        result.imagen = key
-        result.save()
+        if not subida.variantes_ok:
+            Promocion.objects.filter(pk=result.pk).update(imagen_variantes={})
+            result.imagen_variantes = {}
 
-        print("Promoción actualizada con imagen.")
+        print("Promoción creada correctamente con imagen:", subida.key)
         return Response(serializer.to_representation(result), status=status.HTTP_201_CREATED)
 
 
@@ -202,6 +343,10 @@ class UploadNegocioWithFileView(APIView):
     Devuelve:
       - Datos del negocio registrado
       - Clave del logo en S3
+
+    El logo solo se sube si los datos son válidos, y en paralelo con la
+    creación del negocio y su administrador. Si la subida falla, la alta se
+    elimina y se responde 502.
     """
 
     permission_classes = [AllowAny]
@@ -210,19 +355,261 @@ class UploadNegocioWithFileView(APIView):
     def post(self, request, *args, **kwargs):
         """Crea un negocio y sube su logotipo a S3 (si fue enviado)."""
         f = request.FILES.get("file")
-        key = None
-
-        if f:
-            key = upload_file_to_s3(f, 'logos_negocios/')
-            print("Logo subido correctamente a S3 con key:", key)
 
         serializer = AltaNegocioYAdminSerializer(
             data=request.data,
-            context={"request": request, "logo_key": key if f else None}
+            context={"request": request, "logo_key": None}
         )
-
         serializer.is_valid(raise_exception=True)
-        result = serializer.save()
+
+        subida = None
+        try:
+            if f:
+                subida = iniciar_subida(f, 'logos_negocios/')
+                serializer.context.update(
+                    logo_key=subida.key,
+                    logo_variantes=subida.variantes,
+                    esperar_subida=subida.esperar,
+                )
+                print("Subiendo logo a S3 con key:", subida.key)
+            result = serializer.save()
+        except ErrorSubida as e:
+            return Response({"detail": "Error al subir el archivo", "error": str(e)}, status=status.HTTP_502_BAD_GATEWAY)
+
+        if subida and not subida.variantes_ok:
+            Negocio.objects.filter(pk=result["negocio"].pk).update(logo_variantes={})
 
         print("Negocio y administrador creados exitosamente.")
         return Response(serializer.to_representation(result), status=status.HTTP_201_CREATED)
+
+
+# -----------------------------------------------------------------------------
+# Subida directa a S3 en dos fases (URL prefirmada + confirmación). El archivo
+# viaja del cliente al bucket sin pasar por los workers de Django. Solo con el
+# backend "s3"; el backend local responde 501 en la fase de firma.
+# -----------------------------------------------------------------------------
+
+# tipo -> (modelo, campo de imagen, campo de variantes, prefijo en el bucket)
+DESTINOS_SUBIDA = {
+    "promocion": (Promocion, "imagen", "imagen_variantes", "fotos_promociones/"),
+    "negocio": (Negocio, "logo", "logo_variantes", "logos_negocios/"),
+}
+
+TIPOS_IMAGEN_PERMITIDOS = {"image/jpeg", "image/png", "image/webp", "image/gif", "image/heic"}
+
+_SALT_SUBIDA = "functionality.imagenes.subida"
+
+
+# =============================================================================
+# Función: _negocio_destino
+# Descripción:
+#   Negocio dueño del registro que recibirá la imagen (el propio negocio o el
+#   de la promoción).
+# =============================================================================
+def _negocio_destino(tipo: str, id_registro: int) -> tuple[bool, Optional[int]]:
+    """Devuelve (existe, id del negocio)."""
+    if tipo == "negocio":
+        return Negocio.objects.filter(pk=id_registro).exists(), id_registro
+    filas = list(Promocion.objects.filter(pk=id_registro).values_list("id_negocio_id", flat=True))
+    return bool(filas), (filas[0] if filas else None)
+
+
+# =============================================================================
+# Función: _puede_modificar
+# Descripción:
+#   El usuario es administrador de ese negocio o administrador del sistema.
+# =============================================================================
+def _puede_modificar(user, id_negocio: Optional[int]) -> bool:
+    """Promociones sin negocio solo las modifica un administrador del sistema."""
+    username = user.username
+    if Administrador.objects.filter(correo=username).exists():
+        return True
+    return id_negocio is not None and AdministradorNegocio.objects.filter(
+        Q(usuario=username) | Q(correo=username), id_negocio=id_negocio
+    ).exists()
+
+
+# =============================================================================
+# Función: _generar_variantes_registro
+# Descripción:
+#   Tarea del pool: genera las variantes de una subida directa confirmada y
+#   las registra solo si el registro sigue apuntando a la misma key.
+# =============================================================================
+def _generar_variantes_registro(almacenamiento, modelo, campo: str, campo_variantes: str,
+                                pk: int, key: str) -> None:
+    """Si falla, quedan pendientes para `python manage.py generar_variantes_imagenes`."""
+    try:
+        with descargar_original(key, almacenamiento) as original:
+            variantes = subir_variantes(original, key, almacenamiento)
+        modelo.objects.filter(pk=pk, **{campo: key}).update(**{campo_variantes: variantes})
+    except Exception as e:
+        print(f"[Imágenes] No se pudieron generar variantes de {key}: {e}")
+    finally:
+        connection.close()
+
+
+# =============================================================================
+# Clase: FirmarSubidaView
+# Descripción:
+#   Fase 1: emite un POST prefirmado de S3 restringido en tamaño y tipo.
+# =============================================================================
+class FirmarSubidaView(APIView):
+    """
+    Genera una subida prefirmada (S3 POST policy).
+
+    POST /functionality/imagenes/subida/firmar/
+
+    Body JSON:
+    {
+        "tipo": "promocion" | "negocio",
+        "id": <int>,                   # promoción o negocio que recibirá la imagen
+        "nombre_archivo": "<texto>",
+        "content_type": "image/jpeg",
+        "tamano": <int bytes>          # opcional; se valida contra el máximo
+    }
+
+    Respuesta:
+        {"url", "fields", "key", "ticket", "expira_en"}: el cliente envía un
+        multipart/form-data a 'url' con 'fields' y el archivo (campo 'file'
+        al final) y después llama a /imagenes/subida/confirmar/ con 'ticket'.
+        El ticket solo es válido para el registro indicado en 'id' y para el
+        usuario que lo pidió.
+
+    Requiere un usuario autenticado que administre el negocio del registro
+    (o un administrador del sistema).
+
+    Respuestas de error:
+        403: El usuario no administra el negocio del registro.
+        501: El backend configurado (IMAGENES_BACKEND) no admite subidas directas.
+        502: Falló la comunicación con el almacenamiento.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        tipo = request.data.get("tipo")
+        if tipo not in DESTINOS_SUBIDA:
+            return Response({"detail": "'tipo' debe ser 'promocion' o 'negocio'."}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            id_registro = int(request.data.get("id"))
+        except (TypeError, ValueError):
+            return Response({"detail": "'id' debe ser un entero."}, status=status.HTTP_400_BAD_REQUEST)
+        existe, id_negocio = _negocio_destino(tipo, id_registro)
+        if not existe:
+            return Response({"detail": "Registro no encontrado."}, status=status.HTTP_404_NOT_FOUND)
+        if not _puede_modificar(request.user, id_negocio):
+            return Response({"detail": "No administra el negocio de este registro."},
+                            status=status.HTTP_403_FORBIDDEN)
+
+        content_type = request.data.get("content_type") or ""
+        if content_type not in TIPOS_IMAGEN_PERMITIDOS:
+            return Response({"detail": f"Tipo de archivo no permitido: {content_type!r}."},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        maximo = getattr(settings, "IMAGENES_TAMANO_MAXIMO", 10 * 1024 * 1024)
+        try:
+            tamano = int(request.data.get("tamano") or 0)
+        except (TypeError, ValueError):
+            return Response({"detail": "'tamano' debe ser un entero."}, status=status.HTTP_400_BAD_REQUEST)
+        if tamano > maximo:
+            return Response({"detail": f"El archivo excede el máximo de {maximo} bytes."},
+                            status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+
+        prefijo = DESTINOS_SUBIDA[tipo][3]
+        key, mime = _generar_key(request.data.get("nombre_archivo") or "upload", content_type, prefijo)
+        expira = getattr(settings, "IMAGENES_FIRMA_SEGUNDOS", 600)
+
+        try:
+            firmado = obtener_almacenamiento().firmar_subida(key, mime, maximo, expira)
+        except SubidaDirectaNoSoportada as e:
+            return Response({"detail": str(e)}, status=status.HTTP_501_NOT_IMPLEMENTED)
+        except ErrorAlmacenamiento as e:
+            return Response({"detail": "Error al firmar la subida", "error": str(e)}, status=status.HTTP_502_BAD_GATEWAY)
+
+        return Response({
+            "url": firmado["url"],
+            "fields": firmado["fields"],
+            "key": key,
+            "ticket": signing.dumps(
+                {"key": key, "tipo": tipo, "id": id_registro, "usuario": request.user.pk}, salt=_SALT_SUBIDA
+            ),
+            "expira_en": expira,
+        }, status=status.HTTP_201_CREATED)
+
+
+# =============================================================================
+# Clase: ConfirmarSubidaView
+# Descripción:
+#   Fase 2: verifica el objeto subido y lo asocia a la promoción o negocio.
+# =============================================================================
+class ConfirmarSubidaView(APIView):
+    """
+    Confirma una subida directa.
+
+    POST /functionality/imagenes/subida/confirmar/
+
+    Body JSON:
+    {
+        "ticket": "<ticket de /firmar/>",
+        "id": <int>                    # Debe ser el mismo 'id' usado al firmar
+    }
+
+    Verifica que el objeto exista, no exceda el tamaño máximo y sea una
+    imagen permitida; después guarda la key en el registro con variantes
+    vacías. Las variantes se generan en el pool de subidas (o con
+    `python manage.py generar_variantes_imagenes`), sin ocupar el worker.
+
+    Solo el usuario que firmó la subida puede confirmarla, y debe seguir
+    administrando el negocio del registro.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        try:
+            ticket = signing.loads(
+                request.data.get("ticket") or "",
+                salt=_SALT_SUBIDA,
+                max_age=2 * getattr(settings, "IMAGENES_FIRMA_SEGUNDOS", 600),
+            )
+        except signing.BadSignature:
+            return Response({"detail": "Ticket inválido o vencido."}, status=status.HTTP_400_BAD_REQUEST)
+
+        if str(request.data.get("id")) != str(ticket.get("id")) or ticket.get("usuario") != request.user.pk:
+            return Response({"detail": "El ticket no corresponde a este registro."}, status=status.HTTP_403_FORBIDDEN)
+
+        modelo, campo, campo_variantes, _ = DESTINOS_SUBIDA[ticket["tipo"]]
+        key = ticket["key"]
+        instancia = modelo.objects.filter(pk=ticket["id"]).first()
+        if instancia is None:
+            return Response({"detail": "Registro no encontrado."}, status=status.HTTP_404_NOT_FOUND)
+        id_negocio = instancia.pk if modelo is Negocio else instancia.id_negocio_id
+        if not _puede_modificar(request.user, id_negocio):
+            return Response({"detail": "No administra el negocio de este registro."},
+                            status=status.HTTP_403_FORBIDDEN)
+
+        try:
+            almacenamiento = obtener_almacenamiento()
+            objeto = almacenamiento.info(key)
+        except ErrorAlmacenamiento as e:
+            return Response({"detail": "Error al consultar el almacenamiento", "error": str(e)},
+                            status=status.HTTP_502_BAD_GATEWAY)
+        if objeto is None:
+            return Response({"detail": "El archivo no se encuentra en el almacenamiento."},
+                            status=status.HTTP_409_CONFLICT)
+
+        maximo = getattr(settings, "IMAGENES_TAMANO_MAXIMO", 10 * 1024 * 1024)
+        if objeto.tamano > maximo or objeto.content_type not in TIPOS_IMAGEN_PERMITIDOS:
+            return Response({"detail": "El archivo subido no cumple las restricciones."},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        setattr(instancia, campo, key)
+        setattr(instancia, campo_variantes, {})
+        instancia.save(update_fields=[campo, campo_variantes])
+
+        if getattr(settings, "IMAGENES_VARIANTES_EN_SUBIDA", True):
+            _pool_subidas.submit(_generar_variantes_registro, almacenamiento, modelo, campo,
+                                 campo_variantes, instancia.pk, key)
+
+        return Response({"id": instancia.pk, "key": key, campo_variantes: {}}, status=status.HTTP_200_OK)
@@ -0,0 +1,77 @@
+# =============================================================================
+# Autores: Daniel Álvarez Sil y Yael Sinuhe Grajeda Martínez
+# Descripción:
+#   Resolución de keys de imágenes a URLs públicas para respuestas con muchos
+#   registros. storage.url() y request.build_absolute_uri() reconstruyen el
+#   mismo prefijo en cada fila; aquí el prefijo (MEDIA_URL del storage, hecho
+#   absoluto con la petición si es relativo) se calcula una sola vez por
+#   petición y cada key se resuelve una sola vez (los logos se repiten en
+#   todas las promociones de un negocio).
+#
+#   Los serializadores comparten el resolutor a través de su contexto
+#   ('resolutor_urls'), de modo que un ListSerializer y sus hijos usan el mismo.
+# =============================================================================
+
+from typing import Optional
+
+from django.core.files.storage import default_storage
+from django.utils.encoding import filepath_to_uri
+from rest_framework import serializers
+
+
+# =============================================================================
+# Clase: ResolutorUrls
+# Descripción:
+#   Convierte keys en URLs con el prefijo precalculado y memoización por key.
+# =============================================================================
+class ResolutorUrls:
+    """Resolutor de URLs de medios válido durante una petición."""
+
+    def __init__(self, request=None, storage=None):
+        prefijo = (storage or default_storage).url("")
+        if request is not None and not prefijo.startswith(("http://", "https://")):
+            prefijo = request.build_absolute_uri(prefijo)
+        self.prefijo = prefijo
+        self._urls = {}
+
+    def url(self, key: Optional[str]) -> Optional[str]:
+        """Devuelve la URL pública de 'key' (None si no hay key)."""
+        if not key:
+            return None
+        url = self._urls.get(key)
+        if url is None:
+            if key.startswith(("http://", "https://")):
+                url = key  # Registros antiguos con la URL completa
+            else:
+                url = self.prefijo + filepath_to_uri(key).lstrip("/")
+            self._urls[key] = url
+        return url
+
+
+# =============================================================================
+# Función: resolutor_de_contexto
+# Descripción:
+#   Obtiene (o crea y guarda) el resolutor del contexto de un serializador.
+# =============================================================================
+def resolutor_de_contexto(context: dict) -> ResolutorUrls:
+    """El contexto de un serializador raíz es compartido por todos sus hijos."""
+    resolutor = context.get("resolutor_urls")
+    if resolutor is None:
+        resolutor = context["resolutor_urls"] = ResolutorUrls(context.get("request"))
+    return resolutor
+
+
+# =============================================================================
+# Clase: ImagenUrlField
+# Descripción:
+#   ImageField de DRF cuya representación usa el resolutor del contexto en
+#   lugar de storage.url() + build_absolute_uri() por fila. La validación de
+#   escritura no cambia.
+# =============================================================================
+class ImagenUrlField(serializers.ImageField):
+    """Serializa la imagen como URL (absoluta si hay 'request' en el contexto)."""
+
+    def to_representation(self, value):
+        if not value:
+            return None
+        return resolutor_de_contexto(self.context).url(getattr(value, "name", value))
@@ -0,0 +1,103 @@
+# =============================================================================
+# Autores: Daniel Álvarez Sil y Yael Sinuhe Grajeda Martínez
+# Descripción:
+#   Cliente de Amazon S3 compartido por el proceso. Crear un cliente de boto3
+#   vuelve a cargar los modelos de servicio de botocore y abre un pool de
+#   conexiones nuevo, por lo que se construye una sola vez (en el primer uso)
+#   y se reutiliza entre peticiones e hilos; los clientes de boto3 son seguros
+#   entre hilos una vez creados.
+#
+#   El tamaño del pool y la política de reintentos se configuran con
+#   AWS_S3_MAX_POOL_CONNECTIONS, AWS_S3_MAX_REINTENTOS y AWS_S3_MODO_REINTENTOS.
+#
+#   Las transferencias de archivos usan el gestor multipart de boto3 (partes
+#   de AWS_S3_MULTIPART_CHUNK_MB en paralelo); la memoria usada por archivo
+#   queda acotada a ~chunk × concurrencia, sin importar su tamaño.
+# =============================================================================
+
+import os
+import threading
+from functools import lru_cache
+
+from django.conf import settings
+
+
+_cliente = None
+_cliente_lock = threading.Lock()
+
+
+# =============================================================================
+# Función: configuracion_s3
+# Descripción:
+#   Resuelve bucket, región y dominio personalizado desde settings o entorno.
+# =============================================================================
+def configuracion_s3() -> tuple[str, str, str]:
+    """Devuelve (bucket, región, dominio personalizado)."""
+    bucket = getattr(settings, "AWS_STORAGE_BUCKET_NAME", None) or os.environ.get("S3_BUCKET_NAME")
+    region = (
+        getattr(settings, "AWS_S3_REGION_NAME", None)
+        or getattr(settings, "AWS_REGION", None)
+        or os.environ.get("AWS_REGION")
+        or "us-east-1"
+    )
+    custom_domain = getattr(settings, "AWS_S3_CUSTOM_DOMAIN", None) or os.environ.get("AWS_S3_CUSTOM_DOMAIN")
+    return bucket, region, custom_domain
+
+
+# =============================================================================
+# Función: obtener_cliente_s3
+# Descripción:
+#   Devuelve el cliente S3 del proceso, creándolo la primera vez.
+# =============================================================================
+def obtener_cliente_s3():
+    """Crea (una sola vez, de forma segura entre hilos) y reutiliza el cliente S3."""
+    global _cliente
+    if _cliente is None:
+        with _cliente_lock:
+            if _cliente is None:
+                import boto3
+                from botocore.config import Config
+
+                _, region, _ = configuracion_s3()
+                config = Config(
+                    max_pool_connections=getattr(settings, "AWS_S3_MAX_POOL_CONNECTIONS", 50),
+                    retries={
+                        "max_attempts": getattr(settings, "AWS_S3_MAX_REINTENTOS", 3),
+                        "mode": getattr(settings, "AWS_S3_MODO_REINTENTOS", "standard"),
+                    },
+                    connect_timeout=getattr(settings, "AWS_S3_CONNECT_TIMEOUT", 5),
+                    read_timeout=getattr(settings, "AWS_S3_READ_TIMEOUT", 60),
+                )
+                # Sesión propia: la sesión global de boto3 no es segura entre hilos
+                # AWS_S3_ENDPOINT_URL permite usar un S3 local (MinIO, moto) en pruebas
+                _cliente = boto3.session.Session().client(
+                    "s3",
+                    region_name=region,
+                    endpoint_url=getattr(settings, "AWS_S3_ENDPOINT_URL", None) or None,
+                    # Vacías -> None: boto3 usa su cadena por defecto (rol IAM, entorno, perfil)
+                    aws_access_key_id=getattr(settings, "AWS_ACCESS_KEY_ID", None) or None,
+                    aws_secret_access_key=getattr(settings, "AWS_SECRET_ACCESS_KEY", None) or None,
+                    config=config,
+                )
+    return _cliente
+
+
+# =============================================================================
+# Función: configuracion_transferencia
+# Descripción:
+#   TransferConfig compartido para upload_fileobj / download_fileobj.
+# =============================================================================
+@lru_cache(maxsize=1)
+def configuracion_transferencia():
+    """Devuelve el TransferConfig (umbral, tamaño de parte y concurrencia multipart)."""
+    from boto3.s3.transfer import TransferConfig
+
+    mb = 1024 * 1024
+    return TransferConfig(
+        multipart_threshold=getattr(settings, "AWS_S3_MULTIPART_UMBRAL_MB", 8) * mb,
+        multipart_chunksize=getattr(settings, "AWS_S3_MULTIPART_CHUNK_MB", 8) * mb,
+        max_concurrency=getattr(settings, "AWS_S3_MULTIPART_CONCURRENCIA", 4),
+        # Partes en espera de escritura (descargas): limita la memoria retenida
+        max_io_queue=getattr(settings, "AWS_S3_MULTIPART_CONCURRENCIA", 4) * 2,
+        use_threads=True,
+    )
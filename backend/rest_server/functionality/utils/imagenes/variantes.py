@@ -0,0 +1,155 @@
+# =============================================================================
+# Autores: Daniel Álvarez Sil y Yael Sinuhe Grajeda Martínez
+# Descripción:
+#   Generación de variantes responsivas de imágenes (Pillow): copias WebP
+#   redimensionadas a los anchos de IMAGENES_ANCHOS_VARIANTES, con la
+#   orientación EXIF aplicada y sin metadatos (EXIF, GPS, perfiles).
+#
+#   Las variantes se guardan junto al original con la clave
+#   '<clave_sin_extension>_w<ancho>.webp' y se registran en los campos
+#   Promocion.imagen_variantes / Negocio.logo_variantes como
+#   {"<ancho>": "<key>"}. Los serializadores las exponen como 'srcset'.
+#
+#   Se generan al subir (si IMAGENES_VARIANTES_EN_SUBIDA) o en segundo plano
+#   con `python manage.py generar_variantes_imagenes`.
+# =============================================================================
+
+import io
+import os
+from typing import BinaryIO, Optional, Union
+
+from django.conf import settings
+
+from functionality.utils.imagenes.almacenamiento import AlmacenamientoMedia, obtener_almacenamiento
+
+
+# =============================================================================
+# Función: anchos_variantes
+# Descripción:
+#   Devuelve los anchos configurados, ordenados de menor a mayor.
+# =============================================================================
+def anchos_variantes() -> list[int]:
+    """Anchos (px) de las variantes a generar."""
+    return sorted(set(getattr(settings, "IMAGENES_ANCHOS_VARIANTES", (128, 512, 1024))))
+
+
+# =============================================================================
+# Función: generar_variantes
+# Descripción:
+#   Redimensiona la imagen a cada ancho configurado y la codifica en WebP.
+# =============================================================================
+def generar_variantes(origen: Union[bytes, BinaryIO]) -> dict[int, bytes]:
+    """
+    Genera las variantes WebP de una imagen.
+
+    Parámetros:
+        origen (bytes | archivo): Imagen original; con un archivo, Pillow lee
+            solo lo necesario en lugar de cargar todo el contenido en memoria.
+
+    Retorna:
+        dict[int, bytes]: {ancho: contenido WebP} para todos los anchos
+        configurados. No se amplían imágenes: si el original es más angosto,
+        la variante conserva su tamaño. Así las keys de las variantes se
+        conocen antes de procesar la imagen (ver keys_variantes).
+
+    Lanza:
+        PIL.UnidentifiedImageError: El contenido no es una imagen soportada.
+    """
+    from PIL import Image, ImageOps
+
+    calidad = getattr(settings, "IMAGENES_CALIDAD_WEBP", 80)
+
+    if isinstance(origen, (bytes, bytearray)):
+        origen = io.BytesIO(origen)
+
+    with Image.open(origen) as original:
+        # Aplica la rotación indicada por EXIF antes de descartar los metadatos
+        imagen = ImageOps.exif_transpose(original)
+        if imagen.mode not in ("RGB", "RGBA"):
+            imagen = imagen.convert("RGBA" if "A" in imagen.getbands() or "transparency" in imagen.info else "RGB")
+
+        variantes = {}
+        for ancho in anchos_variantes():
+            copia = imagen.copy()
+            copia.thumbnail((ancho, ancho * 4), Image.Resampling.LANCZOS)
+
+            buffer = io.BytesIO()
+            # Sin 'exif' ni 'icc_profile': la salida no conserva metadatos
+            copia.save(buffer, format="WEBP", quality=calidad, method=4)
+            variantes[ancho] = buffer.getvalue()
+
+    return variantes
+
+
+# =============================================================================
+# Función: clave_variante
+# Descripción:
+#   Clave S3 de una variante a partir de la clave del original.
+# =============================================================================
+def clave_variante(key: str, ancho: int) -> str:
+    """'fotos/promo_1.jpg' -> 'fotos/promo_1_w512.webp'"""
+    return f"{os.path.splitext(key)[0]}_w{ancho}.webp"
+
+
+# =============================================================================
+# Función: keys_variantes
+# Descripción:
+#   Variantes que tendrá una imagen, calculadas solo a partir de su key.
+# =============================================================================
+def keys_variantes(key: str) -> dict[str, str]:
+    """Devuelve {"<ancho>": "<key de la variante>"} para los anchos configurados."""
+    return {str(ancho): clave_variante(key, ancho) for ancho in anchos_variantes()}
+
+
+# =============================================================================
+# Función: subir_variantes
+# Descripción:
+#   Genera y sube las variantes de una imagen ya almacenada en 'key'.
+# =============================================================================
+def subir_variantes(origen: Union[bytes, BinaryIO], key: str,
+                    almacenamiento: Optional[AlmacenamientoMedia] = None) -> dict[str, str]:
+    """
+    Genera las variantes de 'origen' y las guarda en el almacenamiento.
+
+    Retorna:
+        dict[str, str]: {"<ancho>": "<key de la variante>"}, listo para guardar
+        en imagen_variantes / logo_variantes.
+    """
+    almacenamiento = almacenamiento or obtener_almacenamiento()
+
+    resultado = {}
+    for ancho, contenido in generar_variantes(origen).items():
+        key_variante = clave_variante(key, ancho)
+        almacenamiento.subir_bytes(
+            contenido, key_variante, "image/webp",
+            cache_control="public, max-age=31536000, immutable",
+        )
+        resultado[str(ancho)] = key_variante
+    return resultado
+
+
+# =============================================================================
+# Función: descargar_original
+# Descripción:
+#   Abre la imagen original desde el almacenamiento (en S3 se descarga a un
+#   archivo temporal con transferencia multipart).
+# =============================================================================
+def descargar_original(key: str, almacenamiento: Optional[AlmacenamientoMedia] = None) -> BinaryIO:
+    """Devuelve un archivo rebobinado con el contenido del objeto 'key'."""
+    return (almacenamiento or obtener_almacenamiento()).abrir(key)
+
+
+# =============================================================================
+# Funciones: urls_variantes / construir_srcset
+# Descripción:
+#   Convierten {"<ancho>": "<key>"} en URLs públicas y en un atributo srcset.
+# =============================================================================
+def urls_variantes(variantes: Optional[dict], resolutor) -> dict[str, str]:
+    """Devuelve {"<ancho>": "<url>"}; 'resolutor' es un ResolutorUrls o un storage (ambos con url(key))."""
+    return {ancho: resolutor.url(key) for ancho, key in sorted((variantes or {}).items(), key=lambda v: int(v[0]))}
+
+
+def construir_srcset(variantes: Optional[dict], resolutor) -> Optional[str]:
+    """Devuelve '<url> 128w, <url> 512w, ...' o None si no hay variantes."""
+    urls = urls_variantes(variantes, resolutor)
+    return ", ".join(f"{url} {ancho}w" for ancho, url in urls.items()) or None
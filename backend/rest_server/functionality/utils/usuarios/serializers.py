@@ -9,8 +9,16 @@
 #   (por ejemplo, promociones con sus categorías y estado de apartado).
 # =============================================================================
 
+from django.db import models
 from rest_framework import serializers
 from ...models import CodigoQR, Negocio, Promocion, Categoria, Usuario, Apartado
+from ..imagenes.resolutor import ImagenUrlField, resolutor_de_contexto
+from ..imagenes.variantes import construir_srcset, urls_variantes
+
+
+# Los campos de imagen del modelo se serializan con el resolutor de URLs de la
+# petición (prefijo calculado una vez y URLs memoizadas por key)
+_mapeo_campos = {**serializers.ModelSerializer.serializer_field_mapping, models.ImageField: ImagenUrlField}
 
 
 # =============================================================================
@@ -21,10 +29,22 @@ from ...models import CodigoQR, Negocio, Promocion, Categoria, Usuario, Apartado
 class NegocioSerializer(serializers.ModelSerializer):
     """Serializa todos los campos del modelo Negocio."""
 
+    # Variantes WebP del logo como {ancho: url} y como atributo srcset
+    logo_variantes = serializers.SerializerMethodField()
+    logo_srcset = serializers.SerializerMethodField()
+
+    serializer_field_mapping = _mapeo_campos
+
     class Meta:
         model = Negocio
         fields = '__all__'
 
+    def get_logo_variantes(self, obj):
+        return urls_variantes(obj.logo_variantes, resolutor_de_contexto(self.context))
+
+    def get_logo_srcset(self, obj):
+        return construir_srcset(obj.logo_variantes, resolutor_de_contexto(self.context))
+
 
 # =============================================================================
 # Clase: CategoriaSerializer
@@ -62,6 +82,8 @@ class CategoriaWithPromocionSerializer(serializers.ModelSerializer):
 class NegocioForPromocionSerializer(serializers.ModelSerializer):
     """Serializa datos básicos del negocio (id, nombre, logo)."""
 
+    serializer_field_mapping = _mapeo_campos
+
     class Meta:
         model = Negocio
         fields = ['id', 'nombre', 'logo']
@@ -80,12 +102,29 @@ class PromocionSerializer(serializers.ModelSerializer):
 
     # Campos derivados del negocio relacionado
     negocio_nombre = serializers.CharField(source='id_negocio.nombre', read_only=True)
-    negocio_logo = serializers.ImageField(source='id_negocio.logo', read_only=True, allow_null=True)
+    negocio_logo = ImagenUrlField(source='id_negocio.logo', read_only=True, allow_null=True)
+
+    # Variantes WebP de la imagen ({ancho: url}) y srcset de imagen y logo
+    imagen_variantes = serializers.SerializerMethodField()
+    imagen_srcset = serializers.SerializerMethodField()
+    negocio_logo_srcset = serializers.SerializerMethodField()
+
+    serializer_field_mapping = _mapeo_campos
 
     class Meta:
         model = Promocion
         fields = '__all__'
 
+    def get_imagen_variantes(self, obj):
+        return urls_variantes(obj.imagen_variantes, resolutor_de_contexto(self.context))
+
+    def get_imagen_srcset(self, obj):
+        return construir_srcset(obj.imagen_variantes, resolutor_de_contexto(self.context))
+
+    def get_negocio_logo_srcset(self, obj):
+        negocio = obj.id_negocio
+        return construir_srcset(negocio.logo_variantes, resolutor_de_contexto(self.context)) if negocio else None
+
 
 # =============================================================================
 # Clase: PromocionConApartadasSerializer
@@ -98,19 +137,40 @@ class PromocionConApartadasSerializer(serializers.ModelSerializer):
 
     categorias = CategoriaWithPromocionSerializer(many=True, read_only=True)
     negocio_nombre = serializers.CharField(source='id_negocio.nombre', read_only=True)
-    negocio_logo = serializers.ImageField(source='id_negocio.logo', read_only=True, allow_null=True)
+    negocio_logo = ImagenUrlField(source='id_negocio.logo', read_only=True, allow_null=True)
+    imagen_variantes = serializers.SerializerMethodField()
+    imagen_srcset = serializers.SerializerMethodField()
+    negocio_logo_srcset = serializers.SerializerMethodField()
+
+    serializer_field_mapping = _mapeo_campos
 
     class Meta:
         model = Promocion
         fields = '__all__'
 
+    get_imagen_variantes = PromocionSerializer.get_imagen_variantes
+    get_imagen_srcset = PromocionSerializer.get_imagen_srcset
+    get_negocio_logo_srcset = PromocionSerializer.get_negocio_logo_srcset
+
     def to_representation(self, instance):
         """
         Extiende la representación del modelo para incluir si el usuario
         actual tiene la promoción apartada.
+
+        Si el contexto incluye 'apartados_ids' (conjunto de IDs de promociones
+        apartadas, resuelto una sola vez por la vista), se evita la consulta
+        por cada promoción.
         """
-        request = self.context["request"]
         id_promocion = getattr(instance, 'id')
+
+        apartados_ids = self.context.get("apartados_ids")
+        if apartados_ids is not None:
+            return {
+                **super().to_representation(instance),
+                "es_apartado": id_promocion in apartados_ids
+            }
+
+        request = self.context["request"]
         username = request.user.username
 
         # Se obtiene el usuario correspondiente al correo autenticado
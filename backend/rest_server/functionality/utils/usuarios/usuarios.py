@@ -333,3 +333,205 @@ class ListAllNegociosMapView(APIView):
         ]
 
         return Response({"businesses": resultado}, status=status.HTTP_200_OK)
+
+
+# =============================================================================
+# Función: _parse_limite
+# Descripción:
+#   Convierte un parámetro de consulta en un límite de elementos válido.
+# =============================================================================
+def _parse_limite(valor, defecto: int, maximo: int) -> int:
+    """Devuelve un entero entre 1 y 'maximo'; usa 'defecto' si el valor es inválido."""
+    try:
+        limite = int(valor)
+    except (TypeError, ValueError):
+        return defecto
+    return max(1, min(limite, maximo))
+
+
+# =============================================================================
+# Clase: InicioUsuarioView
+# Descripción:
+#   Endpoint agregado para la pantalla de inicio de la app. Devuelve en una sola
+#   respuesta la información del usuario, las categorías, las promociones, las
+#   promociones de negocios suscritos y las promociones apartadas.
+#
+#   Los datos compartidos (usuario, apartados y suscripciones) se resuelven una
+#   sola vez por solicitud y se reutilizan en todas las secciones.
+# =============================================================================
+class InicioUsuarioView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    SECCIONES = (
+        "info",
+        "categorias",
+        "promociones",
+        "promociones_suscripciones",
+        "promociones_apartadas",
+    )
+    LIMITE_POR_DEFECTO = 20
+    LIMITE_MAXIMO = 100
+
+    def get(self, request):
+        """
+        Devuelve las secciones solicitadas de la pantalla de inicio del usuario.
+
+        Parámetros de consulta:
+            - secciones (str, opcional): lista separada por comas de las secciones
+              a incluir. Por defecto se devuelven todas.
+            - limite (int, opcional): número máximo de elementos por sección.
+            - limite_<seccion> (int, opcional): límite específico para una sección,
+              por ejemplo 'limite_promociones=10'.
+        """
+        solicitadas = request.query_params.get('secciones')
+        if solicitadas:
+            secciones = [s.strip() for s in solicitadas.split(',') if s.strip()]
+            invalidas = [s for s in secciones if s not in self.SECCIONES]
+            if invalidas:
+                return Response(
+                    {'detail': f"Secciones no válidas: {', '.join(invalidas)}."},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+        else:
+            secciones = list(self.SECCIONES)
+
+        limite_general = _parse_limite(
+            request.query_params.get('limite'), self.LIMITE_POR_DEFECTO, self.LIMITE_MAXIMO
+        )
+        limites = {
+            s: _parse_limite(request.query_params.get(f'limite_{s}'), limite_general, self.LIMITE_MAXIMO)
+            for s in secciones
+        }
+
+        # ---------------------------------------------------------------------
+        # Datos compartidos: se resuelven una sola vez
+        # ---------------------------------------------------------------------
+        id_usuario = request.user.id
+        apartados_ids = set(
+            Apartado.objects
+            .filter(id_usuario_id=id_usuario)
+            .values_list('id_promocion_id', flat=True)
+        )
+
+        promociones_base = (
+            Promocion.objects
+            .select_related('id_negocio')
+            .prefetch_related('categorias')
+            .order_by('-id')
+        )
+
+        data = {}
+
+        if "info" in secciones:
+            usuario = Usuario.objects.filter(id=id_usuario).first()
+            data["info"] = UsuarioSerializer(usuario).data if usuario else None
+
+        if "categorias" in secciones:
+            categorias = Categoria.objects.all().order_by('id')[:limites["categorias"]]
+            data["categorias"] = CategoriaSerializer(
+                categorias, many=True, context={'request': request}
+            ).data
+
+        if "promociones" in secciones:
+            promociones = promociones_base[:limites["promociones"]]
+            data["promociones"] = PromocionConApartadasSerializer(
+                promociones, many=True,
+                context={'request': request, 'apartados_ids': apartados_ids}
+            ).data
+
+        if "promociones_suscripciones" in secciones:
+            negocios_suscritos = Suscripcion.objects.filter(
+                id_usuario_id=id_usuario
+            ).values('id_negocio_id')
+            promociones = promociones_base.filter(
+                id_negocio_id__in=negocios_suscritos
+            )[:limites["promociones_suscripciones"]]
+            data["promociones_suscripciones"] = PromocionSerializer(promociones, many=True).data
+
+        if "promociones_apartadas" in secciones:
+            promociones = promociones_base.filter(
+                id__in=apartados_ids
+            )[:limites["promociones_apartadas"]]
+            data["promociones_apartadas"] = PromocionSerializer(promociones, many=True).data
+
+        return Response(data, status=status.HTTP_200_OK)
+
+
+# =============================================================================
+# Función: _parse_ids
+# Descripción:
+#   Convierte el parámetro 'ids' (lista separada por comas) en una lista de
+#   enteros sin duplicados, conservando el orden recibido.
+# =============================================================================
+def _parse_ids(valor: str) -> list[int]:
+    """Devuelve los IDs en el orden recibido; lanza ValueError si alguno no es entero."""
+    ids = []
+    for parte in (valor or '').split(','):
+        parte = parte.strip()
+        if parte:
+            ids.append(int(parte))
+    return list(dict.fromkeys(ids))
+
+
+# =============================================================================
+# Clase: _ListPorIdsView
+# Descripción:
+#   Base para los endpoints de consulta por lote. Valida el parámetro 'ids',
+#   carga los registros con una consulta por relación y devuelve los resultados
+#   en el mismo orden en que se solicitaron (los IDs inexistentes se omiten).
+#   Cada subclase define 'queryset' y 'serializer_class', como en las vistas
+#   genéricas de DRF.
+# =============================================================================
+class _ListPorIdsView(APIView):
+    permission_classes = [AllowAny]
+
+    MAXIMO_IDS = 100
+    queryset = None
+    serializer_class = None
+
+    def get_queryset(self):
+        # .all() evita reutilizar la caché del queryset de clase entre peticiones
+        return self.queryset.all()
+
+    def get(self, request):
+        """
+        Devuelve los registros cuyos IDs se indican en '?ids=1,2,3'.
+        """
+        try:
+            ids = _parse_ids(request.query_params.get('ids'))
+        except ValueError:
+            return Response({'detail': "El parámetro 'ids' debe contener enteros separados por comas."},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        if not ids:
+            return Response({'detail': "El parámetro 'ids' es obligatorio."}, status=status.HTTP_400_BAD_REQUEST)
+        if len(ids) > self.MAXIMO_IDS:
+            return Response({'detail': f"Se permiten como máximo {self.MAXIMO_IDS} IDs por solicitud."},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        por_id = self.get_queryset().in_bulk(ids)
+        registros = [por_id[i] for i in ids if i in por_id]
+
+        serializer = self.serializer_class(registros, many=True)
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+# =============================================================================
+# Clase: ListPromocionesPorIdsView
+# Descripción:
+#   Devuelve varias promociones por ID en una sola solicitud, incluyendo su
+#   negocio (JOIN) y categorías (una consulta adicional para todo el lote).
+# =============================================================================
+class ListPromocionesPorIdsView(_ListPorIdsView):
+    queryset = Promocion.objects.select_related('id_negocio').prefetch_related('categorias')
+    serializer_class = PromocionSerializer
+
+
+# =============================================================================
+# Clase: ListNegociosPorIdsView
+# Descripción:
+#   Devuelve varios negocios por ID en una sola solicitud.
+# =============================================================================
+class ListNegociosPorIdsView(_ListPorIdsView):
+    queryset = Negocio.objects.all()
+    serializer_class = NegocioSerializer
@@ -50,6 +50,11 @@ from .utils.administradores.administradores import (
     ReviewSolicitudNegocioAPIView,
     ListAllCajerosView,
     detalleNegocioView,
+    PromocionesRevisionView,
+    ResolverRevisionPromocionView,
+    MetricasIAView,
+    SerieCanjesView,
+    ExportarDatosView,
 )
 
 
@@ -83,6 +88,21 @@ from .utils.usuarios.usuarios import (
     ApartarPromocionView,
     ListPromocionesApartadasView,
     ListAllNegociosMapView,
+    InicioUsuarioView,
+    ListPromocionesPorIdsView,
+    ListNegociosPorIdsView,
+)
+
+
+# =============================================================================
+# Importaciones para vistas del Catálogo sin conexión
+# -----------------------------------------------------------------------------
+# Snapshots versionados y comprimidos del catálogo, y deltas entre versiones
+# para sincronizar clientes móviles con poca cobertura.
+# =============================================================================
+from .utils.catalogo.catalogo import (
+    CatalogoSnapshotView,
+    CatalogoDeltaView,
 )
 
 
@@ -95,4 +115,6 @@ from .utils.usuarios.usuarios import (
 from .utils.imagenes.imagenes import (
     UploadPromocionWithFileView as PromocionCreateImageUploadView,
     UploadNegocioWithFileView as NegocioCreateImageUploadView,
+    FirmarSubidaView,
+    ConfirmarSubidaView,
 )
@@ -82,16 +82,107 @@ INSTALLED_APPS = [
 DEFAULT_FILE_STORAGE = "storages.backends.s3boto3.S3Boto3Storage"
 
 # AWS credentials (use environment variables for security)
-AWS_ACCESS_KEY_ID = env("AWS_ACCESS_KEY_ID")
-AWS_SECRET_ACCESS_KEY = env("AWS_SECRET_ACCESS_KEY")
-AWS_STORAGE_BUCKET_NAME = env("AWS_STORAGE_BUCKET_NAME")
+AWS_ACCESS_KEY_ID = env("AWS_ACCESS_KEY_ID", default="")
+AWS_SECRET_ACCESS_KEY = env("AWS_SECRET_ACCESS_KEY", default="")
+AWS_STORAGE_BUCKET_NAME = env("AWS_STORAGE_BUCKET_NAME", default="")
 AWS_S3_REGION_NAME = "us-east-1"
 AWS_QUERYSTRING_AUTH = False  # Makes files public by default
-# Media files on S3
-MEDIA_URL = f"https://{AWS_STORAGE_BUCKET_NAME}.s3.{AWS_S3_REGION_NAME}.amazonaws.com/"
+# Endpoint S3 alternativo (p. ej. http://127.0.0.1:9000 para MinIO o moto_server)
+AWS_S3_ENDPOINT_URL = env("AWS_S3_ENDPOINT_URL", default="")
+# Cliente S3 compartido: tamaño del pool de conexiones, reintentos y timeouts
+AWS_S3_MAX_POOL_CONNECTIONS = env.int("AWS_S3_MAX_POOL_CONNECTIONS", default=50)
+AWS_S3_MAX_REINTENTOS = env.int("AWS_S3_MAX_REINTENTOS", default=3)
+AWS_S3_MODO_REINTENTOS = env("AWS_S3_MODO_REINTENTOS", default="standard")
+AWS_S3_CONNECT_TIMEOUT = env.int("AWS_S3_CONNECT_TIMEOUT", default=5)
+AWS_S3_READ_TIMEOUT = env.int("AWS_S3_READ_TIMEOUT", default=60)
+# Transferencias multipart (upload_fileobj): umbral y tamaño de parte en MB y
+# partes en paralelo; la memoria por archivo es ~chunk × concurrencia
+AWS_S3_MULTIPART_UMBRAL_MB = env.int("AWS_S3_MULTIPART_UMBRAL_MB", default=8)
+AWS_S3_MULTIPART_CHUNK_MB = env.int("AWS_S3_MULTIPART_CHUNK_MB", default=8)
+AWS_S3_MULTIPART_CONCURRENCIA = env.int("AWS_S3_MULTIPART_CONCURRENCIA", default=4)
+# Variantes responsivas de imágenes (WebP sin EXIF): anchos en px, calidad y
+# si se generan durante la subida (si no: python manage.py generar_variantes_imagenes)
+IMAGENES_ANCHOS_VARIANTES = tuple(env.list("IMAGENES_ANCHOS_VARIANTES", cast=int, default=[128, 512, 1024]))
+IMAGENES_CALIDAD_WEBP = env.int("IMAGENES_CALIDAD_WEBP", default=80)
+IMAGENES_VARIANTES_EN_SUBIDA = env.bool("IMAGENES_VARIANTES_EN_SUBIDA", default=True)
+# Keys direccionadas por contenido (SHA-256): un archivo repetido no se vuelve a subir
+IMAGENES_DEDUPLICAR = env.bool("IMAGENES_DEDUPLICAR", default=True)
+# Antigüedad mínima (horas) de un objeto sin referencias antes de eliminarlo
+# (python manage.py limpiar_imagenes_huerfanas)
+IMAGENES_GRACIA_HUERFANAS_HORAS = env.int("IMAGENES_GRACIA_HUERFANAS_HORAS", default=48)
+# Hilos del proceso para subir imágenes en paralelo a la creación de registros
+IMAGENES_HILOS_SUBIDA = env.int("IMAGENES_HILOS_SUBIDA", default=8)
+# Subida directa a S3 (URL prefirmada): tamaño máximo y vigencia de la firma
+IMAGENES_TAMANO_MAXIMO = env.int("IMAGENES_TAMANO_MAXIMO", default=10 * 1024 * 1024)
+IMAGENES_FIRMA_SEGUNDOS = env.int("IMAGENES_FIRMA_SEGUNDOS", default=600)
+# Backend de almacenamiento de imágenes: "s3" (bucket) o "local" (MEDIA_ROOT,
+# sin red ni credenciales; para desarrollo, CI y pruebas de rendimiento)
+IMAGENES_BACKEND = env("IMAGENES_BACKEND", default="s3")
+MEDIA_ROOT = env("MEDIA_ROOT", default=str(BASE_DIR / "media"))
+# Media files on S3 (o servidos por Django desde MEDIA_ROOT con el backend local)
+if IMAGENES_BACKEND == "local":
+    MEDIA_URL = env("MEDIA_URL", default="/media/")
+else:
+    MEDIA_URL = f"https://{AWS_STORAGE_BUCKET_NAME}.s3.{AWS_S3_REGION_NAME}.amazonaws.com/"
+
+# OpenAI API Key (opcional: sin ella solo se usa el clasificador local)
+OPENAI_API_KEY = env("OPENAI_API_KEY", default="")
+# URL base alternativa de la API (p. ej. http://127.0.0.1:8765/v1 para el stub
+# local de `python manage.py servidor_openai_stub`); vacía usa OpenAI
+OPENAI_BASE_URL = env("OPENAI_BASE_URL", default="")
+
+# Llamadas a OpenAI: tiempo límite por llamada, reintentos del SDK y circuit
+# breaker (fallos consecutivos para abrir y segundos que permanece abierto)
+AI_TIMEOUT_SEGUNDOS = env.float("AI_TIMEOUT_SEGUNDOS", default=30)
+AI_MAX_REINTENTOS = env.int("AI_MAX_REINTENTOS", default=0)
+AI_CIRCUITO_FALLOS = env.int("AI_CIRCUITO_FALLOS", default=5)
+AI_CIRCUITO_ABIERTO_SEGUNDOS = env.int("AI_CIRCUITO_ABIERTO_SEGUNDOS", default=60)
+
+# Segundos máximos que un proceso reutiliza las categorías en caché para el
+# prompt de clasificación (además de la invalidación por señales)
+AI_CATEGORIAS_TTL_SEGUNDOS = env.int("AI_CATEGORIAS_TTL_SEGUNDOS", default=300)
+
+# Política de clasificación de promociones:
+#   remoto-primero | local-primero | solo-remoto | solo-local
+AI_CLASIFICADOR_POLITICA = env("AI_CLASIFICADOR_POLITICA", default="remoto-primero")
+# Clasificador local (TF-IDF): similitud mínima, margen relativo para categorías
+# adicionales y vigencia del modelo antes de reentrenar
+AI_LOCAL_UMBRAL = env.float("AI_LOCAL_UMBRAL", default=0.15)
+AI_LOCAL_MARGEN = env.float("AI_LOCAL_MARGEN", default=0.8)
+AI_LOCAL_REENTRENAR_SEGUNDOS = env.int("AI_LOCAL_REENTRENAR_SEGUNDOS", default=3600)
+
+# Cola de categorización con IA (worker: python manage.py procesar_categorizaciones)
+AI_TAREAS_MAX_INTENTOS = env.int("AI_TAREAS_MAX_INTENTOS", default=5)
+AI_TAREAS_BACKOFF_BASE_SEGUNDOS = env.int("AI_TAREAS_BACKOFF_BASE_SEGUNDOS", default=30)
+AI_TAREAS_BACKOFF_MAX_SEGUNDOS = env.int("AI_TAREAS_BACKOFF_MAX_SEGUNDOS", default=3600)
+AI_TAREAS_BLOQUEO_SEGUNDOS = env.int("AI_TAREAS_BLOQUEO_SEGUNDOS", default=600)
+
+# Caché de clasificaciones con IA (purga: python manage.py purgar_cache_clasificacion)
+AI_CACHE_MAX_ENTRADAS = env.int("AI_CACHE_MAX_ENTRADAS", default=10000)
+AI_CACHE_MAX_DIAS = env.int("AI_CACHE_MAX_DIAS", default=90)
+
+# Caché de Django compartido por todos los workers (tabla en Postgres, creada
+# por la migración 0030). Las versiones que invalidan las métricas del
+# encabezado y las categorías de IA viven aquí: con el LocMemCache por
+# defecto, cada proceso tendría las suyas y solo se invalidaría el que
+# atendió la escritura.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": env("CACHE_TABLA", default="django_cache"),
+    }
+}
+
+# Métricas del encabezado del panel de administración: vigencia en caché
+# (además se invalidan con cada canje, promoción o negocio nuevo)
+ESTADISTICAS_CACHE_SEGUNDOS = env.int("ESTADISTICAS_CACHE_SEGUNDOS", default=60)
+# Serie de tiempo de canjes: máximo de puntos (periodos × series) por respuesta
+ESTADISTICAS_SERIE_MAX_PUNTOS = env.int("ESTADISTICAS_SERIE_MAX_PUNTOS", default=5000)
+# Exportaciones CSV/JSONL: filas leídas por viaje al cursor del lado del servidor
+EXPORTACION_CHUNK = env.int("EXPORTACION_CHUNK", default=2000)
 
-# OpenAI API Key
-OPENAI_API_KEY = env("OPENAI_API_KEY")
+# Catálogo sin conexión: número de snapshots que se conservan para deltas
+CATALOGO_SNAPSHOTS_RETENIDOS = env.int("CATALOGO_SNAPSHOTS_RETENIDOS", default=30)
 
 CORS_ALLOW_ALL_ORIGINS = True
 # CORS_ALLOW_CREDENTIALS = True
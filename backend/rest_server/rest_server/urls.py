@@ -14,9 +14,11 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+from django.conf import settings
 from django.contrib import admin
-from django.urls import path
+from django.urls import path, re_path
 from django.urls import include
+from django.views.static import serve
 
 from oauth2_provider import urls as oauth2_urls
 
@@ -26,3 +28,10 @@ urlpatterns = [
     path('functionality/', include('functionality.urls')),
     path('o/', include(oauth2_urls)),
 ]
+
+# Imágenes del backend de almacenamiento local (IMAGENES_BACKEND="local").
+# En producción conviene servirlas desde el servidor web frontal.
+if settings.IMAGENES_BACKEND == "local" and settings.MEDIA_URL.startswith("/"):
+    urlpatterns += [
+        re_path(rf"^{settings.MEDIA_URL.strip('/')}/(?P<path>.*)$", serve, {"document_root": settings.MEDIA_ROOT}),
+    ]